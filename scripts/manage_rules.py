@@ -109,7 +109,7 @@ def create_rule():
     # Suggest next rule ID
     if existing_rules:
         last_id = max([int(r.rule_id[1:]) for r in existing_rules])
-        suggested_id = f"R{str(last_id + 1).zfill(3)}"
+        suggested_id = f"R{last_id + 1:03d}"
     else:
         suggested_id = "R001"
 
@@ -2,6 +2,14 @@
 Common utilities and shared services
 """
 
-from .service_factory import ServiceFactory
-
 __all__ = ["ServiceFactory"]
+
+
+def __getattr__(name):
+    # ServiceFactory imports every service package, and those packages import
+    # helpers (json_utils) from here, so it is loaded on first access
+    if name == "ServiceFactory":
+        from .service_factory import ServiceFactory
+
+        return ServiceFactory
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
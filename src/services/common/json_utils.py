@@ -0,0 +1,84 @@
+"""
+JSON helpers shared by all services
+
+orjson is used for faster parsing/serialization when it is installed;
+otherwise the standard library json module is used. Both paths take and
+return the same types, and orjson.JSONDecodeError subclasses
+json.JSONDecodeError, so callers only need to handle the latter.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+# Optional: orjson (pip install orjson)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse JSON text
+
+    Args:
+        data: JSON document as str or UTF-8 bytes
+
+    Returns:
+        Parsed JSON data
+
+    Raises:
+        json.JSONDecodeError: If JSON is malformed
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(data: Any, indent: bool = False) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes
+
+    Args:
+        data: JSON-serializable data
+        indent: Pretty-print with 2-space indentation instead of compact output
+
+    Returns:
+        UTF-8 encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(data, ensure_ascii=False, indent=2 if indent else None).encode(
+        "utf-8"
+    )
+
+
+def read_json(path: Path) -> Any:
+    """
+    Read and parse a JSON file
+
+    Args:
+        path: Path to JSON file
+
+    Returns:
+        Parsed JSON data
+
+    Raises:
+        json.JSONDecodeError: If JSON is malformed
+    """
+    with open(path, "rb") as f:
+        return json_loads(f.read())
+
+
+def write_json(path: Path, data: Any, indent: bool = True) -> None:
+    """
+    Serialize data to a JSON file (UTF-8, 2-space indent by default)
+
+    Args:
+        path: Path to JSON file
+        data: JSON-serializable data
+        indent: Pretty-print with 2-space indentation
+    """
+    with open(path, "wb") as f:
+        f.write(json_dumps(data, indent=indent))
@@ -39,13 +39,17 @@ class HTSHierarchyBuilder:
             hts_code = item["htsno"]
             hierarchy_map[hts_code] = {"item": item, "parent": None, "children": []}
 
+        # Index codes by position so parent candidates are found by prefix
+        # lookup instead of scanning every item (O(N * code_length) overall)
+        code_index = {item["htsno"]: idx for idx, item in enumerate(hts_items)}
+
         # Find parents for each item
         for idx, item in enumerate(hts_items):
             hts_code = item["htsno"]
             indent_level = item["indent"]
 
             parent_code = self._find_parent_code(
-                hts_code, indent_level, idx, hts_items, hierarchy_map
+                hts_code, indent_level, idx, hts_items, hierarchy_map, code_index
             )
 
             if parent_code:
@@ -74,6 +78,7 @@ class HTSHierarchyBuilder:
         current_index: int,
         hts_items: List[Dict],
         hierarchy_map: Dict[str, Dict],
+        code_index: Optional[Dict[str, int]] = None,
     ) -> Optional[str]:
         """
         Find parent code using improved algorithm
@@ -90,12 +95,18 @@ class HTSHierarchyBuilder:
         - Use closest previous item with lower indent
         5. No Parent Found: Return None and log as orphaned
 
+        Steps 2 and 3 only need codes that are prefixes of hts_code, so they
+        are resolved by looking up each prefix in code_index rather than
+        scanning the full item list.
+
         Args:
             hts_code: Current HTS code
             indent_level: Current indent level
             current_index: Position in original array
             hts_items: Full list of HTS items
             hierarchy_map: Current hierarchy map being built
+            code_index: Mapping of HTS code to position in hts_items
+                (built from hts_items if None)
 
         Returns:
             Parent HTS code or None
@@ -104,48 +115,46 @@ class HTSHierarchyBuilder:
         if indent_level == 0:
             return None
 
-        # Step 2: Find Parent Candidates (indent = indent_level - 1)
-        target_indent = indent_level - 1
-        parent_candidates = [
-            item for item in hts_items if item["indent"] == target_indent
-        ]
-
-        # Step 3: Prefix Matching (Primary Method)
-        # Try to find best matching parent by checking if code starts with candidate
-        best_match = None
-        best_match_length = 0
+        if code_index is None:
+            code_index = {item["htsno"]: idx for idx, item in enumerate(hts_items)}
 
-        for candidate in parent_candidates:
-            candidate_code = candidate["htsno"]
+        # Existing codes that hts_code starts with, longest first
+        prefix_codes = [
+            hts_code[:length]
+            for length in range(len(hts_code) - 1, 0, -1)
+            if hts_code[:length] in code_index
+        ]
 
-            # Check if hts_code starts with candidate code
-            if hts_code.startswith(candidate_code):
-                # Prefer longer matches (more specific)
-                if len(candidate_code) > best_match_length:
-                    best_match = candidate_code
-                    best_match_length = len(candidate_code)
+        # Step 2 & 3: Prefix Matching (Primary Method)
+        # Longest prefix at the target indent (indent_level - 1) is the parent
+        target_indent = indent_level - 1
 
-        if best_match:
-            logger.debug(f"Parent: {hts_code} -> {best_match} (prefix match)")
-            self.parent_finding_stats["prefix_matches"] += 1
-            return best_match
+        for candidate_code in prefix_codes:
+            if hts_items[code_index[candidate_code]]["indent"] == target_indent:
+                logger.debug(f"Parent: {hts_code} -> {candidate_code} (prefix match)")
+                self.parent_finding_stats["prefix_matches"] += 1
+                return candidate_code
 
         # Step 4: Positional Fallback with Prefix Check (Secondary Method)
-        # If no candidates at exact target indent, search for any lower indent with prefix match
-        if not parent_candidates or not best_match:
-            # Search backwards from current_index for any item with lower indent
-            # First pass: Try to find prefix match with lower indent
-            for i in range(current_index - 1, -1, -1):
-                item = hts_items[i]
-                if item["indent"] < indent_level:
-                    candidate_code = item["htsno"]
-                    # Check if this lower-indent item is a prefix match
-                    if hts_code.startswith(candidate_code):
-                        logger.debug(
-                            f"Parent: {hts_code} -> {candidate_code} (fallback: prefix match at lower indent)"
-                        )
-                        self.parent_finding_stats["fallback_matches"] += 1
-                        return candidate_code
+        # Closest previous item with lower indent that is a prefix match
+        best_position = -1
+        best_fallback = None
+
+        for candidate_code in prefix_codes:
+            position = code_index[candidate_code]
+            if (
+                best_position < position < current_index
+                and hts_items[position]["indent"] < indent_level
+            ):
+                best_position = position
+                best_fallback = candidate_code
+
+        if best_fallback:
+            logger.debug(
+                f"Parent: {hts_code} -> {best_fallback} (fallback: prefix match at lower indent)"
+            )
+            self.parent_finding_stats["fallback_matches"] += 1
+            return best_fallback
 
         # Step 5: Pure Positional Fallback (Last Resort)
         # Only if no prefix matches found at all
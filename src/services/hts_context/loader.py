@@ -4,8 +4,11 @@ HTS Reference Data Loader
 
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict
+from types import MappingProxyType
+from typing import List, Dict, Mapping, Optional, Tuple
+from ..common.json_utils import read_json
 from .models import HTSItem
 from .config import HTS_REFERENCE_PATH
 
@@ -16,35 +19,74 @@ class HTSReferenceLoader:
     """Loads and validates HTS reference data from JSON"""
 
     @staticmethod
-    def load_hts_json(file_path: Path = HTS_REFERENCE_PATH) -> List[Dict]:
+    def load_hts_json(
+        file_path: Path = HTS_REFERENCE_PATH,
+        cache_key: Optional[Tuple[str, int, int]] = None,
+    ) -> List[Mapping]:
         """
         Load HTS reference data from JSON file
 
+        Parsed items are shared by every caller loading the same file
+        version (path, mtime, size), so they are returned as read-only
+        mappings. The list itself is a fresh copy.
+
         Args:
             file_path: Path to HTS JSON file
+            cache_key: File version from cache_key(); pass it when other data
+                must come from the same version (stats the file if None)
 
         Returns:
-            List of HTS item dictionaries
+            List of read-only HTS item mappings
 
         Raises:
             FileNotFoundError: If JSON file doesn't exist
             json.JSONDecodeError: If JSON is malformed
             ValueError: If required fields are missing
         """
-        # Validate file exists
-        if not file_path.exists():
-            raise FileNotFoundError(f"HTS reference file not found: {file_path}")
+        if cache_key is None:
+            cache_key = HTSReferenceLoader.cache_key(file_path)
 
-        logger.info(f"Loading HTS reference from: {file_path}")
+        return list(_load_hts_json_cached(*cache_key))
+
+    @staticmethod
+    def cache_key(file_path: Path = HTS_REFERENCE_PATH) -> Tuple[str, int, int]:
+        """
+        Stat the HTS JSON file once to identify the version to load
+
+        Args:
+            file_path: Path to HTS JSON file
+
+        Returns:
+            Tuple of (resolved path, mtime in ns, size in bytes)
+
+        Raises:
+            FileNotFoundError: If JSON file doesn't exist
+        """
+        try:
+            return file_cache_key(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(
+                f"HTS reference file not found: {file_path}"
+            ) from None
 
-        # Get file size for logging
-        file_size_kb = file_path.stat().st_size / 1024
-        logger.debug(f"File size: {file_size_kb:.2f} KB")
+    @staticmethod
+    def _parse_hts_json(file_path: Path, file_size: int) -> List[Dict]:
+        """
+        Parse and validate HTS reference JSON (uncached)
+
+        Args:
+            file_path: Path to HTS JSON file
+            file_size: File size in bytes from the cache key stat
+
+        Returns:
+            List of HTS item dictionaries
+        """
+        logger.info(f"Loading HTS reference from: {file_path}")
+        logger.debug(f"File size: {file_size / 1024:.2f} KB")
 
         # Load JSON
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                hts_data = json.load(f)
+            hts_data = read_json(file_path)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse JSON: {e}")
             raise
@@ -196,3 +238,26 @@ class HTSReferenceLoader:
 
         if duplicates:
             raise ValueError(f"Duplicate HTS codes found: {duplicates}")
+
+
+def file_cache_key(file_path: Path) -> Tuple[str, int, int]:
+    """
+    Build cache key identifying a specific version of a reference file
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Tuple of (resolved path, mtime in ns, size in bytes)
+    """
+    stat = file_path.stat()
+    return str(file_path.resolve()), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=8)
+def _load_hts_json_cached(
+    path_str: str, mtime_ns: int, size: int
+) -> Tuple[Mapping, ...]:
+    """Parse HTS JSON once per file version into read-only item mappings"""
+    hts_data = HTSReferenceLoader._parse_hts_json(Path(path_str), size)
+    return tuple(MappingProxyType(item) for item in hts_data)
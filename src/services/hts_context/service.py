@@ -2,10 +2,12 @@
 HTS Context Service - Main API Implementation
 """
 
+import copy
 import logging
-import json
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 from .config import (
     HTS_REFERENCE_PATH,
     LOG_FILE,
@@ -13,6 +15,7 @@ from .config import (
     LOG_DATE_FORMAT,
     DEBUG_EXPORT_PATH,
 )
+from ..common.json_utils import write_json
 from .loader import HTSReferenceLoader
 from .hierarchy import HTSHierarchyBuilder
 from .models import HTSContextResponse, HTSHierarchyPath, HTSStatistics
@@ -48,6 +51,9 @@ class HTSContextService:
         self.hierarchy_map = {}
         self.hierarchy_builder = HTSHierarchyBuilder()
 
+        # Memoized context responses keyed by HTS code (found codes only)
+        self._context_cache: Dict[str, Dict] = {}
+
         # Initialize service
         self._initialize()
 
@@ -55,12 +61,14 @@ class HTSContextService:
         """Initialize service by loading data and building hierarchy"""
         logger.info("HTS Context Service initializing...")
 
-        # Load HTS reference data
-        loader = HTSReferenceLoader()
-        self.hts_items = loader.load_hts_json(self.hts_file_path)
+        # Stat the file once so items and hierarchy come from one version
+        cache_key = HTSReferenceLoader.cache_key(self.hts_file_path)
 
-        # Build hierarchy map
-        self.hierarchy_map = self.hierarchy_builder.build_hierarchy_map(self.hts_items)
+        # Items and hierarchy map are shared (read-only) by every instance
+        # loading the same file version; each instance gets its own builder
+        hts_items, self.hierarchy_map, builder = _build_hierarchy_cached(*cache_key)
+        self.hts_items = list(hts_items)
+        self.hierarchy_builder = copy.deepcopy(builder)
 
         logger.info("HTS Context Service initialized successfully")
 
@@ -72,10 +80,18 @@ class HTSContextService:
             hts_code: HTS code to look up
 
         Returns:
-            Dictionary with hierarchy path from root to target code
+            Dictionary with hierarchy path from root to target code.
+            Responses for found codes are cached and shared between
+            callers, so they must be treated as read-only.
         """
         logger.info(f"get_hts_context called: {hts_code}")
 
+        # Return memoized response for repeat lookups
+        cached = self._context_cache.get(hts_code)
+        if cached is not None:
+            logger.debug(f"Context cache hit: {hts_code}")
+            return cached
+
         # Check if code exists
         if hts_code not in self.hierarchy_map:
             logger.warning(f"HTS code not found: {hts_code}")
@@ -115,9 +131,17 @@ class HTSContextService:
         logger.debug(f"Traversal: {' -> '.join(reversed(traversal_log))}")
         logger.debug(f"Returned {len(hierarchy_path)}-level hierarchy path")
 
-        return HTSContextResponse(
+        result = HTSContextResponse(
             hts_code=hts_code, found=True, hierarchy_path=hierarchy_path
         ).model_dump()
+        self._context_cache[hts_code] = result
+
+        return result
+
+    def clear_cache(self) -> None:
+        """Clear memoized context responses"""
+        logger.debug(f"Clearing {len(self._context_cache)} cached contexts")
+        self._context_cache.clear()
 
     def validate_hts_code_exists(self, hts_code: str) -> bool:
         """
@@ -169,17 +193,60 @@ class HTSContextService:
         export_data = {}
         for code, node in self.hierarchy_map.items():
             export_data[code] = {
-                "item": node["item"],
+                "item": dict(node["item"]),
                 "parent": node["parent"],
-                "children": node["children"],
+                "children": list(node["children"]),
             }
 
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(export_data, f, indent=2)
+        write_json(output_path, export_data)
 
         logger.info(f"Hierarchy map exported successfully")
 
 
+@lru_cache(maxsize=8)
+def _build_hierarchy_cached(
+    path_str: str, mtime_ns: int, size: int
+) -> Tuple[Tuple[Mapping, ...], Mapping[str, Mapping], HTSHierarchyBuilder]:
+    """
+    Build hierarchy map once per reference file version
+
+    The map is returned to every service for that file version, so it is
+    frozen: nodes and items are read-only mappings and children are tuples.
+
+    Args:
+        path_str: Resolved path to HTS JSON file
+        mtime_ns: File modification time in ns
+        size: File size in bytes
+
+    Returns:
+        Tuple of (read-only HTS items, read-only hierarchy map, builder
+        holding its statistics), all from the same file version
+    """
+    hts_items = tuple(
+        HTSReferenceLoader.load_hts_json(
+            Path(path_str), cache_key=(path_str, mtime_ns, size)
+        )
+    )
+    builder = HTSHierarchyBuilder()
+    hierarchy_map = builder.build_hierarchy_map(hts_items)
+    return (
+        hts_items,
+        MappingProxyType(
+            {
+                code: MappingProxyType(
+                    {
+                        "item": node["item"],
+                        "parent": node["parent"],
+                        "children": tuple(node["children"]),
+                    }
+                )
+                for code, node in hierarchy_map.items()
+            }
+        ),
+        builder,
+    )
+
+
 # Convenience function for direct access
 _service_instance = None
 
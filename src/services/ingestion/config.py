@@ -30,6 +30,13 @@ PRODUCTS_TABLE = "products"
 PROCESSING_TABLE = "processing_results"
 BATCH_SIZE = 1000
 
+# Per-connection pragmas for throwaway databases (tests): no fsync, journal in RAM
+UNSAFE_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA temp_store=MEMORY",
+)
+
 # PRODUCT COLUMNS
 PRODUCT_COLUMNS = [
     "item_id",
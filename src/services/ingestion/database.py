@@ -7,7 +7,7 @@ from asyncio import SelectorEventLoop
 from functools import total_ordering
 import sqlite3
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple, Union
 from contextlib import contextmanager
 import logging
 from datetime import datetime, timezone
@@ -23,6 +23,7 @@ from .config import (
     CREATE_PROCESSING_TABLE_SQL,
     CREATE_INDEXES_SQL,
     BATCH_SIZE,
+    UNSAFE_PRAGMAS,
     VALID_CONFIDENCE_LEVELS,
 )
 from .models import (
@@ -41,10 +42,33 @@ logger = logging.getLogger(__name__)
 class ProductDatabase:
     """Manages SQLite database operations for products and processing results"""
 
-    def __init__(self, db_path: Path = DATABASE_PATH):
-        self.db_path = Path(db_path)
+    # Default for the unsafe flag when the constructor is not given one
+    default_unsafe: bool = False
+
+    def __init__(
+        self,
+        db_path: Union[Path, str] = DATABASE_PATH,
+        *,
+        unsafe: Optional[bool] = None,
+    ):
+        """
+        Args:
+            db_path: Database file path or SQLite "file:" URI
+            unsafe: Trade durability for speed (no fsync, in-memory journal).
+                Only for throwaway databases; defaults to default_unsafe
+        """
+        self.unsafe = self.default_unsafe if unsafe is None else unsafe
+        # SQLite "file:" URIs (e.g. shared in-memory databases) are used as-is
+        self.is_uri = str(db_path).startswith("file:")
+        self.db_path = str(db_path) if self.is_uri else Path(db_path)
         self.products_table = PRODUCTS_TABLE
         self.processing_table = PROCESSING_TABLE
+        # Whether the file is in WAL mode; read on first connect, then kept
+        self._wal: Optional[bool] = None
+
+        if self.is_uri:
+            logger.info(f"Database initialized at URI: {self.db_path}")
+            return
 
         # Ensure directory exists
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -57,8 +81,19 @@ class ProductDatabase:
         Context manager for database connections
         Ensures proper connection cleanup
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, uri=self.is_uri)
         conn.row_factory = sqlite3.Row  # Access columns by name
+        if self.unsafe:
+            for pragma in UNSAFE_PRAGMAS:
+                conn.execute(pragma)
+        else:
+            # synchronous=NORMAL only stays crash-safe in WAL mode, which
+            # create_schema sets on the file; other journals keep FULL
+            if self._wal is None:
+                (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+                self._wal = journal_mode == "wal"
+            if self._wal:
+                conn.execute("PRAGMA synchronous=NORMAL")
         try:
             logger.debug(f"Database connection opened: {self.db_path}")
             yield conn
@@ -82,6 +117,16 @@ class ProductDatabase:
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
+            # WAL journaling persists in the database file and avoids a full
+            # journal flush per commit on bulk inserts. From now on the file
+            # has -wal and -shm sidecars that readers need too, and it must
+            # not live on a network filesystem (WAL needs shared memory)
+            if not self.unsafe:
+                (journal_mode,) = cursor.execute("PRAGMA journal_mode=WAL").fetchone()
+                self._wal = journal_mode == "wal"
+                if self._wal:
+                    cursor.execute("PRAGMA synchronous=NORMAL")
+
             # Create products table
             logger.debug(f"Executing: {CREATE_PRODUCTS_TABLE_SQL}")
             cursor.execute(CREATE_PRODUCTS_TABLE_SQL)
@@ -140,6 +185,8 @@ class ProductDatabase:
         inserted_count = 0
         failed_count = 0
 
+        # All batches share one connection and one transaction (committed on
+        # context exit), so the journal is flushed once for the whole insert
         with self.get_connection() as conn:
             cursor = conn.cursor()
 
@@ -504,6 +551,67 @@ class ProductDatabase:
         logger.info(f" Processing results updated for item_id: {item_id}")
         return True
 
+    def update_processing_results_many(
+        self, updates: List[Tuple[str, UpdateProcessingInput]]
+    ) -> int:
+        """
+        Update or insert processing results for many products in one transaction
+
+        Args:
+            updates: List of (item_id, results) pairs
+
+        Returns:
+            Number of results written (item_ids missing from products are skipped)
+        """
+        if not updates:
+            logger.warning("No processing results to update")
+            return 0
+
+        logger.info(f"Starting batch update of {len(updates)} processing results...")
+
+        timestamp = datetime.now(timezone.utc).isoformat()
+
+        # Existence check is folded into the statement so each row is a single
+        # executemany step, and the whole batch commits once
+        upsert_sql = f"""
+            INSERT OR REPLACE INTO {self.processing_table} (
+                item_id, enhanced_description, confidence_score, confidence_level,
+                extracted_customer_name, extracted_dimensions, extracted_product,
+                rules_applied, last_processed_pass, last_processed_at
+            )
+            SELECT ?, ?, ?, ?, ?, ?, ?, ?, ?, ?
+            WHERE EXISTS (SELECT 1 FROM {self.products_table} WHERE item_id = ?)
+        """
+
+        rows = [
+            (
+                item_id,
+                results.enhanced_description,
+                results.confidence_score,
+                results.confidence_level,
+                results.extracted_customer_name,
+                results.extracted_dimensions,
+                results.extracted_product,
+                results.rules_applied,
+                results.pass_number,
+                timestamp,
+                item_id,
+            )
+            for item_id, results in updates
+        ]
+
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany(upsert_sql, rows)
+            updated_count = cursor.rowcount
+
+        skipped_count = len(updates) - updated_count
+        if skipped_count:
+            logger.warning(f"Skipped {skipped_count} results for unknown item_ids")
+
+        logger.info(f" Batch updated {updated_count} processing results")
+        return updated_count
+
     def get_database_statistics(self) -> DatabaseStatistics:
         """
         Get comprehensive database statistics
@@ -817,8 +925,12 @@ class ProductDatabase:
         return records
 
     def search_products(
-        self, query: str, search_type: str = "auto", limit: Optional[int] = None
-    ) -> List[ProductWithProcessing]:
+        self,
+        query: str,
+        search_type: str = "auto",
+        limit: Optional[int] = None,
+        raw: bool = False,
+    ) -> Union[List[ProductWithProcessing], List[sqlite3.Row]]:
         """
         Search products across entire database by Item ID, HTS Code, or description keywords.
 
@@ -830,9 +942,11 @@ class ProductDatabase:
             query (str): Search query string
             search_type (str, optional): Type of search to perform. Defaults to "auto"
             limit (Optional[int], optional): Maximum results to return. Defaults to None (no limit)
+            raw (bool, optional): Return sqlite3.Row objects instead of building models. Defaults to False
 
         Returns:
             List[ProductWithProcessing]: List of matching products with processing results
+            (List[sqlite3.Row] when raw is True)
         """
         import re
 
@@ -932,11 +1046,14 @@ class ProductDatabase:
             f"Search complete: found {len(rows)} results in {execution_time:.4f} seconds"
         )
 
+        if raw:
+            return rows
+
         return [ProductWithProcessing(**dict(row)) for row in rows]
 
     def filter_products(
-        self, filters: Dict[str, Any], limit: int = 500
-    ) -> List[ProductWithProcessing]:
+        self, filters: Dict[str, Any], limit: int = 500, raw: bool = False
+    ) -> Union[List[ProductWithProcessing], List[sqlite3.Row]]:
         """
         Filter products by multiple criteria, return first N of filtered results.
 
@@ -945,6 +1062,7 @@ class ProductDatabase:
         Args:
             filters (Dict): Dicitonary of filter critera
             limit (int): Maximum results to return. Defaults to 500
+            raw (bool): Return sqlite3.Row objects instead of building models. Defaults to False
 
         Filter Dictionary Structure:
         {
@@ -961,6 +1079,7 @@ class ProductDatabase:
 
         Returns:
             List[ProductWithProcessing]: List of matching products (max limit)
+            (List[sqlite3.Row] when raw is True)
         """
         start_time = datetime.now()
         logger.info(f"Starting filter with {len(filters)} criteria, limit={limit}")
@@ -1064,6 +1183,9 @@ class ProductDatabase:
             f"Filter complete: found {len(rows)} results in {execution_time:.4f} seconds"
         )
 
+        if raw:
+            return rows
+
         return [ProductWithProcessing(**dict(row)) for row in rows]
 
     def count_filtered_products(self, filters: Dict[str, any]) -> int:
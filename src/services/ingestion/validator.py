@@ -232,24 +232,25 @@ class DataValidator:
                 "sample_invalid": [],
             }
 
-        # Check for valid HTS codes
-        valid_mask = df["final_hts"].astype(str).str.match(self.hts_pattern, na=False)
-        valid_count = valid_mask.sum()
+        # Check for valid HTS codes (single vectorized regex pass over the column)
+        hts_values = df["final_hts"].astype(str)
+        valid_mask = hts_values.str.match(self.hts_pattern, na=False)
+        valid_count = int(valid_mask.sum())
         invalid_count = len(df) - valid_count
         valid_percentage = (valid_count / len(df) * 100) if len(df) > 0 else 0.0
 
-        # Get sample of invalid codes
-        invalid_df = df[~valid_mask].reset_index()
+        # Get sample of invalid codes (column slice only, no row iteration)
+        invalid_values = hts_values[~valid_mask].head(10)
         sample_invalid = [
             {
-                "row": int(row["index"]) + 2,  # +2 for 1-based index and header
-                "value": str(row["final_hts"]),
+                "row": int(idx) + 2,  # +2 for 1-based index and header
+                "value": str(value),
             }
-            for _, row in invalid_df.head(10).iterrows()
+            for idx, value in invalid_values.items()
         ]
 
         logger.debug(
-            f"First 10 valid HTS codes: {df[valid_mask]['final_hts'].head(10).tolist()}"
+            f"First 10 valid HTS codes: {df['final_hts'][valid_mask].head(10).tolist()}"
         )
         logger.debug(f"First 10 invalid HTS codes: {sample_invalid}")
 
@@ -4,13 +4,18 @@ Handles API calls with exponential backoff for transient failures
 """
 
 import time
+import re
+import hashlib
+import asyncio
 import logging
+import threading
+import importlib.util
 from functools import wraps
-from typing import Optional
+from typing import Dict, List, Optional
 
 try:
     import openai
-    from openai import OpenAI
+    from openai import OpenAI, AsyncOpenAI, DefaultHttpxClient, DefaultAsyncHttpxClient
 except ImportError:
     raise ImportError("openai package required. Install with: pip install openai")
 
@@ -20,15 +25,80 @@ from .config import (
     OPENAI_TEMPERATURE,
     OPENAI_MAX_TOKENS,
     OPENAI_TIMEOUT,
+    OPENAI_RESPONSE_CACHE_SIZE,
     RETRY_MAX_ATTEMPTS,
     RETRY_BASE_DELAY,
     RETRY_EXPONENTIAL_BASE,
     MOCK_OPENAI,
     SYSTEM_PROMPT,
+    BATCH_API_ENDPOINT,
+    BATCH_API_COMPLETION_WINDOW,
+    BATCH_API_POLL_INTERVAL,
 )
+from ..common.json_utils import json_dumps, json_loads
+from .response_parser import _find_json_object
 
 logger = logging.getLogger(__name__)
 
+# Original description line in user prompts (used by mock responses)
+_ORIGINAL_DESCRIPTION_PATTERN = re.compile(r"Original Description: (.+)")
+
+# Optional: HTTP/2 multiplexing needs the h2 package (pip install "httpx[http2]")
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Event loop running in the current thread, or None outside async code"""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _get_retry_delay(
+    error: Exception, attempt: int, max_attempts: int, base_delay: float
+) -> float:
+    """
+    Get backoff delay for a failed attempt, re-raising non-retryable errors
+
+    Args:
+        error: Exception raised by the attempt
+        attempt: Current attempt number (1-based)
+        max_attempts: Maximum number of retry attempts
+        base_delay: Base delay in seconds (doubles each retry)
+
+    Returns:
+        Delay in seconds before the next attempt
+
+    Raises:
+        The original error when it is not retryable or retries are exhausted
+    """
+    if isinstance(error, openai.APITimeoutError):
+        reason = "Timeout"
+    elif isinstance(error, openai.RateLimitError):
+        reason = "Rate limit hit"
+    elif isinstance(error, openai.APIError):
+        # Only retry server errors (500-599)
+        status_code = getattr(error, "status_code", None)
+        if status_code is None or not 500 <= status_code < 600:
+            logger.error(f"Non-retryable API error: {type(error).__name__}")
+            raise error
+        reason = "API error"
+    else:
+        # Catch-all for unexpected errors
+        logger.error(f"Unexpected error: {type(error).__name__}: {str(error)}")
+        raise error
+
+    if attempt >= max_attempts:
+        logger.error(f"Max retries exceeded ({reason.lower()})")
+        raise error
+
+    delay = base_delay * (RETRY_EXPONENTIAL_BASE ** (attempt - 1))
+    logger.warning(
+        f"{reason} on attempt {attempt}/{max_attempts}, retrying in {delay}s..."
+    )
+    return delay
+
 
 def exponential_backoff_retry(
     max_attempts: int = RETRY_MAX_ATTEMPTS, base_delay: int = RETRY_BASE_DELAY
@@ -44,68 +114,38 @@ def exponential_backoff_retry(
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            last_exception = None
-
             for attempt in range(1, max_attempts + 1):
                 try:
                     return func(*args, **kwargs)
+                except Exception as e:
+                    time.sleep(_get_retry_delay(e, attempt, max_attempts, base_delay))
 
-                except openai.APITimeoutError as e:
-                    last_exception = e
-                    if attempt < max_attempts:
-                        delay = base_delay * (RETRY_EXPONENTIAL_BASE ** (attempt - 1))
-                        logger.warning(
-                            f"Timeout on attempt {attempt}/{max_attempts}, retrying in {delay}s..."
-                        )
-                        time.sleep(delay)
-                    else:
-                        logger.error(f"Max retries exceeded after timeout")
-                        raise
-
-                except openai.RateLimitError as e:
-                    last_exception = e
-                    if attempt < max_attempts:
-                        delay = base_delay * (RETRY_EXPONENTIAL_BASE ** (attempt - 1))
-                        logger.warning(
-                            f"Rate limit hit on attempt {attempt}/{max_attempts}, waiting {delay}s..."
-                        )
-                        time.sleep(delay)
-                    else:
-                        logger.error(f"Max retries exceeded for rate limit")
-                        raise
-
-                except openai.APIError as e:
-                    last_exception = e
-                    # Check if it's a server error (500-599)
-                    if hasattr(e, "status_code") and 500 <= e.status_code < 600:
-                        if attempt < max_attempts:
-                            delay = base_delay * (
-                                RETRY_EXPONENTIAL_BASE ** (attempt - 1)
-                            )
-                            logger.warning(
-                                f"API error on attempt {attempt}/{max_attempts}, retrying in {delay}s..."
-                            )
-                            time.sleep(delay)
-                        else:
-                            logger.error(f"Max retries exceeded for API error")
-                            raise
-                    else:
-                        # Non-server error, don't retry
-                        logger.error(f"Non-retryable API error: {type(e).__name__}")
-                        raise
-
-                except (openai.AuthenticationError, openai.BadRequestError) as e:
-                    # Don't retry authentication or bad request errors
-                    logger.error(f"Non-retryable error: {type(e).__name__}: {str(e)}")
-                    raise
+        return wrapper
 
-                except Exception as e:
-                    # Catch-all for unexpected errors
-                    logger.error(f"Unexpected error: {type(e).__name__}: {str(e)}")
-                    raise
+    return decorator
 
-            # Should not reach here
-            raise last_exception
+
+def async_exponential_backoff_retry(
+    max_attempts: int = RETRY_MAX_ATTEMPTS, base_delay: int = RETRY_BASE_DELAY
+):
+    """
+    Decorator for exponential backoff retry logic on coroutines
+
+    Args:
+        max_attempts: Maximum number of retry attempts
+        base_delay: Base delay in seconds (doubles each retry)
+    """
+
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            for attempt in range(1, max_attempts + 1):
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    await asyncio.sleep(
+                        _get_retry_delay(e, attempt, max_attempts, base_delay)
+                    )
 
         return wrapper
 
@@ -129,15 +169,30 @@ class OpenAIClient:
         self.timeout = OPENAI_TIMEOUT
         self.mock_mode = MOCK_OPENAI
 
+        # Exact-match response cache keyed by prompt hash
+        self._response_cache: Dict[str, str] = {}
+
+        # Created lazily by call_api_async on the running event loop
+        self._async_client: Optional[AsyncOpenAI] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Private event loop for sync callers (run_async), kept for the client's
+        # lifetime so the async connection pool created on it is reused
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_lock = threading.Lock()
+
         if not self.mock_mode:
             if not self.api_key:
                 raise ValueError(
                     "OpenAI API key is required. Set OPENAI_API_KEY environment variable."
                 )
 
-            self.client = OpenAI(api_key=self.api_key)
+            # One pooled keep-alive HTTP client for the lifetime of this instance
+            self._http_client = DefaultHttpxClient(http2=HTTP2_AVAILABLE)
+            self.client = OpenAI(api_key=self.api_key, http_client=self._http_client)
             logger.info(f"OpenAI client initialized (model={self.model})")
         else:
+            self._http_client = None
             self.client = None
             logger.warning("OpenAI client in MOCK MODE - using mock responses")
 
@@ -161,18 +216,18 @@ class OpenAIClient:
         if self.mock_mode:
             return self._mock_response(user_prompt)
 
+        cache_key = self._cache_key(user_prompt, system_prompt)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Response cache hit, skipping API call")
+            return cached
+
         logger.debug(f"Calling OpenAI API (model={self.model})")
 
         try:
             response = self.client.chat.completions.create(
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
                 timeout=self.timeout,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+                **self._build_request_body(user_prompt, system_prompt),
             )
 
             # Extract response text
@@ -186,6 +241,351 @@ class OpenAIClient:
             logger.error(f"OpenAI API call failed: {type(e).__name__}: {str(e)}")
             raise
 
+    @async_exponential_backoff_retry(
+        max_attempts=RETRY_MAX_ATTEMPTS, base_delay=RETRY_BASE_DELAY
+    )
+    async def call_api_async(
+        self, user_prompt: str, system_prompt: str = SYSTEM_PROMPT
+    ) -> str:
+        """
+        Call OpenAI API asynchronously with retry logic
+
+        Lets callers overlap several in-flight requests on one event loop.
+        The response is streamed and the stream is closed as soon as a
+        complete JSON object has arrived, skipping any trailing text.
+
+        Args:
+            user_prompt: User prompt string
+            system_prompt: System prompt (uses default if not provided)
+
+        Returns:
+            LLM response text
+
+        Raises:
+            openai.OpenAIError: After max retries or non-retryable errors
+        """
+        if self.mock_mode:
+            return self._mock_response(user_prompt)
+
+        cache_key = self._cache_key(user_prompt, system_prompt)
+        cached = self._response_cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Response cache hit, skipping API call")
+            return cached
+
+        logger.debug(f"Calling OpenAI API async (model={self.model})")
+
+        try:
+            stream = await self._get_async_client().chat.completions.create(
+                timeout=self.timeout,
+                stream=True,
+                **self._build_request_body(user_prompt, system_prompt),
+            )
+
+            content = await self._collect_stream(stream)
+
+            logger.debug(f"API response received ({len(content)} characters)")
+
+            return content
+
+        except Exception as e:
+            logger.error(f"OpenAI API call failed: {type(e).__name__}: {str(e)}")
+            raise
+
+    async def _collect_stream(self, stream) -> str:
+        """
+        Accumulate streamed response text until the JSON object is complete
+
+        Uses the same rule as ResponseParser: the first balanced {...} span
+        that parses, so braces in preamble prose don't end the stream early.
+
+        Args:
+            stream: Async chat completion chunk stream
+
+        Returns:
+            Response text received so far
+        """
+        parts = []
+
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if not delta:
+                continue
+
+            parts.append(delta)
+
+            # Only rescan when a closing brace could complete the object
+            if "}" in delta:
+                text = "".join(parts)
+                if _find_json_object(text)[1] != -1:
+                    await stream.close()
+                    return text
+
+        return "".join(parts)
+
+    def run_async(self, coro):
+        """
+        Run a coroutine to completion on this client's private event loop
+
+        Sync callers use this instead of asyncio.run, which would create (and
+        discard) a new loop, and with it a new async HTTP pool, on every call.
+
+        Args:
+            coro: Coroutine to run (typically awaiting call_api_async)
+
+        Returns:
+            Result of the coroutine
+
+        Raises:
+            RuntimeError: If called while an event loop is running in this thread
+        """
+        if running_loop() is not None:
+            coro.close()
+            raise RuntimeError(
+                "run_async cannot be called from a running event loop; "
+                "await the coroutine instead"
+            )
+
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+            return self._loop.run_until_complete(coro)
+
+    def close(self) -> None:
+        """Close the sync and async HTTP connection pools and private event loop"""
+        if self._http_client is not None:
+            self._http_client.close()
+
+        self._close_async_client()
+
+        if self._loop is not None and not self._loop.is_running():
+            self._loop.close()
+            self._loop = None
+
+    def clear_cache(self) -> None:
+        """Clear cached API responses"""
+        logger.debug(f"Clearing {len(self._response_cache)} cached responses")
+        self._response_cache.clear()
+
+    def _cache_key(self, user_prompt: str, system_prompt: str) -> str:
+        """
+        Build response cache key for a request
+
+        Args:
+            user_prompt: User prompt string
+            system_prompt: System prompt string
+
+        Returns:
+            Hex digest identifying model, sampling settings and prompts
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(
+            f"{self.model}|{self.temperature}|{self.max_tokens}|".encode("utf-8")
+        )
+        digest.update(system_prompt.encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update(user_prompt.encode("utf-8"))
+        return digest.hexdigest()
+
+    def cache_response(
+        self, user_prompt: str, content: str, system_prompt: str = SYSTEM_PROMPT
+    ) -> None:
+        """
+        Cache an API response, evicting the oldest entry when the cache is full
+
+        Responses are not cached when received, only once the caller has
+        parsed and validated them, so a truncated or malformed reply is
+        requested again instead of being replayed.
+
+        Args:
+            user_prompt: User prompt the response answers
+            content: LLM response text
+            system_prompt: System prompt the response answers
+        """
+        cache_key = self._cache_key(user_prompt, system_prompt)
+        if len(self._response_cache) >= OPENAI_RESPONSE_CACHE_SIZE:
+            self._response_cache.pop(next(iter(self._response_cache)))
+        self._response_cache[cache_key] = content
+
+    def _get_async_client(self) -> AsyncOpenAI:
+        """
+        Get AsyncOpenAI client bound to the running event loop
+
+        The async HTTP connection pool cannot be shared across event loops.
+        Sync callers always use the private loop (run_async), so the client
+        is normally created once; if called from another loop the old client
+        is closed and a new one is created for that loop.
+
+        Returns:
+            AsyncOpenAI client instance
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is not None and self._async_loop is not loop:
+            self._close_async_client()
+
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                http_client=DefaultAsyncHttpxClient(http2=HTTP2_AVAILABLE),
+            )
+            self._async_loop = loop
+        return self._async_client
+
+    def _close_async_client(self) -> None:
+        """
+        Close the AsyncOpenAI client on the event loop that owns its pool
+
+        An idle owner loop is driven to run the close, from a helper thread
+        when this thread is already running another loop. A busy owner gets
+        the close scheduled on it. Nothing can run on a closed loop; its
+        sockets are released when the dropped client is garbage collected.
+        """
+        client, loop = self._async_client, self._async_loop
+        self._async_client = None
+        self._async_loop = None
+
+        if client is None or loop.is_closed():
+            return
+
+        if loop.is_running():
+            asyncio.run_coroutine_threadsafe(client.close(), loop)
+        elif running_loop() is None:
+            loop.run_until_complete(client.close())
+        else:
+            closer = threading.Thread(
+                target=loop.run_until_complete, args=(client.close(),)
+            )
+            closer.start()
+            closer.join()
+
+    def _build_request_body(self, user_prompt: str, system_prompt: str) -> dict:
+        """
+        Build chat completion request parameters
+
+        Args:
+            user_prompt: User prompt string
+            system_prompt: System prompt string
+
+        Returns:
+            Request parameters for the chat completions endpoint
+        """
+        return {
+            "model": self.model,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt},
+            ],
+        }
+
+    def build_batch_request(
+        self, custom_id: str, user_prompt: str, system_prompt: str = SYSTEM_PROMPT
+    ) -> Dict:
+        """
+        Build a single Batch API request line
+
+        Args:
+            custom_id: Identifier echoed back in the batch output (unique per batch)
+            user_prompt: User prompt string
+            system_prompt: System prompt (uses default if not provided)
+
+        Returns:
+            Request dictionary for the batch input JSONL file
+        """
+        return {
+            "custom_id": custom_id,
+            "method": "POST",
+            "url": BATCH_API_ENDPOINT,
+            "body": self._build_request_body(user_prompt, system_prompt),
+        }
+
+    def submit_batch(self, requests: List[Dict]) -> str:
+        """
+        Upload requests and create an OpenAI Batch API job
+
+        Args:
+            requests: Request lines from build_batch_request
+
+        Returns:
+            Batch ID
+
+        Raises:
+            RuntimeError: If called in mock mode
+        """
+        if self.mock_mode:
+            raise RuntimeError("Batch API is not available in mock mode")
+
+        jsonl = b"\n".join(json_dumps(request) for request in requests)
+        input_file = self.client.files.create(
+            file=("batch_input.jsonl", jsonl), purpose="batch"
+        )
+
+        batch = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_API_ENDPOINT,
+            completion_window=BATCH_API_COMPLETION_WINDOW,
+        )
+
+        logger.info(f"Submitted batch {batch.id} with {len(requests)} requests")
+        return batch.id
+
+    def wait_for_batch(
+        self, batch_id: str, poll_interval: float = BATCH_API_POLL_INTERVAL
+    ) -> Dict[str, str]:
+        """
+        Poll a Batch API job until it finishes and collect its responses
+
+        Requests that failed inside the batch are left out of the result.
+
+        Args:
+            batch_id: Batch ID from submit_batch
+            poll_interval: Seconds to wait between status checks
+
+        Returns:
+            Mapping of custom_id to LLM response text
+
+        Raises:
+            RuntimeError: If the batch fails, expires or is cancelled
+        """
+        while True:
+            batch = self.client.batches.retrieve(batch_id)
+            logger.debug(f"Batch {batch_id} status: {batch.status}")
+
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status {batch.status}")
+
+            time.sleep(poll_interval)
+
+        responses = {}
+        if not batch.output_file_id:
+            logger.warning(f"Batch {batch_id} completed without output file")
+            return responses
+
+        output = self.client.files.content(batch.output_file_id)
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+
+            record = json_loads(line)
+            response = record.get("response") or {}
+            if record.get("error") or response.get("status_code") != 200:
+                logger.warning(
+                    f"Batch request {record.get('custom_id')} failed: "
+                    f"{record.get('error') or response.get('status_code')}"
+                )
+                continue
+
+            body = response["body"]
+            responses[record["custom_id"]] = body["choices"][0]["message"]["content"]
+
+        logger.info(f"Batch {batch_id} completed: {len(responses)} responses")
+        return responses
+
     def _mock_response(self, user_prompt: str) -> str:
         """
         Generate mock response for testing
@@ -199,9 +599,7 @@ class OpenAIClient:
         logger.debug("Generating MOCK OpenAI response")
 
         # Extract item description from prompt if possible
-        import re
-
-        desc_match = re.search(r"Original Description: (.+)", user_prompt)
+        desc_match = _ORIGINAL_DESCRIPTION_PATTERN.search(user_prompt)
         original_desc = desc_match.group(1) if desc_match else "Mock Product"
 
         mock_response = {
@@ -215,9 +613,7 @@ class OpenAIClient:
             },
         }
 
-        import json
-
-        return json.dumps(mock_response)
+        return json_dumps(mock_response).decode("utf-8")
 
 
 # Convenience function for backward compatibility
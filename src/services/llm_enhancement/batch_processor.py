@@ -4,6 +4,7 @@ Handles Pass 1 (inital) and Pass 2+ (reprocessing with rules) execution
 """
 
 import time
+import asyncio
 import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
@@ -11,8 +12,8 @@ from datetime import datetime
 from .models import BatchResult, ProductResult, BatchConfig
 from .prompt_builder import PromptBuilder
 from .response_parser import ResponseParser
-from .api_client import OpenAIClient
-from .config import BATCH_SIZE_DEFAULT, SYSTEM_PROMPT
+from .api_client import OpenAIClient, running_loop
+from .config import BATCH_SIZE_DEFAULT, OPENAI_MAX_CONCURRENCY, SYSTEM_PROMPT
 
 # Import services 1 and 2
 from ..ingestion.database import ProductDatabase
@@ -64,6 +65,7 @@ class BatchProcessor:
         pass_number: int = 1,
         selected_item_ids: Optional[List[str]] = None,
         selected_rule_ids: Optional[List[str]] = None,
+        use_batch_api: bool = False,
     ) -> BatchResult:
         """
         Process a batch of products through LLM enhancement
@@ -73,6 +75,8 @@ class BatchProcessor:
             pass_number: Current pass number
             selected_item_ids: Optional list of specific item IDs to process
             selected_rule_ids: Optional list of specific rule IDs to apply
+            use_batch_api: Submit prompts through the OpenAI Batch API
+                (cheaper for large offline runs, but may take hours)
         Returns:
             BatchResult containing processing statistics and results
         """
@@ -102,20 +106,28 @@ class BatchProcessor:
 
         start_time = time.time()
 
-        for idx, product in enumerate(products, 1):
+        # Build all prompts first so the API calls can be issued concurrently
+        prompts = self._build_prompts(products, rules)
+        if use_batch_api:
+            llm_responses = self._call_batch_api(products, prompts)
+        elif running_loop() is not None:
+            # Called from async code, which can't block on the client's loop
+            logger.info("Event loop already running, calling API sequentially")
+            llm_responses = self._call_api_sequentially(prompts)
+        else:
+            llm_responses = self.openai_client.run_async(
+                self._call_api_concurrently(prompts)
+            )
+
+        for idx, (product, prompt, llm_response) in enumerate(
+            zip(products, prompts, llm_responses), 1
+        ):
             try:
                 logger.info(f"Processing [{idx}/{len(products)}]: {product.item_id}")
 
-                # Get HTS Context
-                hts_context = self._get_hts_context(product)
-
-                # Build Prompt
-                user_prompt = self.prompt_builder.build_user_prompt(
-                    product, hts_context, rules
-                )
-
-                # Call OpenAI API with retry
-                llm_response = self.openai_client.call_api(user_prompt)
+                # Prompt building or API call failed for this product
+                if isinstance(llm_response, Exception):
+                    raise llm_response
 
                 # Parse and validate response
                 parsed = self.response_parser.extract_json_from_response(llm_response)
@@ -123,6 +135,9 @@ class BatchProcessor:
                     parsed, product.item_id
                 )
 
+                # Only a response that parsed and validated is worth replaying
+                self.openai_client.cache_response(prompt, llm_response)
+
                 # Flatten for database
                 db_update_dict = self.response_parser.flatten_for_database(
                     validated, product.item_id, rules, pass_number
@@ -146,8 +161,9 @@ class BatchProcessor:
                     f"Processed {product.item_id}: {validated['confidence_level']} confidence"
                 )
 
+                # Values are already validated, so skip pydantic validation
                 results.append(
-                    ProductResult(
+                    ProductResult.model_construct(
                         item_id=product.item_id,
                         success=True,
                         confidence_level=validated["confidence_level"],
@@ -160,7 +176,9 @@ class BatchProcessor:
                 logger.error(f"Failed {product.item_id}: {str(e)}")
 
                 results.append(
-                    ProductResult(item_id=product.item_id, success=False, error=str(e))
+                    ProductResult.model_construct(
+                        item_id=product.item_id, success=False, error=str(e)
+                    )
                 )
 
                 # Continur to next product dont fail the batch
@@ -206,6 +224,117 @@ class BatchProcessor:
 
         return batch_result
 
+    def _build_prompts(self, products: List[Any], rules: List) -> List[Any]:
+        """
+        Build user prompts for all products in the batch
+
+        Args:
+            products: Products to build prompts for
+            rules: Rules to include in each prompt
+
+        Returns:
+            Prompt string per product, or the exception raised while building it
+        """
+        # Rules are the same for the whole batch, so format them once
+        build_prompt = self.prompt_builder.bind_rules(rules)
+
+        prompts = []
+        for product in products:
+            try:
+                hts_context = self._get_hts_context(product)
+                prompts.append(build_prompt(product, hts_context))
+            except Exception as e:
+                prompts.append(e)
+        return prompts
+
+    async def _call_api_concurrently(self, prompts: List[Any]) -> List[Any]:
+        """
+        Call OpenAI API for all prompts with bounded concurrency
+
+        Args:
+            prompts: Prompt strings (exceptions are passed through unchanged)
+
+        Returns:
+            Response text per prompt in input order, or the exception raised
+        """
+        semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+        async def call(prompt):
+            if isinstance(prompt, Exception):
+                return prompt
+            async with semaphore:
+                return await self.openai_client.call_api_async(prompt)
+
+        return await asyncio.gather(
+            *(call(prompt) for prompt in prompts), return_exceptions=True
+        )
+
+    def _call_api_sequentially(self, prompts: List[Any]) -> List[Any]:
+        """
+        Call OpenAI API for each prompt in turn (sync fallback)
+
+        Args:
+            prompts: Prompt strings (exceptions are passed through unchanged)
+
+        Returns:
+            Response text per prompt in input order, or the exception raised
+        """
+        responses = []
+        for prompt in prompts:
+            if isinstance(prompt, Exception):
+                responses.append(prompt)
+                continue
+            try:
+                responses.append(self.openai_client.call_api(prompt))
+            except Exception as e:
+                responses.append(e)
+        return responses
+
+    def _call_batch_api(self, products: List[Any], prompts: List[Any]) -> List[Any]:
+        """
+        Call OpenAI Batch API for all prompts and wait for the results
+
+        Args:
+            products: Products in the batch
+            prompts: Prompt strings (exceptions are passed through unchanged)
+
+        Returns:
+            Response text per prompt in input order, or the exception raised
+        """
+        # The Batch API rejects duplicate custom IDs and a batch may repeat an
+        # item ID, so requests are keyed by position ("<index>:<item_id>")
+        custom_ids = [
+            f"{idx}:{product.item_id}" for idx, product in enumerate(products)
+        ]
+        requests = [
+            self.openai_client.build_batch_request(custom_id, prompt)
+            for custom_id, prompt in zip(custom_ids, prompts)
+            if not isinstance(prompt, Exception)
+        ]
+        if not requests:
+            return list(prompts)
+
+        try:
+            batch_id = self.openai_client.submit_batch(requests)
+            responses = self.openai_client.wait_for_batch(batch_id)
+        except Exception as e:
+            logger.error(f"Batch API processing failed: {e}")
+            return [
+                prompt if isinstance(prompt, Exception) else e for prompt in prompts
+            ]
+
+        return [
+            (
+                prompt
+                if isinstance(prompt, Exception)
+                else responses.get(
+                    custom_id,
+                    RuntimeError(f"No Batch API response for {product.item_id}"),
+                )
+            )
+            for product, custom_id, prompt in zip(products, custom_ids, prompts)
+        ]
+
     def _load_products(
         self, batch_size: int, pass_number: int, selected_item_ids: Optional[List[str]]
     ) -> List[Any]:
@@ -382,6 +511,7 @@ def process_batch(
     pass_number: int = 1,
     selected_item_ids: Optional[List[str]] = None,
     selected_rule_ids: Optional[List[str]] = None,
+    use_batch_api: bool = False,
 ) -> BatchResult:
     """
     Convenience function for processing a batch
@@ -391,12 +521,13 @@ def process_batch(
         pass_number: Current pass number (1 for initial, 2+ for reprocessing)
         selected_item_ids: For Pass 2+ to process specific items
         selected_rule_ids: For Pass 2+ to apply specific rules
+        use_batch_api: Submit prompts through the OpenAI Batch API
     Returns:
         BatchResult containing processing statistics and results
     """
     processor = BatchProcessor()
     return processor.process_batch(
-        batch_size, pass_number, selected_item_ids, selected_rule_ids
+        batch_size, pass_number, selected_item_ids, selected_rule_ids, use_batch_api
     )
 
 
@@ -28,6 +28,8 @@ OPENAI_MODEL = "gpt-4"
 OPENAI_TEMPERATURE = 0.3
 OPENAI_MAX_TOKENS = 2000
 OPENAI_TIMEOUT = 60
+OPENAI_MAX_CONCURRENCY = 10  # in-flight requests per batch, keep below RPM limit
+OPENAI_RESPONSE_CACHE_SIZE = 10000  # identical prompts reuse the cached response
 
 # Retry Configuration
 RETRY_MAX_ATTEMPTS = 3
@@ -38,6 +40,11 @@ RETRY_EXPONENTIAL_BASE = 2
 BATCH_SIZE_DEFAULT = 100
 BATCH_SIZE_DEVELOPMENT = 10
 
+# OpenAI Batch API Configuration (offline runs, lower cost, higher latency)
+BATCH_API_ENDPOINT = "/v1/chat/completions"
+BATCH_API_COMPLETION_WINDOW = "24h"
+BATCH_API_POLL_INTERVAL = 30  # seconds
+
 # Logging Configuration
 LOG_FILE = LOG_DIR / "llm_enhancement.log"
 ERROR_LOG_FILE = LOG_DIR / "llm_enhancement_errors.log"
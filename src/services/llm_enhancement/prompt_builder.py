@@ -4,10 +4,44 @@ Builds system and user prompts with HTS context and rules
 """
 
 import logging
-from typing import Dict, List, Optional, Any
+from functools import lru_cache, partial
+from typing import Callable, Dict, List, Optional, Any, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Precomputed indentation strings (2 spaces per HTS indent level)
+INDENTS = tuple("  " * level for level in range(12))
+
+# Static prompt section headers
+HTS_CONTEXT_HEADER = "HTS Classification Context:"
+RULES_HEADER = "Rules to Apply:"
+
+
+@lru_cache(maxsize=4096)
+def _format_hierarchy_levels(levels: Tuple[Tuple[int, str, str], ...]) -> str:
+    """
+    Format HTS hierarchy levels, memoized per unique hierarchy chain
+
+    Products sharing an HTS code share the same chain, so each chain is
+    formatted once per process.
+
+    Args:
+        levels: (indent, code, description) tuple per hierarchy level
+
+    Returns:
+        Formatted HTS hierarchy section string
+    """
+    hts_lines = [HTS_CONTEXT_HEADER]
+
+    for indent_value, code, description in levels:
+        if 0 <= indent_value < len(INDENTS):
+            indent_str = INDENTS[indent_value]
+        else:
+            indent_str = "  " * indent_value
+        hts_lines.append(f"{indent_str}[{code}] {description}")
+
+    return "\n".join(hts_lines)
+
 
 class PromptBuilder:
     """Build prompts for OpenAI API calls"""
@@ -37,6 +71,42 @@ class PromptBuilder:
             hts_context: Optional HTS hierarchy context
             rules: Optional list of rules to apply
 
+        Returns:
+            Formatted user prompt string
+        """
+        rules_text = self._format_rules_from_objects(rules) if rules else ""
+        return self._build_prompt(product, hts_context, rules_text)
+
+    def bind_rules(
+        self, rules: Optional[List]
+    ) -> Callable[[Any, Optional[Dict]], str]:
+        """
+        Get a prompt function specialized for one batch's rules
+
+        The rules section is identical for every product in a batch, so it
+        is formatted once here instead of once per product. Pass 1 (no
+        rules) skips rule formatting entirely.
+
+        Args:
+            rules: Optional list of rules to apply to the batch
+
+        Returns:
+            Function taking (product, hts_context) and returning the user prompt
+        """
+        rules_text = self._format_rules_from_objects(rules) if rules else ""
+        return partial(self._build_prompt, rules_text=rules_text)
+
+    def _build_prompt(
+        self, product: Any, hts_context: Optional[Dict], rules_text: str
+    ) -> str:
+        """
+        Build user prompt with an already formatted rules section
+
+        Args:
+            product: Product object with description and metadata
+            hts_context: Optional HTS hierarchy context
+            rules_text: Formatted rules section (empty for Pass 1)
+
         Returns:
             Formatted user prompt string
         """
@@ -67,10 +137,8 @@ class PromptBuilder:
                     prompt_parts.append(f"\n{hierarchy_text}")
 
         # Rules
-        if rules:
-            rules_text = self._format_rules_from_objects(rules)
-            if rules_text:
-                prompt_parts.append(f"\n{rules_text}")
+        if rules_text:
+            prompt_parts.append(f"\n{rules_text}")
 
         return "\n\n".join(prompt_parts)
 
@@ -88,7 +156,7 @@ class PromptBuilder:
             logger.debug("No rules provided")
             return ""
 
-        rules_lines = ["Rules to Apply:"]
+        rules_lines = [RULES_HEADER]
 
         for rule in rules:
             # Handle both Rule objects and dictionaries
@@ -122,18 +190,18 @@ class PromptBuilder:
             logger.debug("No HTS hierarchy path provided")
             return ""
 
-        hts_lines = ["HTS Classification Context:"]
-
-        for level in hierarchy_path:
-            # Each levle is a dictionary with 'indent', 'code', 'description'
-            indent_value = level.get("indent", 0)
-            indent_str = "  " * indent_value  # 2 spaces per indent level
-            code = level.get("code", "")
-            description = level.get("description", "")
-            hts_lines.append(f"{indent_str}[{code}] {description}")
+        # Each levle is a dictionary with 'indent', 'code', 'description'
+        path_key = tuple(
+            (
+                level.get("indent", 0),
+                level.get("code", ""),
+                level.get("description", ""),
+            )
+            for level in hierarchy_path
+        )
 
-        logger.debug(f"Formatted HTS hierarchy: {len(hierarchy_path)} levels")
-        return "\n".join(hts_lines)
+        logger.debug(f"Formatting HTS hierarchy: {len(hierarchy_path)} levels")
+        return _format_hierarchy_levels(path_key)
 
     def _format_rules(self, rules: Optional[List[Dict]]) -> str:
         """
@@ -149,7 +217,7 @@ class PromptBuilder:
             logger.debug("No rules provided")
             return ""
 
-        rules_lines = ["\nRules to Apply:"]
+        rules_lines = [f"\n{RULES_HEADER}"]
 
         for rule in rules:
             rule_content = rule.get("rule_content", rule.get("pattern", ""))
@@ -4,14 +4,96 @@ Handles JSON extraction, validation, and flattening for database storage
 """
 
 import json
-import re
 import logging
-from typing import Dict, Optional, List
+from bisect import bisect_right
+from typing import Dict, Optional, List, Tuple
 
+from ..common.json_utils import json_loads
 from .models import LLMResponse, ExtractedFeatures
+from .scoring import score_core
 
 logger = logging.getLogger(__name__)
 
+# Normalized score thresholds for Medium and High confidence
+FALLBACK_LEVEL_THRESHOLDS = (0.4, 0.7)
+CONFIDENCE_LEVELS = ("Low", "Medium", "High")
+
+# LLM response schema checked by validate_llm_response
+REQUIRED_RESPONSE_FIELDS = (
+    "enhanced_description",
+    "confidence_score",
+    "confidence_level",
+    "extracted_features",
+)
+NULLABLE_FEATURE_FIELDS = ("customer_name", "dimensions")
+NULL_FEATURE_VALUES = ("", "null", None)
+
+
+def _find_json_end(text: str, start: int) -> int:
+    """
+    Find the closing brace of the JSON object starting at text[start]
+
+    Single left-to-right pass tracking brace depth, ignoring braces
+    inside string literals (with backslash escapes).
+
+    Args:
+        text: Text to scan
+        start: Index of the opening brace
+
+    Returns:
+        Index of the matching closing brace, or -1 if unbalanced
+    """
+    depth = 0
+    in_string = False
+    escaped = False
+
+    for idx in range(start, len(text)):
+        char = text[idx]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return idx
+
+    return -1
+
+
+def _find_json_object(text: str) -> Tuple[Optional[dict], int]:
+    """
+    Find the first balanced {...} span in text that parses as JSON
+
+    Braces in surrounding prose (e.g. "{placeholder}") are skipped when
+    their span is not valid JSON.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        Tuple of (parsed object, index of its closing brace), or
+        (None, -1) if text holds no complete JSON object
+    """
+    start = text.find("{")
+    while start != -1:
+        end = _find_json_end(text, start)
+        if end == -1:
+            break
+        try:
+            return json_loads(text[start : end + 1]), end
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+
+    return None, -1
+
 
 class ResponseParser:
     """Parses and validates LLM responses"""
@@ -40,34 +122,27 @@ class ResponseParser:
         logger.debug(f"Extracting JSON from response ({len(llm_response)} chars)")
 
         # Try direct parsing first
+        text = llm_response.strip()
         try:
-            parsed = json.loads(llm_response.strip())
+            parsed = json_loads(text)
             logger.debug("Direct JSON parsing successful")
             return parsed
         except json.JSONDecodeError:
-            logger.debug("Direct parsing failed, trying extraction methods")
-
-        # Try extracting from markdown code block
-        markdown_pattern = r"```json\s*(\{.*?\})\s*```"
-        match = re.search(markdown_pattern, llm_response, re.DOTALL)
-        if match:
-            try:
-                parsed = json.loads(match.group(1))
-                logger.debug("Extracted JSON from markdown block")
-                return parsed
-            except json.JSONDecodeError:
-                logger.debug("Markdown extraction failed")
-
-        # Try finding JSON object in text
-        json_pattern = r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}"
-        match = re.search(json_pattern, llm_response, re.DOTALL)
-        if match:
-            try:
-                parsed = json.loads(match.group(0))
-                logger.debug("Extracted JSON from text")
-                return parsed
-            except json.JSONDecodeError:
-                logger.debug("Pattern extraction failed")
+            logger.debug("Direct parsing failed, scanning for JSON object")
+
+        # Strip markdown code fence if present
+        if text.startswith("```"):
+            text = text[3:]
+            if text.startswith("json"):
+                text = text[4:]
+            if text.endswith("```"):
+                text = text[:-3]
+
+        # Scan for the first balanced JSON object that parses
+        parsed, end = _find_json_object(text)
+        if end != -1:
+            logger.debug("Extracted JSON object from text")
+            return parsed
 
         logger.error("Could not extract valid JSON from LLM response")
         raise ValueError("Could not extract valid JSON from LLM response")
@@ -88,19 +163,14 @@ class ResponseParser:
         """
         logger.debug(f"Validating response for {item_id}")
 
-        errors = []
         warnings = []
 
         # Check top-level required fields
-        required_top_level = [
-            "enhanced_description",
-            "confidence_score",
-            "confidence_level",
-            "extracted_features",
+        errors = [
+            f"Missing required field: {field}"
+            for field in REQUIRED_RESPONSE_FIELDS
+            if field not in parsed
         ]
-        for field in required_top_level:
-            if field not in parsed:
-                errors.append(f"Missing required field: {field}")
 
         if errors:
             error_msg = f"Validation failed for {item_id}: {'; '.join(errors)}"
@@ -129,8 +199,7 @@ class ResponseParser:
             errors.append(f"Invalid confidence_score: {parsed.get('confidence_score')}")
 
         # Validate confidence_level
-        valid_levels = ["Low", "Medium", "High"]
-        if parsed["confidence_level"] not in valid_levels:
+        if parsed["confidence_level"] not in CONFIDENCE_LEVELS:
             warnings.append(
                 f"Invalid confidence_level '{parsed['confidence_level']}', defaulting to Medium"
             )
@@ -148,9 +217,9 @@ class ResponseParser:
                 )
 
             # Normalize nullable fields to None
-            for field in ["customer_name", "dimensions"]:
+            for field in NULLABLE_FEATURE_FIELDS:
                 value = parsed["extracted_features"].get(field)
-                if value == "" or value == "null" or value is None:
+                if value in NULL_FEATURE_VALUES:
                     parsed["extracted_features"][field] = None
 
         if errors:
@@ -182,28 +251,9 @@ class ResponseParser:
         """
         logger.debug(f"Flattening response for database: {item_id}")
 
-        # Exctract rule IDs from Rule objects
-        rule_ids = []
-        if rules_applied:
-            for rule in rules_applied:
-                # Check if its a rule object or a dict
-                if hasattr(rule, "rule_id"):
-                    rule_ids.append(rule.rule_id)
-                elif isinstance(rule, dict):
-                    rule_ids.append(rule.get("rule_id", rule.get("id", "")))
-
-        flattened = {
-            "enhanced_description": parsed["enhanced_description"],
-            "confidence_score": parsed["confidence_score"],
-            "confidence_level": parsed["confidence_level"],
-            "extracted_customer_name": parsed["extracted_features"].get(
-                "customer_name"
-            ),
-            "extracted_dimensions": parsed["extracted_features"].get("dimensions"),
-            "extracted_product": parsed["extracted_features"]["product"],
-            "rules_applied": json.dumps(rule_ids),
-            "pass_number": str(pass_number),
-        }
+        flattened = self._flatten_row(
+            parsed, self._serialize_rule_ids(rules_applied), str(pass_number)
+        )
 
         logger.debug(f"Flattened {len(flattened)} fields for {item_id}")
         return flattened
@@ -228,6 +278,69 @@ class ResponseParser:
         # logger.debug(f"Flattened {len(flattened)} fields for {item_id}")
         # return flattened
 
+    def flatten_many_for_database(
+        self, parsed_list: List[dict], rules_applied: List, pass_number: int
+    ) -> List[dict]:
+        """
+        Flatten a batch of LLM responses for database storage
+
+        Rule IDs and pass number are shared by the batch, so they are
+        serialized once instead of per row.
+
+        Args:
+            parsed_list: Validated LLM responses
+            rules_applied: List of rules that were applied to the batch
+            pass_number: Current pass number
+
+        Returns:
+            List of dicts matching UpdateProcessingInput schema from Service 1
+        """
+        rules_json = self._serialize_rule_ids(rules_applied)
+        pass_str = str(pass_number)
+
+        rows = [
+            self._flatten_row(parsed, rules_json, pass_str) for parsed in parsed_list
+        ]
+
+        logger.debug(f"Flattened {len(rows)} responses for database")
+        return rows
+
+    def _flatten_row(self, parsed: dict, rules_json: str, pass_str: str) -> dict:
+        """Build a single flattened database row from a validated response"""
+        features = parsed["extracted_features"]
+        return {
+            "enhanced_description": parsed["enhanced_description"],
+            "confidence_score": parsed["confidence_score"],
+            "confidence_level": parsed["confidence_level"],
+            "extracted_customer_name": features.get("customer_name"),
+            "extracted_dimensions": features.get("dimensions"),
+            "extracted_product": features["product"],
+            "rules_applied": rules_json,
+            "pass_number": pass_str,
+        }
+
+    def _serialize_rule_ids(self, rules_applied: List) -> str:
+        """
+        Serialize IDs of applied rules to a JSON array string
+
+        Args:
+            rules_applied: Rule objects or rule dictionaries
+
+        Returns:
+            JSON array of rule IDs
+        """
+        # Exctract rule IDs from Rule objects
+        rule_ids = []
+        if rules_applied:
+            for rule in rules_applied:
+                # Check if its a rule object or a dict
+                if hasattr(rule, "rule_id"):
+                    rule_ids.append(rule.rule_id)
+                elif isinstance(rule, dict):
+                    rule_ids.append(rule.get("rule_id", rule.get("id", "")))
+
+        return json.dumps(rule_ids)
+
     def calculate_fallback_confidence(
         self,
         enhanced_description: str,
@@ -251,45 +364,25 @@ class ResponseParser:
         """
         logger.debug("Calculating fallback confidence")
 
-        score = 0.0
-        max_score = 10.0
+        hierarchy_path = hts_context.get("hierarchy_path") if hts_context else None
 
-        # Feature extraction scoring (more weight)
-        if extracted_features.get("product"):
-            score += 3.0
-        if extracted_features.get("dimensions"):
-            score += 3.0
-        if extracted_features.get("customer_name"):
-            score += 1.5
-
-        # Enhancement quality scoring
-        if len(enhanced_description) > len(original_description):
-            score += 1.5  # Description was actually enhanced
-
-        # Basic parsing bonus
-        if len(extracted_features) > 0:
-            score += 1.0
-
-        # HTS context scoring (reduced importance)
-        if hts_context and hts_context.get("hierarchy_path"):
-            score += 0.5
-            if len(hts_context["hierarchy_path"]) >= 3:
-                score += 0.5  # Deep hierarchy context
-
-        # Normalize to 0-1 scale
-        confidence_score = min(score / max_score, 1.0)
+        # Normalized 0-1 score from feature flags
+        confidence_score = score_core(
+            bool(extracted_features.get("product")),
+            bool(extracted_features.get("dimensions")),
+            bool(extracted_features.get("customer_name")),
+            len(enhanced_description) > len(original_description),
+            len(extracted_features) > 0,
+            len(hierarchy_path) if hierarchy_path else 0,
+        )
 
         # Determine confidence level (adjusted thresholds from legacy)
-        if confidence_score >= 0.7:
-            confidence_level = "High"
-        elif confidence_score >= 0.4:
-            confidence_level = "Medium"
-        else:
-            confidence_level = "Low"
+        confidence_level = CONFIDENCE_LEVELS[
+            bisect_right(FALLBACK_LEVEL_THRESHOLDS, confidence_score)
+        ]
 
         logger.debug(
             f"Fallback confidence calculated: {confidence_score:.2f} ({confidence_level})"
         )
-        logger.debug(f"Score breakdown: {score}/{max_score}")
 
         return (f"{confidence_score:.2f}", confidence_level)
@@ -0,0 +1,112 @@
+"""
+Fallback confidence scoring core for LLM Enhancement Service
+Numeric scoring is JIT-compiled with numba when it is installed
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fallback confidence scoring weights (legacy scoring, out of MAX_SCORE)
+PRODUCT_WEIGHT = 3.0
+DIMENSIONS_WEIGHT = 3.0
+CUSTOMER_NAME_WEIGHT = 1.5
+ENHANCED_WEIGHT = 1.5
+PARSED_WEIGHT = 1.0
+HTS_WEIGHT = 0.5
+DEEP_HIERARCHY_DEPTH = 3
+MAX_SCORE = 10.0
+
+# Explicit signature so numba compiles eagerly without type inference
+_SCORE_CORE_SIGNATURE = "f8(b1, b1, b1, b1, b1, i8)"
+
+_compiled_score_core = None
+
+
+def _score_core(
+    has_product: bool,
+    has_dimensions: bool,
+    has_customer_name: bool,
+    was_enhanced: bool,
+    has_features: bool,
+    hierarchy_depth: int,
+) -> float:
+    """Compute normalized fallback confidence score (numba-compatible)"""
+    score = 0.0
+
+    # Feature extraction scoring (more weight)
+    if has_product:
+        score += PRODUCT_WEIGHT
+    if has_dimensions:
+        score += DIMENSIONS_WEIGHT
+    if has_customer_name:
+        score += CUSTOMER_NAME_WEIGHT
+
+    # Enhancement quality scoring
+    if was_enhanced:
+        score += ENHANCED_WEIGHT
+
+    # Basic parsing bonus
+    if has_features:
+        score += PARSED_WEIGHT
+
+    # HTS context scoring (reduced importance)
+    if hierarchy_depth > 0:
+        score += HTS_WEIGHT
+        if hierarchy_depth >= DEEP_HIERARCHY_DEPTH:
+            score += HTS_WEIGHT
+
+    return min(score / MAX_SCORE, 1.0)
+
+
+def _compile_score_core():
+    """
+    Compile scoring core with numba, falling back to pure Python
+
+    numba is imported lazily so it never adds to application startup time.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        logger.debug("numba not available, using pure-Python fallback scoring")
+        return _score_core
+
+    logger.debug("Compiling fallback scoring core with numba")
+    return njit(_SCORE_CORE_SIGNATURE, cache=True)(_score_core)
+
+
+def score_core(
+    has_product: bool,
+    has_dimensions: bool,
+    has_customer_name: bool,
+    was_enhanced: bool,
+    has_features: bool,
+    hierarchy_depth: int,
+) -> float:
+    """
+    Compute normalized fallback confidence score
+
+    Args:
+        has_product: Product type was extracted
+        has_dimensions: Dimensions were extracted
+        has_customer_name: Customer name was extracted
+        was_enhanced: Enhanced description is longer than the original
+        has_features: Any extracted features are present
+        hierarchy_depth: Number of HTS hierarchy levels in context
+
+    Returns:
+        Confidence score on a 0-1 scale
+    """
+    global _compiled_score_core
+
+    if _compiled_score_core is None:
+        _compiled_score_core = _compile_score_core()
+
+    return _compiled_score_core(
+        has_product,
+        has_dimensions,
+        has_customer_name,
+        was_enhanced,
+        has_features,
+        hierarchy_depth,
+    )
@@ -3,7 +3,6 @@ Configuration constants for Rules Management Service
 """
 
 from pathlib import Path
-from datetime import datetime, timezone
 import re
 
 # Project Root Directory
@@ -21,9 +20,28 @@ LOG_DIR.mkdir(parents=True, exist_ok=True)
 
 # Allowed rule types
 ALLOWED_RULE_TYPES = ["material", "dimension", "customer", "product", "general"]
+# Membership checks; ALLOWED_RULE_TYPES keeps display order for messages
+ALLOWED_RULE_TYPE_SET = frozenset(ALLOWED_RULE_TYPES)
 
 # Rule ID Pattern
 RULE_ID_PATTERN = r"^R\d{3,}$"
+RULE_ID_REGEX = re.compile(RULE_ID_PATTERN)
+
+
+def is_valid_rule_id(rule_id: str) -> bool:
+    """
+    Check rule_id matches RULE_ID_PATTERN
+
+    Uses fullmatch, since "$" alone also matches before a trailing newline
+    ("R001\n" is not a valid ID).
+
+    Args:
+        rule_id: Rule ID string
+
+    Returns:
+        True if valid format
+    """
+    return RULE_ID_REGEX.fullmatch(rule_id) is not None
 
 # Logging Configuration
 LOG_FILE = LOG_DIR / "rules.log"
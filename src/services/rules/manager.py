@@ -2,21 +2,23 @@
 Rule manager - CRUD operations for Rule management Service
 """
 
-import re
 import json
 import logging
+from datetime import datetime, timezone
 from typing import List, Optional, Dict, Any, Tuple
 from pathlib import Path
 
-from .models import Rule, RuleSet, ValidationReport
+from ..common.json_utils import read_json, write_json
+from .models import Rule, ValidationReport
 from .validator import RuleValidator
 from .config import (
     RULES_FILE,
     LOG_FILE,
     LOG_FORMAT,
     LOG_DATE_FORMAT,
-    RULE_ID_PATTERN,
     ALLOWED_RULE_TYPES,
+    ALLOWED_RULE_TYPE_SET,
+    is_valid_rule_id,
 )
 
 # Configure logging
@@ -33,6 +35,11 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def _utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string (rules timestamps)"""
+    return datetime.now(timezone.utc).isoformat()
+
+
 class RuleManager:
     """Manages rules: loading, validation, caching and retrieval"""
 
@@ -46,10 +53,17 @@ class RuleManager:
         self.rules_file = rules_file or RULES_FILE
         self.validator = RuleValidator()
         self._rules_cache: List[Rule] = []
+        self._metadata: Dict[str, Any] = {}
         self._cache_loaded = False
 
         logger.info(f"RuleManager initialized with file: {self.rules_file}")
 
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Metadata block from the last load of the rules file"""
+        self.load_rules()
+        return self._metadata
+
     def load_rules(self) -> List[Rule]:
         """
         Load all rules from JSON file
@@ -67,13 +81,14 @@ class RuleManager:
             logger.warning(f"Ruels file not found: {self.rules_file}")
             logger.info("Starting with empty rule set. Create rules.json to add rules.")
             self._rules_cache = []
+            self._metadata = {}
             self._cache_loaded = True
             return []
 
         try:
             # Load JSON file
-            with open(self.rules_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.rules_file)
+            self._metadata = data.get("metadata", {})
 
             # Extract rules array
             rules_data = data.get("rules", [])
@@ -123,12 +138,14 @@ class RuleManager:
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON in rules file: {e}")
             self._rules_cache = []
+            self._metadata = {}
             self._cache_loaded = True
             return []
 
         except Exception as e:
             logger.error(f"Error loading rules file: {e}")
             self._rules_cache = []
+            self._metadata = {}
             self._cache_loaded = True
             return []
 
@@ -242,8 +259,7 @@ class RuleManager:
             )
 
         try:
-            with open(self.rules_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.rules_file)
 
             rules_data = data.get("rules", [])
             report = self.validator.validate_rule_set(rules_data)
@@ -363,7 +379,7 @@ class RuleManager:
                 logger.warning(f"Invalid rule ID format: {rule.rule_id}")
                 continue
 
-        next_id = f"R{str(max_id + 1).zfill(3)}"
+        next_id = f"R{max_id + 1:03d}"
         logger.info(f"Next available rule ID: {next_id}")
         return next_id
 
@@ -409,9 +425,10 @@ class RuleManager:
         if not isinstance(rule_dict["active"], bool):
             errors.append("active must be boolean")
 
-        # Validate rule_id format
-        if isinstance(rule_dict["rule_id"], str):
-            if not re.match(RULE_ID_PATTERN, rule_dict["rule_id"]):
+        # Validate rule_id format: "R" followed by 3+ digits (RULE_ID_PATTERN)
+        rule_id = rule_dict["rule_id"]
+        if isinstance(rule_id, str):
+            if not is_valid_rule_id(rule_id):
                 errors.append(
                     f"rule_id must match pattern R###: {rule_dict['rule_id']}"
                 )
@@ -428,7 +445,7 @@ class RuleManager:
                     )
 
         # Validate rule_type
-        if rule_dict.get("rule_type") not in ALLOWED_RULE_TYPES:
+        if rule_dict.get("rule_type") not in ALLOWED_RULE_TYPE_SET:
             errors.append(f"rule_type must be one of {ALLOWED_RULE_TYPES}")
 
         # Validate non-empty strings
@@ -462,9 +479,7 @@ class RuleManager:
         try:
             # Add created_at timestamp if not provided
             if "created_at" not in rule_dict or not rule_dict["created_at"]:
-                from datetime import datetime, timezone
-
-                rule_dict["created_at"] = datetime.now(timezone.utc).isoformat()
+                rule_dict["created_at"] = _utc_now_iso()
 
             # Validate using Pydantic model
             new_rule = Rule(**rule_dict)
@@ -481,24 +496,20 @@ class RuleManager:
                     },
                 }
             else:
-                with open(self.rules_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+                data = read_json(self.rules_file)
 
             # Append new rule
             data["rules"].append(rule_dict)
 
             # Update metadata
-            from datetime import datetime, timezone
-
-            data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+            data["metadata"]["last_updated"] = _utc_now_iso()
             data["metadata"]["total_rules"] = len(data["rules"])
             data["metadata"]["active_rules"] = sum(
                 1 for r in data["rules"] if r.get("active", False)
             )
 
             # Save back to file
-            with open(self.rules_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json(self.rules_file, data)
 
             # Reload cache
             self._cache_loaded = False
@@ -514,6 +525,99 @@ class RuleManager:
             logger.error(f"Error adding rule: {e}")
             return False, f"Error adding rule: {str(e)}", None
 
+    def add_rules(self, rule_dicts: List[Dict]) -> Dict[str, Any]:
+        """
+        Add multiple rules in one operation (single file write)
+
+        All rules are validated first; if any fail, nothing is written.
+
+        Args:
+            rule_dicts: List of dictionaries with rule fields
+
+        Returns:
+            Dictionary with results
+        """
+        logger.info(f"Attempting to add {len(rule_dicts)} rules")
+
+        # Validate everything before touching the file
+        errors: Dict[str, List[str]] = {}
+        batch_ids = set()
+        for rule_dict in rule_dicts:
+            rule_id = rule_dict.get("rule_id", "NO_ID")
+            is_valid, rule_errors = self.validate_rule_for_save(rule_dict)
+            if rule_id in batch_ids:
+                is_valid = False
+                rule_errors.append(f"rule_id {rule_id} is duplicated in batch")
+            batch_ids.add(rule_id)
+            if not is_valid:
+                errors[rule_id] = rule_errors
+
+        if errors:
+            logger.error(f"Batch validation failed for {len(errors)} rule(s)")
+            return {
+                "added_count": 0,
+                "errors": errors,
+                "success": False,
+                "message": f"Validation failed for {len(errors)} rule(s)",
+            }
+
+        try:
+            now = _utc_now_iso()
+
+            # Add created_at timestamp if not provided, then validate models
+            for rule_dict in rule_dicts:
+                if "created_at" not in rule_dict or not rule_dict["created_at"]:
+                    rule_dict["created_at"] = now
+                Rule(**rule_dict)
+
+            # Load current rules.json
+            if not self.rules_file.exists():
+                data = {
+                    "rules": [],
+                    "metadata": {
+                        "version": "1.0",
+                        "last_updated": "",
+                        "total_rules": 0,
+                        "active_rules": 0,
+                    },
+                }
+            else:
+                data = read_json(self.rules_file)
+
+            # Append new rules
+            data["rules"].extend(rule_dicts)
+
+            # Update metadata
+            data["metadata"]["last_updated"] = now
+            data["metadata"]["total_rules"] = len(data["rules"])
+            data["metadata"]["active_rules"] = sum(
+                1 for r in data["rules"] if r.get("active", False)
+            )
+
+            # Save back to file
+            write_json(self.rules_file, data)
+
+            # Reload cache
+            self._cache_loaded = False
+            self.load_rules()
+
+            logger.info(f"Batch add complete: {len(rule_dicts)} added")
+            return {
+                "added_count": len(rule_dicts),
+                "errors": {},
+                "success": True,
+                "message": f"Successfully added {len(rule_dicts)} rule(s)",
+            }
+
+        except Exception as e:
+            logger.error(f"Error in batch add: {e}")
+            return {
+                "added_count": 0,
+                "errors": {},
+                "success": False,
+                "message": f"Error adding rules: {str(e)}",
+            }
+
     def get_rule_for_edit(self, rule_id: str) -> Optional[Dict]:
         """
         Get rule as dictionary suitable for pre-filling edit form
@@ -566,8 +670,7 @@ class RuleManager:
 
         try:
             # Load current rules.json
-            with open(self.rules_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.rules_file)
 
             # Find rule by rule_id
             rule_index = None
@@ -606,16 +709,13 @@ class RuleManager:
             data["rules"][rule_index] = merged_rule
 
             # Update metadata
-            from datetime import datetime, timezone
-
-            data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+            data["metadata"]["last_updated"] = _utc_now_iso()
             data["metadata"]["active_rules"] = sum(
                 1 for r in data["rules"] if r.get("active", False)
             )
 
             # Save back to file
-            with open(self.rules_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json(self.rules_file, data)
 
             # Reload cache
             self._cache_loaded = False
@@ -651,8 +751,7 @@ class RuleManager:
 
         try:
             # Load current rules.json
-            with open(self.rules_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.rules_file)
 
             # Filter out rule with matching rule_id
             original_count = len(data["rules"])
@@ -663,17 +762,14 @@ class RuleManager:
                 return False, f"Rule {rule_id} not found in file"
 
             # Update metadata
-            from datetime import datetime, timezone
-
-            data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+            data["metadata"]["last_updated"] = _utc_now_iso()
             data["metadata"]["total_rules"] = len(data["rules"])
             data["metadata"]["active_rules"] = sum(
                 1 for r in data["rules"] if r.get("active", False)
             )
 
             # Save back to file
-            with open(self.rules_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json(self.rules_file, data)
 
             # Reload cache
             self._cache_loaded = False
@@ -700,8 +796,7 @@ class RuleManager:
 
         try:
             # Load current rules.json
-            with open(self.rules_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.rules_file)
 
             # Track which IDs were actually found and deleted
             original_ids = {r["rule_id"] for r in data["rules"]}
@@ -718,17 +813,14 @@ class RuleManager:
             data["rules"] = [r for r in data["rules"] if r["rule_id"] not in rule_ids]
 
             # Update metadata
-            from datetime import datetime, timezone
-
-            data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+            data["metadata"]["last_updated"] = _utc_now_iso()
             data["metadata"]["total_rules"] = len(data["rules"])
             data["metadata"]["active_rules"] = sum(
                 1 for r in data["rules"] if r.get("active", False)
             )
 
             # Save back to file
-            with open(self.rules_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json(self.rules_file, data)
 
             # Reload cache
             self._cache_loaded = False
@@ -775,8 +867,7 @@ class RuleManager:
 
         try:
             # Load current rules.json
-            with open(self.rules_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.rules_file)
 
             # Find rule and flip active status
             rule_found = False
@@ -792,16 +883,13 @@ class RuleManager:
                 return False, f"Rule {rule_id} not found in file", False
 
             # Update metadata
-            from datetime import datetime, timezone
-
-            data["metadata"]["last_updated"] = datetime.now(timezone.utc).isoformat()
+            data["metadata"]["last_updated"] = _utc_now_iso()
             data["metadata"]["active_rules"] = sum(
                 1 for r in data["rules"] if r.get("active", False)
             )
 
             # Save back to file
-            with open(self.rules_file, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json(self.rules_file, data)
 
             # Reload cache
             self._cache_loaded = False
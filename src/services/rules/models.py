@@ -5,6 +5,8 @@ Pydantic models for Rules Management Service
 from pydantic import BaseModel, Field, field_validator
 from typing import List, Optional, Dict, Any
 
+from .config import ALLOWED_RULE_TYPES, ALLOWED_RULE_TYPE_SET, is_valid_rule_id
+
 
 class Rule(BaseModel):
     """Single Rule Model"""
@@ -20,19 +22,14 @@ class Rule(BaseModel):
     @field_validator("rule_id")
     @classmethod
     def validate_rule_id(cls, v: str) -> str:
-        import re
-        from .config import RULE_ID_PATTERN
-
-        if not re.match(RULE_ID_PATTERN, v):
+        if not is_valid_rule_id(v):
             raise ValueError(f"Rule ID must match pattern R###: {v}")
         return v
 
     @field_validator("rule_type")
     @classmethod
     def validate_rule_type(cls, v: str) -> str:
-        from .config import ALLOWED_RULE_TYPES
-
-        if v not in ALLOWED_RULE_TYPES:
+        if v not in ALLOWED_RULE_TYPE_SET:
             raise ValueError(f"Rule type must be one of {ALLOWED_RULE_TYPES}")
         return v
 
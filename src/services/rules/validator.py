@@ -2,12 +2,16 @@
 Rule validation logic for Rules Management Service
 """
 
-import re
 import logging
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple
 
 from .models import ValidationResult, ValidationReport
-from .config import ALLOWED_RULE_TYPES, RULE_ID_PATTERN
+from .config import (
+    ALLOWED_RULE_TYPES,
+    ALLOWED_RULE_TYPE_SET,
+    RULE_ID_PATTERN,
+    is_valid_rule_id,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -166,7 +170,7 @@ class RuleValidator:
         Returns:
             True if valid format
         """
-        return bool(re.match(RULE_ID_PATTERN, rule_id))
+        return is_valid_rule_id(rule_id)
 
     def validate_rule_type(self, rule_type: str) -> bool:
         """
@@ -178,4 +182,4 @@ class RuleValidator:
         Returns:
             True if valid type
         """
-        return rule_type in ALLOWED_RULE_TYPES
+        return rule_type in ALLOWED_RULE_TYPE_SET
@@ -83,8 +83,15 @@ def display_rules_tab():
                     }
                 )
 
-            # Display dataframe
-            st.dataframe(display_data, width="stretch", height=300, hide_index=True)
+            # Display dataframe (fixed key keeps the element identity, and
+            # its sort/scroll state, when the rule data changes)
+            st.dataframe(
+                display_data,
+                width="stretch",
+                height=300,
+                hide_index=True,
+                key="rules_df_stable",
+            )
 
             # Selection checkboxes below table
             st.markdown("#### Select Rules for Actions")
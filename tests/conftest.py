@@ -2,9 +2,53 @@ import pytest
 import sys
 from pathlib import Path
 
-# Add src to Path
-project_root = Path(__file__).parent.parent
-sys.path.insert(0, str(project_root))
+# Add project root to sys.path once for every test module
+project_root = str(Path(__file__).resolve().parent.parent)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+
+def pytest_configure(config):
+    """
+    Register custom markers
+
+    Tests are self-contained and can run in parallel with pytest-xdist:
+        pytest -n auto
+    Module-scoped fixtures are simply built once per worker. Only tests whose
+    fixtures write state shared between workers need an xdist_group (run with
+    --dist loadgroup); the marker is registered here so it is accepted when
+    pytest-xdist is not installed.
+
+    File-backed tests (e.g. rules CRUD) write only under tmp_path, so on
+    slow or network disks the temp root can be moved onto tmpfs:
+        TMPDIR=/dev/shm pytest
+    """
+    config.addinivalue_line(
+        "markers", "xdist_group(name): run tests in the same pytest-xdist worker"
+    )
+    config.addinivalue_line(
+        "markers", "integration: end-to-end tests (deselect with -m 'not integration')"
+    )
+    config.addinivalue_line(
+        "markers", "slow: loads real reference data (deselect with -m 'not slow')"
+    )
+
+
+@pytest.fixture(scope="session", autouse=True)
+def unsafe_test_databases():
+    """
+    Open every ProductDatabase created in the test session with unsafe pragmas
+
+    Test databases are throwaway, so skipping fsync and keeping the journal in
+    memory costs nothing. Session-scoped so the default is already set when
+    module- and session-scoped database fixtures are built. Tests can still
+    pass unsafe=False explicitly.
+    """
+    from src.services.ingestion.database import ProductDatabase
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ProductDatabase, "default_unsafe", True)
+        yield
 
 
 @pytest.fixture(autouse=True)
@@ -13,7 +13,7 @@ import pytest
 import tempfile
 import json
 from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import Mock
 
 from src.services.llm_enhancement.batch_processor import BatchProcessor
 from src.services.common.service_factory import ServiceFactory
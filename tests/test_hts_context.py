@@ -4,12 +4,10 @@ Unit tests for HTS Context Service
 
 import pytest
 import json
-import tempfile
 from pathlib import Path
 from src.services.hts_context.loader import HTSReferenceLoader
 from src.services.hts_context.hierarchy import HTSHierarchyBuilder
 from src.services.hts_context.service import HTSContextService
-from src.services.hts_context.models import HTSContextResponse
 
 
 class TestHTSReferenceLoader:
@@ -101,62 +99,87 @@ class TestHTSReferenceLoader:
         assert "indent" in items[0]
 
 
-class TestHTSHierarchyBuilder:
-    """Test HTS Hierarchy Builder and Parent-Finding Algorithm"""
+# Shared 4-level chain: 7301 -> 7301.10 -> 7301.10.00 -> 7301.10.00.00
+_CHAIN_ITEMS = [
+    {"htsno": "7301", "indent": 0, "description": "Sheet piling of iron or steel"},
+    {"htsno": "7301.10", "indent": 1, "description": "Not assembled or fabricated"},
+    {"htsno": "7301.10.00", "indent": 2, "description": "Other"},
+    {"htsno": "7301.10.00.00", "indent": 3, "description": "Other"},
+]
 
-    def test_parent_finding_prefix_match(self):
-        """Test parent-finding with prefix matching"""
-        test_items = [
-            {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
-            {"htsno": "7301.10", "indent": 1, "description": "Not assembled"},
-        ]
 
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
+@pytest.fixture(scope="module")
+def chain_hierarchy():
+    """Hierarchy map for the shared 4-level chain (built once per module)"""
+    builder = HTSHierarchyBuilder()
+    return builder.build_hierarchy_map(_CHAIN_ITEMS)
 
-        # 7301.10 should have 7301 as parent (prefix match)
-        assert hierarchy_map["7301.10"]["parent"] == "7301"
-        assert "7301.10" in hierarchy_map["7301"]["children"]
-        assert builder.parent_finding_stats["prefix_matches"] > 0
 
-    def test_parent_finding_fallback(self):
-        """Test parent-finding with positional fallback"""
-        # Create scenario where prefix doesn't match but positional parent exists
-        test_items = [
-            {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
-            {"htsno": "7301.99", "indent": 1, "description": "Other"},
-        ]
-
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
-
-        # Should find parent via fallback or prefix
-        assert hierarchy_map["7301.99"]["parent"] is not None
+def _assert_parents(items, expectations):
+    """Build hierarchy once and verify every (child, expected_parent) pair"""
+    builder = HTSHierarchyBuilder()
+    hierarchy_map = builder.build_hierarchy_map(items)
 
-    def test_parent_finding_missing_intermediate(self):
-        """Test case where intermediate node is missing"""
-        # 7301.20.50.00 exists but 7301.20.00 doesn't
-        test_items = [
-            {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
-            {"htsno": "7301.20", "indent": 1, "description": "Other"},
-            {"htsno": "7301.20.50.00", "indent": 3, "description": "Specific item"},
-        ]
-
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
+    for child, expected_parent in expectations:
+        assert hierarchy_map[child]["parent"] == expected_parent
+        if expected_parent is not None:
+            assert child in hierarchy_map[expected_parent]["children"]
 
-        # Should find 7301.20 as parent via fallback
-        parent = hierarchy_map["7301.20.50.00"]["parent"]
-        assert parent is not None
+    assert builder.parent_finding_stats["failed"] == 0
+    return builder
 
-    def test_parent_finding_root_level(self):
-        """Test that root level codes have no parent"""
-        test_items = [{"htsno": "7301", "indent": 0, "description": "Sheet piling"}]
 
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
+class TestHTSHierarchyBuilder:
+    """Test HTS Hierarchy Builder and Parent-Finding Algorithm"""
 
-        assert hierarchy_map["7301"]["parent"] is None
+    @pytest.mark.parametrize(
+        "items,expectations",
+        [
+            pytest.param(
+                [
+                    {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
+                    {"htsno": "7301.10", "indent": 1, "description": "Not assembled"},
+                ],
+                [("7301", None), ("7301.10", "7301")],
+                id="prefix_match",
+            ),
+            pytest.param(
+                [
+                    {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
+                    {"htsno": "7301.99", "indent": 1, "description": "Other"},
+                ],
+                [("7301.99", "7301")],
+                id="fallback",
+            ),
+            pytest.param(
+                # 7301.20.50.00 exists but 7301.20.00 doesn't
+                [
+                    {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
+                    {"htsno": "7301.20", "indent": 1, "description": "Other"},
+                    {
+                        "htsno": "7301.20.50.00",
+                        "indent": 3,
+                        "description": "Specific item",
+                    },
+                ],
+                [("7301.20", "7301"), ("7301.20.50.00", "7301.20")],
+                id="missing_intermediate",
+            ),
+            pytest.param(
+                [{"htsno": "7301", "indent": 0, "description": "Sheet piling"}],
+                [("7301", None)],
+                id="root_level",
+            ),
+        ],
+    )
+    def test_parent_finding(self, items, expectations):
+        """Test parent-finding (prefix match, fallback, missing level, root)"""
+        _assert_parents(items, expectations)
+
+    def test_parent_finding_stats(self):
+        """Test that prefix matches are recorded in parent-finding stats"""
+        builder = _assert_parents(_CHAIN_ITEMS[:2], [("7301.10", "7301")])
+        assert builder.parent_finding_stats["prefix_matches"] > 0
 
     def test_orphaned_code_detection(self):
         """Test detection of orphaned codes"""
@@ -172,17 +195,9 @@ class TestHTSHierarchyBuilder:
         # Should be logged as orphaned
         assert "9999.99.99.99" in builder.orphaned_codes
 
-    def test_hierarchy_building_complete(self):
+    def test_hierarchy_building_complete(self, chain_hierarchy):
         """Test complete hierarchy map construction"""
-        test_items = [
-            {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
-            {"htsno": "7301.10", "indent": 1, "description": "Not assembled"},
-            {"htsno": "7301.10.00", "indent": 2, "description": "Other"},
-            {"htsno": "7301.10.00.00", "indent": 3, "description": "Other specific"},
-        ]
-
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
+        hierarchy_map = chain_hierarchy
 
         # Verify all codes are in map
         assert len(hierarchy_map) == 4
@@ -201,27 +216,12 @@ class TestHTSHierarchyBuilder:
 class TestHTSContextService:
     """Test HTS Context Service"""
 
-    @pytest.fixture
-    def test_service(self, tmp_path):
-        """Create test service with mock data"""
-        test_data = [
-            {
-                "htsno": "7301",
-                "indent": 0,
-                "description": "Sheet piling of iron or steel",
-            },
-            {
-                "htsno": "7301.10",
-                "indent": 1,
-                "description": "Not assembled or fabricated",
-            },
-            {"htsno": "7301.10.00", "indent": 2, "description": "Other"},
-            {"htsno": "7301.10.00.00", "indent": 3, "description": "Other"},
-        ]
-
-        test_file = tmp_path / "test_hts.json"
+    @pytest.fixture(scope="module")
+    def test_service(self, tmp_path_factory):
+        """Create test service with mock data (built once per module, read-only)"""
+        test_file = tmp_path_factory.mktemp("hts") / "test_hts.json"
         with open(test_file, "w") as f:
-            json.dump(test_data, f)
+            json.dump(_CHAIN_ITEMS, f)
 
         return HTSContextService(test_file)
 
@@ -308,55 +308,55 @@ class TestHTSContextService:
 class TestParentFindingEdgeCases:
     """Test edge cases in parent-finding algorithm"""
 
-    def test_multiple_candidates_same_level(self):
-        """Test when multiple candidates exist at parent level"""
-        test_items = [
-            {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
-            {"htsno": "7302", "indent": 0, "description": "Other items"},
-            {"htsno": "7301.10", "indent": 1, "description": "Not assembled"},
-        ]
-
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
-
-        # 7301.10 should match 7301, not 7302
-        assert hierarchy_map["7301.10"]["parent"] == "7301"
-
-    def test_complex_hierarchy_chain(self):
-        """Test complex multi-level hierarchy"""
-        test_items = [
-            {"htsno": "7301", "indent": 0, "description": "Level 0"},
-            {"htsno": "7301.10", "indent": 1, "description": "Level 1"},
-            {"htsno": "7301.10.00", "indent": 2, "description": "Level 2"},
-            {"htsno": "7301.10.00.00", "indent": 3, "description": "Level 3"},
-            {"htsno": "7301.20", "indent": 1, "description": "Another Level 1"},
-            {"htsno": "7301.20.50.00", "indent": 3, "description": "Skipped Level 2"},
-        ]
-
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
-
-        # Verify complete chain for 7301.10.00.00
-        assert hierarchy_map["7301.10.00.00"]["parent"] == "7301.10.00"
-        assert hierarchy_map["7301.10.00"]["parent"] == "7301.10"
-        assert hierarchy_map["7301.10"]["parent"] == "7301"
-
-        # Verify item with missing intermediate level finds correct parent
-        parent_of_skipped = hierarchy_map["7301.20.50.00"]["parent"]
-        assert parent_of_skipped == "7301.20"
-
-    def test_non_standard_code_formats(self):
-        """Test handling of non-standard HTS code formats"""
-        test_items = [
-            {"htsno": "73", "indent": 0, "description": "Chapter"},
-            {"htsno": "7301", "indent": 1, "description": "Heading"},
-        ]
-
-        builder = HTSHierarchyBuilder()
-        hierarchy_map = builder.build_hierarchy_map(test_items)
-
-        # Should handle codes without dots
-        assert hierarchy_map["7301"]["parent"] == "73"
+    @pytest.mark.parametrize(
+        "items,expectations",
+        [
+            pytest.param(
+                # 7301.10 should match 7301, not 7302
+                [
+                    {"htsno": "7301", "indent": 0, "description": "Sheet piling"},
+                    {"htsno": "7302", "indent": 0, "description": "Other items"},
+                    {"htsno": "7301.10", "indent": 1, "description": "Not assembled"},
+                ],
+                [("7301.10", "7301")],
+                id="multiple_candidates_same_level",
+            ),
+            pytest.param(
+                [
+                    {"htsno": "7301", "indent": 0, "description": "Level 0"},
+                    {"htsno": "7301.10", "indent": 1, "description": "Level 1"},
+                    {"htsno": "7301.10.00", "indent": 2, "description": "Level 2"},
+                    {"htsno": "7301.10.00.00", "indent": 3, "description": "Level 3"},
+                    {"htsno": "7301.20", "indent": 1, "description": "Another Level 1"},
+                    {
+                        "htsno": "7301.20.50.00",
+                        "indent": 3,
+                        "description": "Skipped Level 2",
+                    },
+                ],
+                [
+                    ("7301.10.00.00", "7301.10.00"),
+                    ("7301.10.00", "7301.10"),
+                    ("7301.10", "7301"),
+                    # Item with missing intermediate level finds correct parent
+                    ("7301.20.50.00", "7301.20"),
+                ],
+                id="complex_hierarchy_chain",
+            ),
+            pytest.param(
+                # Should handle codes without dots
+                [
+                    {"htsno": "73", "indent": 0, "description": "Chapter"},
+                    {"htsno": "7301", "indent": 1, "description": "Heading"},
+                ],
+                [("7301", "73")],
+                id="non_standard_code_formats",
+            ),
+        ],
+    )
+    def test_parent_finding_edge_cases(self, items, expectations):
+        """Test parent-finding for ambiguous and irregular inputs"""
+        _assert_parents(items, expectations)
 
 
 class TestServiceIntegration:
@@ -375,6 +375,73 @@ class TestServiceIntegration:
         assert service.hierarchy_map is not None
         assert len(service.hierarchy_map) == 1
 
+    def test_reference_data_shared_per_file_version(self, tmp_path):
+        """Test services for the same file share parsed data until it changes"""
+        test_file = tmp_path / "test_hts.json"
+        with open(test_file, "w") as f:
+            json.dump(_CHAIN_ITEMS[:2], f)
+
+        service1 = HTSContextService(test_file)
+        service2 = HTSContextService(test_file)
+        # Shared on purpose: the map is read-only, so sharing is safe
+        assert service1.hierarchy_map is service2.hierarchy_map
+        assert service1.hierarchy_builder is not service2.hierarchy_builder
+
+        # Rewriting the file invalidates the cached parse
+        with open(test_file, "w") as f:
+            json.dump(_CHAIN_ITEMS, f)
+
+        service3 = HTSContextService(test_file)
+        assert service3.hierarchy_map is not service1.hierarchy_map
+        assert len(service3.hierarchy_map) == 4
+
+    def test_items_and_hierarchy_from_one_file_stat(self, tmp_path, monkeypatch):
+        """Test the file is statted once, so items and map share a version"""
+        from src.services.hts_context import loader as loader_module
+
+        test_file = tmp_path / "test_hts.json"
+        with open(test_file, "w") as f:
+            json.dump(_CHAIN_ITEMS, f)
+
+        stat_calls = []
+        file_cache_key = loader_module.file_cache_key
+        monkeypatch.setattr(
+            loader_module,
+            "file_cache_key",
+            lambda path: stat_calls.append(path) or file_cache_key(path),
+        )
+
+        service = HTSContextService(test_file)
+
+        assert stat_calls == [test_file]
+        assert [item["htsno"] for item in service.hts_items] == list(
+            service.hierarchy_map
+        )
+
+    def test_shared_reference_data_is_read_only(self, tmp_path):
+        """Test the shared hierarchy map and loaded items can't be mutated"""
+        test_file = tmp_path / "test_hts.json"
+        with open(test_file, "w") as f:
+            json.dump(_CHAIN_ITEMS, f)
+
+        service = HTSContextService(test_file)
+        node = service.hierarchy_map["7301.10"]
+
+        with pytest.raises(TypeError):
+            service.hierarchy_map["9999"] = node
+        with pytest.raises(TypeError):
+            node["parent"] = None
+        with pytest.raises(TypeError):
+            node["item"]["description"] = "Changed"
+        with pytest.raises(AttributeError):
+            node["children"].append("9999")
+        with pytest.raises(TypeError):
+            service.hts_items[0]["indent"] = 5
+
+        # The returned list is a copy, so reordering it is harmless
+        service.hts_items.reverse()
+        assert HTSReferenceLoader.load_hts_json(test_file)[0]["htsno"] == "7301"
+
     def test_multiple_context_lookups(self, tmp_path):
         """Test multiple consecutive lookups"""
         test_data = [
@@ -398,6 +465,13 @@ class TestServiceIntegration:
         assert result2["found"] is True
         assert result3["found"] is True
         assert result1 == result3  # Same result for same code
+        assert result3 is result1  # Repeat lookup served from context cache
+
+        # Clearing the cache forces a fresh (equal) response
+        service.clear_cache()
+        result4 = service.get_hts_context("7301.10")
+        assert result4 is not result1
+        assert result4 == result1
 
 
 if __name__ == "__main__":
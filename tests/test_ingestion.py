@@ -5,7 +5,6 @@ Basic tests for Data Ingestion Service
 import pytest
 import pandas as pd
 from pathlib import Path
-import tempfile
 import shutil
 
 from src.services.ingestion import (
@@ -84,20 +83,45 @@ class TestProductDatabase:
         db = ProductDatabase(temp_db)
         db.create_schema()
 
-        # Verify tables exist
+        # Verify tables exist (probe only the expected names, stream rows)
+        expected = {"products", "processing_results"}
         with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            tables = [row[0] for row in cursor.fetchall()]
+            cursor = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name IN (?, ?)",
+                tuple(expected),
+            )
+            tables = {name for (name,) in cursor}
 
-            assert "products" in tables
-            assert "processing_results" in tables
+        assert tables == expected
+
+    @staticmethod
+    def _pragmas(db):
+        with db.get_connection() as conn:
+            (journal_mode,) = conn.execute("PRAGMA journal_mode").fetchone()
+            (synchronous,) = conn.execute("PRAGMA synchronous").fetchone()
+        return journal_mode, synchronous
+
+    def test_synchronous_normal_only_under_wal(self, temp_db):
+        """Test synchronous is relaxed only once create_schema enables WAL"""
+        db = ProductDatabase(temp_db, unsafe=False)
+
+        # Rollback journal: keep the default synchronous=FULL (2)
+        assert self._pragmas(db) == ("delete", 2)
 
-    def test_insert_products(self, temp_db, sample_records):
-        """Test product insertion"""
-        db = ProductDatabase(temp_db)
         db.create_schema()
 
+        # WAL persists in the file; every connection then uses NORMAL (1)
+        assert self._pragmas(db) == ("wal", 1)
+
+        # A new instance reads the journal mode once and keeps it
+        reopened = ProductDatabase(temp_db, unsafe=False)
+        assert self._pragmas(reopened) == ("wal", 1)
+        assert reopened._wal is True
+
+    def test_insert_products(self, schema_db, sample_records):
+        """Test product insertion"""
+        db = ProductDatabase(schema_db)
+
         count = db.insert_products(sample_records)
         assert count == len(sample_records)
 
@@ -130,6 +154,11 @@ class TestProductDatabase:
         assert stats.unprocessed_count == len(sample_records)
         assert stats.processed_count == 0
 
+    def test_shared_fixture_database_is_unsafe(self, populated_db):
+        """Test module-scoped databases also get the unsafe test pragmas"""
+        assert populated_db.unsafe
+        assert self._pragmas(populated_db)[0] != "wal"
+
 
 class TestIntegration:
     """Integration tests"""
@@ -145,31 +174,80 @@ class TestIntegration:
 # ============= FIXTURES =============
 
 
-@pytest.fixture
-def sample_csv(tmp_path):
-    """Create a minimal sample CSV for testing"""
-    csv_content = """item_id,item_description,product_group,product_group_description,product_group_code,material_class,material_detail,manf_class,supplier_id,supplier_name,country_of_origin,import_type,port_of_delivery,final_hts,hts_description
-ITEM001,Steel rebar 10mm,Steel,Rebar,SP001,Steel,Carbon,Rebar,SUP001,ABC Steel,China,Import,LA,7301.10.00.00,Rebar
-ITEM002,Aluminum sheet 2mm,Aluminum,Sheet,AL001,Aluminum,6061,Sheet,SUP002,XYZ Metals,Canada,Import,Seattle,7301.20.00.00,Aluminum
-ITEM003,Copper wire 2.5mm,Copper,Wire,CU001,Copper,Pure,Wire,SUP003,Copper Corp,Mexico,Import,SD,7302.10.00.00,Copper wire
-"""
-
-    csv_file = tmp_path / "test_products.csv"
-    csv_file.write_text(csv_content)
+_SAMPLE_ROWS = [
+    {
+        "item_id": "ITEM001",
+        "item_description": "Steel rebar 10mm",
+        "product_group": "Steel",
+        "product_group_description": "Rebar",
+        "product_group_code": "SP001",
+        "material_class": "Steel",
+        "material_detail": "Carbon",
+        "manf_class": "Rebar",
+        "supplier_id": "SUP001",
+        "supplier_name": "ABC Steel",
+        "country_of_origin": "China",
+        "import_type": "Import",
+        "port_of_delivery": "LA",
+        "final_hts": "7301.10.00.00",
+        "hts_description": "Rebar",
+    },
+    {
+        "item_id": "ITEM002",
+        "item_description": "Aluminum sheet 2mm",
+        "product_group": "Aluminum",
+        "product_group_description": "Sheet",
+        "product_group_code": "AL001",
+        "material_class": "Aluminum",
+        "material_detail": "6061",
+        "manf_class": "Sheet",
+        "supplier_id": "SUP002",
+        "supplier_name": "XYZ Metals",
+        "country_of_origin": "Canada",
+        "import_type": "Import",
+        "port_of_delivery": "Seattle",
+        "final_hts": "7301.20.00.00",
+        "hts_description": "Aluminum",
+    },
+    {
+        "item_id": "ITEM003",
+        "item_description": "Copper wire 2.5mm",
+        "product_group": "Copper",
+        "product_group_description": "Wire",
+        "product_group_code": "CU001",
+        "material_class": "Copper",
+        "material_detail": "Pure",
+        "manf_class": "Wire",
+        "supplier_id": "SUP003",
+        "supplier_name": "Copper Corp",
+        "country_of_origin": "Mexico",
+        "import_type": "Import",
+        "port_of_delivery": "SD",
+        "final_hts": "7302.10.00.00",
+        "hts_description": "Copper wire",
+    },
+]
+
+
+@pytest.fixture(scope="module")
+def sample_df():
+    """Build sample DataFrame in memory (no CSV round trip)"""
+    return pd.DataFrame(_SAMPLE_ROWS, columns=PRODUCT_COLUMNS)
+
+
+@pytest.fixture(scope="module")
+def sample_csv(tmp_path_factory, sample_df):
+    """Write sample DataFrame to CSV once for tests that need a file path"""
+    csv_file = tmp_path_factory.mktemp("ingestion") / "test_products.csv"
+    sample_df.to_csv(csv_file, index=False)
     return csv_file
 
 
-@pytest.fixture
-def sample_df(sample_csv):
-    """Load sample CSV as DataFrame"""
-    return pd.read_csv(sample_csv)
-
-
-@pytest.fixture
-def sample_records(sample_csv):
-    """Load sample CSV as ProductRecord list"""
+@pytest.fixture(scope="module")
+def sample_records(sample_df):
+    """Convert sample DataFrame to ProductRecord list"""
     loader = CSVLoader()
-    return loader.load_and_convert(sample_csv)
+    return loader.to_product_records(sample_df)
 
 
 @pytest.fixture
@@ -178,10 +256,27 @@ def temp_db(tmp_path):
     return tmp_path / "test.db"
 
 
-@pytest.fixture
-def populated_db(temp_db, sample_records):
-    """Create database with sample data"""
-    db = ProductDatabase(temp_db)
+@pytest.fixture(scope="module")
+def _template_db(tmp_path_factory):
+    """Create an empty database with schema once per module"""
+    db = ProductDatabase(tmp_path_factory.mktemp("template_db") / "template.db")
     db.create_schema()
+    return db.db_path
+
+
+@pytest.fixture
+def schema_db(tmp_path, _template_db):
+    """Copy the schema-only template database into a fresh test path"""
+    db_path = tmp_path / "test.db"
+    shutil.copyfile(_template_db, db_path)
+    return db_path
+
+
+@pytest.fixture(scope="module")
+def populated_db(tmp_path_factory, _template_db, sample_records):
+    """Create database with sample data (shared by read-only tests)"""
+    db_path = tmp_path_factory.mktemp("populated_db") / "test.db"
+    shutil.copyfile(_template_db, db_path)
+    db = ProductDatabase(db_path)
     db.insert_products(sample_records)
     return db
@@ -0,0 +1,58 @@
+"""
+Test suite for shared JSON helpers (common.json_utils)
+Tests the orjson path and the stdlib json fallback when orjson is missing
+"""
+
+import pytest
+import importlib.util
+import sys
+
+from src.services.common import json_utils
+
+SAMPLE_DATA = {
+    "rules": [
+        {"rule_id": "R001", "rule_name": "Übergröße", "active": True},
+        {"rule_id": "R002", "rule_name": "Rule 2", "active": False},
+    ]
+}
+
+
+class TestWithoutOrjson:
+    """Test JSON handling when the optional orjson is missing"""
+
+    def test_imports_without_orjson(self, monkeypatch):
+        """Test json_utils falls back to stdlib json when orjson can't import"""
+        # A None entry in sys.modules makes "import orjson" raise ImportError
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        spec = importlib.util.spec_from_file_location(
+            "_json_utils_no_orjson", json_utils.__file__
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        assert module.orjson is None
+        assert module.json_loads(module.json_dumps(SAMPLE_DATA)) == SAMPLE_DATA
+        assert (
+            module.json_loads(module.json_dumps(SAMPLE_DATA, indent=True))
+            == SAMPLE_DATA
+        )
+
+    @pytest.mark.parametrize(
+        "indent", [pytest.param(True, id="indent"), pytest.param(False, id="compact")]
+    )
+    def test_file_round_trip_without_orjson(self, tmp_path, monkeypatch, indent):
+        """Test write_json/read_json round trip through the stdlib fallback"""
+        monkeypatch.setattr(json_utils, "orjson", None)
+        path = tmp_path / "data.json"
+
+        json_utils.write_json(path, SAMPLE_DATA, indent=indent)
+
+        written = path.read_bytes()
+        assert (b"\n" in written) is indent
+        # Non-ASCII text is written as UTF-8, matching orjson output
+        assert "Übergröße".encode("utf-8") in written
+        assert json_utils.read_json(path) == SAMPLE_DATA
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "-n", "auto"])
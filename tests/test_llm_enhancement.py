@@ -4,24 +4,53 @@ Unit tests for LLM Enhancement Service (Service 3)
 
 import pytest
 import json
-import tempfile
-from pathlib import Path
-from unittest.mock import Mock, patch, MagicMock
-
-from src.services.llm_enhancement.models import (
-    LLMResponse,
-    ExtractedFeatures,
-    BatchResult,
-    ProductResult,
-)
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch, MagicMock
+
 from src.services.llm_enhancement.prompt_builder import PromptBuilder
-from src.services.llm_enhancement.response_parser import ResponseParser
+from src.services.llm_enhancement.response_parser import (
+    ResponseParser,
+    _find_json_end,
+    _find_json_object,
+)
 from src.services.llm_enhancement.api_client import OpenAIClient
 from src.services.llm_enhancement.config import SYSTEM_PROMPT
 
 
+@pytest.fixture(scope="module")
+def product():
+    """Lightweight product record for prompt and batch tests (read-only)"""
+    return SimpleNamespace(
+        item_id="ITEM001",
+        item_description="Test product",
+        material_detail="Steel",
+        product_group="TEST",
+        final_hts="7307.19.30.60",
+    )
+
+
 # ============= TEST PROMPT BUILDER =============
 
+_DI_SPACER = {
+    "item_description": "DI SPACER 18 INCH",
+    "material_detail": "Ductile Iron",
+    "product_group": "FITTINGS",
+}
+
+_HTS_CONTEXT = {
+    "hierarchy_path": [
+        {"code": "7307", "description": "Tube or pipe fittings", "indent": 0},
+        {"code": "7307.19", "description": "Other fittings", "indent": 1},
+        {"code": "7307.19.30.60", "description": "Specific fitting", "indent": 3},
+    ]
+}
+
+_RULES = [
+    {"rule_id": "R001", "rule_content": "Expand DI to Ductile Iron"},
+    {"rule_id": "R002", "rule_content": "Include manufacturer name if present"},
+]
+
 
 class TestPromptBuilder:
     """Test prompt construction"""
@@ -38,93 +67,83 @@ class TestPromptBuilder:
         assert "confidence_score" in system_prompt
         assert "extracted_features" in system_prompt
 
-    def test_user_prompt_basic(self):
-        """Test basic user prompt construction"""
+    @pytest.mark.parametrize(
+        "overrides,hts_context,rules,must,must_not",
+        [
+            pytest.param(
+                _DI_SPACER,
+                None,
+                None,
+                ["DI SPACER 18 INCH", "Ductile Iron", "FITTINGS", "7307.19.30.60"],
+                ["ITEM001"],  # Item ID not in prompt
+                id="basic",
+            ),
+            pytest.param(
+                {},
+                _HTS_CONTEXT,
+                None,
+                [
+                    "HTS Classification Context:",
+                    "7307",
+                    "Tube or pipe fittings",
+                    "7307.19.30.60",
+                ],
+                [],
+                id="with_hts_context",
+            ),
+            pytest.param(
+                {},
+                None,
+                _RULES,
+                [
+                    "Rules to Apply:",
+                    "Expand DI to Ductile Iron",
+                    "Include manufacturer name",
+                ],
+                [],
+                id="with_rules",
+            ),
+            pytest.param(
+                {},
+                None,
+                None,
+                ["Test product"],
+                ["Rules to Apply:"],
+                id="without_rules",  # Pass 1
+            ),
+        ],
+    )
+    def test_user_prompt(self, product, overrides, hts_context, rules, must, must_not):
+        """Test user prompt construction with optional HTS context and rules"""
         builder = PromptBuilder(SYSTEM_PROMPT)
 
-        # Mock product
-        product = Mock()
-        product.item_id = "ITEM001"
-        product.item_description = "DI SPACER 18 INCH"
-        product.material_detail = "Ductile Iron"
-        product.product_group = "FITTINGS"
-        product.final_hts = "7307.19.30.60"
+        product = SimpleNamespace(**{**vars(product), **overrides})
 
-        prompt = builder.build_user_prompt(product, hts_context=None, rules=None)
+        prompt = builder.build_user_prompt(
+            product, hts_context=hts_context, rules=rules
+        )
 
-        assert "ITEM001" not in prompt  # Item ID not in prompt
-        assert "DI SPACER 18 INCH" in prompt
-        assert "Ductile Iron" in prompt
-        assert "FITTINGS" in prompt
-        assert "7307.19.30.60" in prompt
-        # assert "Product Information:" in prompt
+        for text in must:
+            assert text in prompt
+        for text in must_not:
+            assert text not in prompt
 
-    def test_user_prompt_with_hts_context(self):
-        """Test prompt with HTS hierarchy context"""
+    def test_bind_rules_matches_build_user_prompt(self, product):
+        """Test batch-specialized prompt function matches per-call building"""
         builder = PromptBuilder(SYSTEM_PROMPT)
 
-        product = Mock()
-        product.item_id = "ITEM001"
-        product.item_description = "Test product"
-        product.material_detail = "Steel"
-        product.product_group = "TEST"
-        product.final_hts = "7307.19.30.60"
-
+        rules = [{"rule_id": "R001", "rule_content": "Expand DI to Ductile Iron"}]
         hts_context = {
             "hierarchy_path": [
-                {"code": "7307", "description": "Tube or pipe fittings", "indent": 0},
-                {"code": "7307.19", "description": "Other fittings", "indent": 1},
-                {
-                    "code": "7307.19.30.60",
-                    "description": "Specific fitting",
-                    "indent": 3,
-                },
+                {"code": "7307", "description": "Tube or pipe fittings", "indent": 0}
             ]
         }
 
-        prompt = builder.build_user_prompt(product, hts_context=hts_context, rules=None)
-
-        assert "HTS Classification Context:" in prompt
-        assert "7307" in prompt
-        assert "Tube or pipe fittings" in prompt
-        assert "7307.19.30.60" in prompt
-
-    def test_user_prompt_with_rules(self):
-        """Test prompt with rules"""
-        builder = PromptBuilder(SYSTEM_PROMPT)
-
-        product = Mock()
-        product.item_id = "ITEM001"
-        product.item_description = "Test product"
-        product.material_detail = "Steel"
-        product.product_group = "TEST"
-        product.final_hts = "7307.19.30.60"
-
-        rules = [
-            {"rule_id": "R001", "rule_content": "Expand DI to Ductile Iron"},
-            {"rule_id": "R002", "rule_content": "Include manufacturer name if present"},
-        ]
-
-        prompt = builder.build_user_prompt(product, hts_context=None, rules=rules)
-
-        assert "Rules to Apply:" in prompt
-        assert "Expand DI to Ductile Iron" in prompt
-        assert "Include manufacturer name" in prompt
-
-    def test_user_prompt_without_rules(self):
-        """Test prompt without rules (Pass 1)"""
-        builder = PromptBuilder(SYSTEM_PROMPT)
-
-        product = Mock()
-        product.item_id = "ITEM001"
-        product.item_description = "Test product"
-        product.material_detail = "Steel"
-        product.product_group = "TEST"
-        product.final_hts = "7307.19.30.60"
-
-        prompt = builder.build_user_prompt(product, hts_context=None, rules=None)
-
-        assert "Rules to Apply:" not in prompt
+        for batch_rules in (None, rules):
+            build_prompt = builder.bind_rules(batch_rules)
+            assert build_prompt(product, hts_context) == builder.build_user_prompt(
+                product, hts_context=hts_context, rules=batch_rules
+            )
 
     def test_hts_hierarchy_formatting(self):
         """Test HTS hierarchy formatting with indentation"""
@@ -183,6 +202,9 @@ class TestPromptBuilder:
                     "      "
                 ), f"Line with [7307.19.30.60] should have 6 spaces: {repr(line)}"
 
+        # Same hierarchy chain is served from the memoized formatter
+        assert builder._format_hts_hierarchy(hts_context["hierarchy_path"]) is formatted
+
 
 # ============= TEST RESPONSE PARSER =============
 
@@ -267,6 +289,37 @@ I hope this helps!"""
         with pytest.raises(ValueError, match="Could not extract valid JSON"):
             parser.extract_json_from_response(response)
 
+    @pytest.mark.parametrize(
+        "text,start,expected",
+        [
+            pytest.param('{"a": 1}', 0, 7, id="flat"),
+            pytest.param('{"a": {"b": {"c": 1}}, "d": 2}', 0, 29, id="nested"),
+            pytest.param('{"a": "}{"}', 0, 10, id="braces_in_string"),
+            pytest.param(r'{"a": "say \"}\""}', 0, 17, id="escaped_quotes"),
+            pytest.param(r'{"a": "C:\\"}', 0, 12, id="escaped_backslash"),
+            pytest.param('Note: {"a": 1} done', 6, 13, id="offset_start"),
+            pytest.param('{"a": {"b": 1}', 0, -1, id="unterminated_object"),
+            pytest.param('{"a": "}', 0, -1, id="unterminated_string"),
+            pytest.param("", 0, -1, id="empty"),
+        ],
+    )
+    def test_find_json_end(self, text, start, expected):
+        """Test closing brace detection ignores braces inside strings"""
+        assert _find_json_end(text, start) == expected
+
+    @pytest.mark.parametrize(
+        "text,expected",
+        [
+            pytest.param('{"a": 1}', ({"a": 1}, 7), id="pure_json"),
+            pytest.param('Use {name} here: {"a": 1}', ({"a": 1}, 24), id="prose_brace"),
+            pytest.param('Use {name} here: {"a": ', (None, -1), id="incomplete"),
+            pytest.param("No JSON here", (None, -1), id="no_json"),
+        ],
+    )
+    def test_find_json_object(self, text, expected):
+        """Test first balanced span that parses is taken as the JSON object"""
+        assert _find_json_object(text) == expected
+
     def test_validate_complete_response(self):
         """Test validation of complete valid response"""
         parser = ResponseParser()
@@ -410,6 +463,32 @@ I hope this helps!"""
         assert flattened["rules_applied"] == '["R001", "R002"]'
         assert flattened["pass_number"] == "1"
 
+    def test_flatten_many_for_database(self):
+        """Test batch flattening matches per-response flattening"""
+        parser = ResponseParser()
+
+        parsed_list = [
+            {
+                "enhanced_description": f"Description {i}",
+                "confidence_score": "0.85",
+                "confidence_level": "High",
+                "extracted_features": {
+                    "customer_name": None,
+                    "dimensions": f"{i} inch",
+                    "product": "Fitting",
+                },
+            }
+            for i in range(3)
+        ]
+        rules = [{"rule_id": "R001"}, {"rule_id": "R002"}]
+
+        rows = parser.flatten_many_for_database(parsed_list, rules, pass_number=2)
+
+        assert rows == [
+            parser.flatten_for_database(parsed, f"ITEM{i}", rules, pass_number=2)
+            for i, parsed in enumerate(parsed_list)
+        ]
+
     def test_calculate_fallback_confidence(self):
         """Test fallback confidence calculation"""
         parser = ResponseParser()
@@ -462,6 +541,7 @@ class TestOpenAIClient:
             assert response
             parsed = json.loads(response)
             assert "enhanced_description" in parsed
+            assert "test product" in parsed["enhanced_description"]
 
     def test_mock_response_generation(self):
         """Test mock response generation"""
@@ -501,61 +581,248 @@ class TestOpenAIClient:
 
         mock_client.chat.completions.create.return_value = mock_response
 
-        with patch.dict("os.environ", {"MOCK_OPENAI": "false"}):
+        with patch("src.services.llm_enhancement.api_client.MOCK_OPENAI", False):
             client = OpenAIClient(api_key="test-key")
             response = client.call_api("Test prompt")
 
             assert "enhanced_description" in response
+            assert mock_client.chat.completions.create.call_count == 1
+
+            # Requests share one pooled keep-alive HTTP client
+            http_client = mock_openai_class.call_args.kwargs["http_client"]
+            assert http_client is client._http_client
+
+            client.close()
+
+    @pytest.mark.parametrize(
+        "deltas,json_deltas",
+        [
+            pytest.param(
+                ['{"enhanced_description": ', '"Test"}', " Hope this", " helps!"],
+                2,
+                id="trailing_text",
+            ),
+            pytest.param(
+                [
+                    "Fields like {name} are filled in: ",
+                    '{"enhanced_description": ',
+                    '"Test"}',
+                    " Hope this helps!",
+                ],
+                3,
+                id="brace_in_preamble",
+            ),
+        ],
+    )
+    @patch("src.services.llm_enhancement.api_client.AsyncOpenAI")
+    @patch("src.services.llm_enhancement.api_client.OpenAI")
+    def test_call_api_async_stops_stream_after_json(
+        self, mock_openai_class, mock_async_openai_class, deltas, json_deltas
+    ):
+        """Test streamed response is cut off once the JSON object is complete"""
+        received = []
+
+        class FakeStream:
+            close = AsyncMock()
+
+            async def __aiter__(self):
+                for delta in deltas:
+                    received.append(delta)
+                    chunk = MagicMock()
+                    chunk.choices = [MagicMock()]
+                    chunk.choices[0].delta.content = delta
+                    yield chunk
+
+        stream = FakeStream()
+        mock_async_client = MagicMock()
+        mock_async_client.chat.completions.create = AsyncMock(return_value=stream)
+        mock_async_openai_class.return_value = mock_async_client
+
+        with patch("src.services.llm_enhancement.api_client.MOCK_OPENAI", False):
+            client = OpenAIClient(api_key="test-key")
+            response = asyncio.run(client.call_api_async("Test prompt"))
+
+        assert response == "".join(deltas[:json_deltas])
+        assert received == deltas[:json_deltas]
+        stream.close.assert_awaited_once()
+        create_kwargs = mock_async_client.chat.completions.create.call_args.kwargs
+        assert create_kwargs["stream"] is True
+
+    @patch("src.services.llm_enhancement.api_client.AsyncOpenAI")
+    @patch("src.services.llm_enhancement.api_client.OpenAI")
+    def test_async_client_closed_when_loop_changes(
+        self, mock_openai_class, mock_async_openai_class
+    ):
+        """Test the async client replaced for another loop is closed on its own"""
+        first, second = _mock_async_openai("{}"), _mock_async_openai("{}")
+        mock_async_openai_class.side_effect = [first, second]
+
+        with patch("src.services.llm_enhancement.api_client.MOCK_OPENAI", False):
+            client = OpenAIClient(api_key="test-key")
+            client.run_async(client.call_api_async("Prompt 1"))
+            asyncio.run(client.call_api_async("Prompt 2"))
+
+        first.close.assert_awaited_once()
+        second.close.assert_not_awaited()
+
+        client.close()
+        assert client._async_client is None
+        assert client._loop is None
+
+    @patch("src.services.llm_enhancement.api_client.OpenAI")
+    def test_call_api_cache_hit(self, mock_openai_class):
+        """Test identical prompts are served from the response cache"""
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = '{"enhanced_description": "Test"}'
+        mock_client.chat.completions.create.return_value = mock_response
+
+        with patch("src.services.llm_enhancement.api_client.MOCK_OPENAI", False):
+            client = OpenAIClient(api_key="test-key")
+
+            first = client.call_api("Test prompt")
+            # Nothing is cached until the caller accepts the response
+            client.call_api("Test prompt")
+            assert mock_client.chat.completions.create.call_count == 2
+
+            client.cache_response("Test prompt", first)
+            second = client.call_api("Test prompt")
+            assert mock_client.chat.completions.create.call_count == 2
+            assert first == second
+
+            client.call_api("Different prompt")
+            assert mock_client.chat.completions.create.call_count == 3
+
+            client.clear_cache()
+            client.call_api("Test prompt")
+            assert mock_client.chat.completions.create.call_count == 4
+
+    @patch("src.services.llm_enhancement.api_client.OpenAI")
+    def test_batch_api_submit_and_wait(self, mock_openai_class):
+        """Test Batch API submission and polling until completion"""
+        mock_client = MagicMock()
+        mock_openai_class.return_value = mock_client
+
+        mock_client.files.create.return_value = MagicMock(id="file-input")
+        mock_client.batches.create.return_value = MagicMock(id="batch_123")
+        mock_client.batches.retrieve.side_effect = [
+            MagicMock(status="validating"),
+            MagicMock(status="in_progress"),
+            MagicMock(status="completed", output_file_id="file-output"),
+        ]
+
+        content = json.dumps({"enhanced_description": "Test"})
+        output_lines = [
+            {
+                "custom_id": "ITEM001",
+                "response": {
+                    "status_code": 200,
+                    "body": {"choices": [{"message": {"content": content}}]},
+                },
+                "error": None,
+            },
+            {
+                "custom_id": "ITEM002",
+                "response": None,
+                "error": {"code": "server_error", "message": "failed"},
+            },
+        ]
+        mock_client.files.content.return_value = MagicMock(
+            text="\n".join(json.dumps(line) for line in output_lines)
+        )
+
+        with patch("src.services.llm_enhancement.api_client.MOCK_OPENAI", False):
+            client = OpenAIClient(api_key="test-key")
+
+            requests = [
+                client.build_batch_request("ITEM001", "Prompt 1"),
+                client.build_batch_request("ITEM002", "Prompt 2"),
+            ]
+            batch_id = client.submit_batch(requests)
+            responses = client.wait_for_batch(batch_id, poll_interval=0)
+
+        assert batch_id == "batch_123"
+        assert requests[0]["url"] == "/v1/chat/completions"
+        assert mock_client.files.create.call_args.kwargs["purpose"] == "batch"
+        assert mock_client.batches.create.call_args.kwargs["input_file_id"] == (
+            "file-input"
+        )
+        assert mock_client.batches.retrieve.call_count == 3
+        assert responses == {"ITEM001": content}
 
 
 # ============= TEST BATCH PROCESSOR =============
 
 
-class TestBatchProcessor:
-    """Test batch processing logic"""
+def _mock_async_openai(content):
+    """AsyncOpenAI stand-in whose chat completions stream back content"""
 
-    @pytest.fixture
-    def mock_db(self):
-        """Mock database"""
-        db = Mock()
+    def fake_stream(**kwargs):
+        stream = MagicMock()
+        stream.close = AsyncMock()
 
-        # Mock product
-        product = Mock()
-        product.item_id = "ITEM001"
-        product.item_description = "Test product"
-        product.material_detail = "Steel"
-        product.product_group = "TEST"
-        product.final_hts = "7307.19.30.60"
+        async def chunks():
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = content
+            yield chunk
 
-        db.get_unprocessed_products.return_value = [product]
-        db.get_product_by_id.return_value = product
-        db.update_processing_results.return_value = True
+        stream.__aiter__ = lambda _: chunks()
+        return stream
 
-        return db
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=fake_stream)
+    client.close = AsyncMock()
+    return client
 
-    @pytest.fixture
-    def mock_hts_service(self):
-        """Mock HTS service"""
-        service = Mock()
-        service.get_hts_context.return_value = {"found": True, "hierarchy_path": []}
-        return service
+
+@pytest.fixture
+def mock_db(product):
+    """Mock database"""
+    db = Mock()
+
+    db.get_unprocessed_products.return_value = [product]
+    db.get_product_by_id.return_value = product
+    db.update_processing_results.return_value = True
+
+    return db
+
+
+@pytest.fixture
+def mock_hts_service():
+    """Mock HTS service"""
+    service = Mock()
+    service.get_hts_context.return_value = {"found": True, "hierarchy_path": []}
+    return service
+
+
+class TestBatchProcessor:
+    """Test batch processing logic"""
+
+    LLM_RESPONSE = json.dumps(
+        {
+            "enhanced_description": "Enhanced test product",
+            "confidence_score": "0.85",
+            "confidence_level": "High",
+            "extracted_features": {
+                "customer_name": None,
+                "dimensions": None,
+                "product": "Test Product",
+            },
+        }
+    )
 
     @pytest.fixture
     def mock_openai_client(self):
         """Mock OpenAI client"""
         client = Mock()
-        client.call_api.return_value = json.dumps(
-            {
-                "enhanced_description": "Enhanced test product",
-                "confidence_score": "0.85",
-                "confidence_level": "High",
-                "extracted_features": {
-                    "customer_name": None,
-                    "dimensions": None,
-                    "product": "Test Product",
-                },
-            }
-        )
+        client.call_api = Mock(return_value=self.LLM_RESPONSE)
+        client.call_api_async = AsyncMock(return_value=self.LLM_RESPONSE)
+        # Drive the coroutine the way the real client's private loop does
+        client.run_async = Mock(side_effect=asyncio.run)
         return client
 
     def test_process_batch_pass_1(self, mock_db, mock_hts_service, mock_openai_client):
@@ -573,6 +840,117 @@ class TestBatchProcessor:
         assert result.successful == 1
         assert result.failed == 0
         assert result.success_rate == 1.0
+        mock_openai_client.call_api_async.assert_awaited_once()
+
+    @pytest.mark.parametrize(
+        "llm_response,cached",
+        [
+            pytest.param(LLM_RESPONSE, True, id="valid"),
+            pytest.param(
+                'Sure! {"enhanced_description": "Trunc', False, id="truncated"
+            ),
+            pytest.param('{"enhanced_description": "Test"}', False, id="invalid"),
+        ],
+    )
+    def test_process_batch_caches_only_valid_responses(
+        self, mock_db, mock_hts_service, mock_openai_client, llm_response, cached
+    ):
+        """Test responses are cached only after they parse and validate"""
+        from src.services.llm_enhancement.batch_processor import BatchProcessor
+
+        mock_openai_client.call_api_async.return_value = llm_response
+        processor = BatchProcessor(
+            db=mock_db, hts_service=mock_hts_service, openai_client=mock_openai_client
+        )
+
+        result = processor.process_batch(batch_size=10, pass_number=1)
+
+        assert result.successful == int(cached)
+        if cached:
+            prompt = mock_openai_client.call_api_async.await_args.args[0]
+            mock_openai_client.cache_response.assert_called_once_with(
+                prompt, llm_response
+            )
+        else:
+            mock_openai_client.cache_response.assert_not_called()
+
+    @patch("src.services.llm_enhancement.api_client.AsyncOpenAI")
+    @patch("src.services.llm_enhancement.api_client.OpenAI")
+    def test_process_batch_reuses_async_client(
+        self, mock_openai_class, mock_async_openai_class, mock_db, mock_hts_service
+    ):
+        """Test consecutive batches share one event loop and async client"""
+        from src.services.llm_enhancement.batch_processor import BatchProcessor
+
+        mock_async_client = _mock_async_openai(self.LLM_RESPONSE)
+        mock_async_openai_class.return_value = mock_async_client
+
+        with patch("src.services.llm_enhancement.api_client.MOCK_OPENAI", False):
+            client = OpenAIClient(api_key="test-key")
+        processor = BatchProcessor(
+            db=mock_db, hts_service=mock_hts_service, openai_client=client
+        )
+
+        first = processor.process_batch(batch_size=10, pass_number=1)
+        loop = client._loop
+        # Force a second real API call instead of a response cache hit
+        client.clear_cache()
+        second = processor.process_batch(batch_size=10, pass_number=1)
+
+        assert first.successful == 1
+        assert second.successful == 1
+        assert mock_async_client.chat.completions.create.await_count == 2
+        assert mock_async_openai_class.call_count == 1
+        assert client._loop is loop
+
+        client.close()
+        mock_async_client.close.assert_awaited_once()
+        assert client._loop is None
+
+    def test_process_batch_inside_running_loop(
+        self, mock_db, mock_hts_service, mock_openai_client
+    ):
+        """Test batch called from async code falls back to sequential sync calls"""
+        from src.services.llm_enhancement.batch_processor import BatchProcessor
+
+        processor = BatchProcessor(
+            db=mock_db, hts_service=mock_hts_service, openai_client=mock_openai_client
+        )
+
+        async def run_from_async_code():
+            return processor.process_batch(batch_size=10, pass_number=1)
+
+        result = asyncio.run(run_from_async_code())
+
+        assert result.successful == 1
+        mock_openai_client.call_api.assert_called_once()
+        mock_openai_client.run_async.assert_not_called()
+
+    def test_batch_api_keys_requests_by_position(
+        self, mock_db, mock_hts_service, mock_openai_client, product
+    ):
+        """Test repeated item IDs get unique custom IDs and their own responses"""
+        from src.services.llm_enhancement.batch_processor import BatchProcessor
+
+        mock_db.get_unprocessed_products.return_value = [product, product]
+        mock_openai_client.build_batch_request.side_effect = (
+            lambda custom_id, prompt: {"custom_id": custom_id}
+        )
+        mock_openai_client.wait_for_batch.return_value = {
+            "0:ITEM001": self.LLM_RESPONSE,
+            "1:ITEM001": "not json",
+        }
+
+        processor = BatchProcessor(
+            db=mock_db, hts_service=mock_hts_service, openai_client=mock_openai_client
+        )
+        result = processor.process_batch(
+            batch_size=10, pass_number=1, use_batch_api=True
+        )
+
+        requests = mock_openai_client.submit_batch.call_args.args[0]
+        assert [r["custom_id"] for r in requests] == ["0:ITEM001", "1:ITEM001"]
+        assert [r.success for r in result.results] == [True, False]
 
     def test_process_batch_empty_products(self, mock_hts_service, mock_openai_client):
         """Test batch processing with no products"""
@@ -594,22 +972,17 @@ class TestBatchProcessor:
 # ============= TEST INTEGRATION =============
 
 
+@pytest.mark.integration
 class TestIntegration:
     """Integration tests"""
 
-    def test_full_pipeline_single_product(self):
+    def test_full_pipeline_single_product(self, product):
         """Test complete pipeline with mock data"""
         from src.services.llm_enhancement.prompt_builder import PromptBuilder
         from src.services.llm_enhancement.response_parser import ResponseParser
         from src.services.llm_enhancement.config import SYSTEM_PROMPT
 
-        # Mock product
-        product = Mock()
-        product.item_id = "ITEM001"
-        product.item_description = "DI SPACER 18 INCH"
-        product.material_detail = "Ductile Iron"
-        product.product_group = "FITTINGS"
-        product.final_hts = "7307.19.30.60"
+        product = SimpleNamespace(**{**vars(product), **_DI_SPACER})
 
         # Build prompt
         builder = PromptBuilder(SYSTEM_PROMPT)
@@ -645,4 +1018,4 @@ class TestIntegration:
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+    pytest.main([__file__, "-v", "-n", "auto"])
@@ -4,260 +4,237 @@ Tests create, read, update, delete operations for RuleManager
 """
 
 import pytest
-import json
-import tempfile
-import sys
-from pathlib import Path
-from datetime import datetime, timezone
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.services.common.json_utils import json_dumps, json_loads
+from src.services.rules import manager as manager_module
 from src.services.rules.manager import RuleManager
 from src.services.rules.models import Rule
-from src.services.rules.config import ALLOWED_RULE_TYPES
+
+# Canonical rule fixtures, built once; copy with {**RULE, ...} before mutating
+BASE_RULE = {
+    "rule_id": "R001",
+    "rule_name": "Test Rule",
+    "rule_content": "Content",
+    "rule_type": "material",
+    "active": True,
+}
+
+THREE_SEQUENTIAL_RULES = {
+    "rules": [
+        {
+            **BASE_RULE,
+            "rule_id": f"R{i:03d}",
+            "rule_name": f"Rule {i}",
+            "rule_content": f"Content {i}",
+        }
+        for i in (1, 2, 3)
+    ]
+}
+
+NON_SEQUENTIAL_RULES = {
+    "rules": [
+        {
+            **BASE_RULE,
+            "rule_id": f"R{i:03d}",
+            "rule_name": f"Rule {i}",
+            "rule_content": f"Content {i}",
+        }
+        for i in (1, 3, 10)
+    ]
+}
+
+EXISTING_R001_RULES = {"rules": [{**BASE_RULE, "rule_name": "Existing Rule"}]}
+
+ORIGINAL_R001_RULES = {
+    "rules": [
+        {
+            **BASE_RULE,
+            "rule_name": "Original Name",
+            "rule_content": "Original Content",
+            "description": "Original Description",
+            "created_at": "2025-01-01T00:00:00Z",
+        }
+    ],
+    "metadata": {
+        "version": "1.0",
+        "last_updated": "2025-01-01T00:00:00Z",
+        "total_rules": 1,
+        "active_rules": 1,
+    },
+}
+
+TWO_RULES = {
+    "rules": THREE_SEQUENTIAL_RULES["rules"][:2],
+    "metadata": {
+        "version": "1.0",
+        "last_updated": "2025-01-01T00:00:00Z",
+        "total_rules": 2,
+        "active_rules": 2,
+    },
+}
+
+THREE_RULES_ONE_INACTIVE = {
+    "rules": [
+        *THREE_SEQUENTIAL_RULES["rules"][:2],
+        {**THREE_SEQUENTIAL_RULES["rules"][2], "active": False},
+    ],
+    "metadata": {
+        "version": "1.0",
+        "last_updated": "2025-01-01T00:00:00Z",
+        "total_rules": 3,
+        "active_rules": 2,
+    },
+}
+
+# Pre-encoded UTF-8 payloads for tests that write a fixed rules file
+THREE_SEQUENTIAL_JSON = json_dumps(THREE_SEQUENTIAL_RULES)
+NON_SEQUENTIAL_JSON = json_dumps(NON_SEQUENTIAL_RULES)
+EXISTING_R001_JSON = json_dumps(EXISTING_R001_RULES)
+
+# (invalid_rule, substrings expected in the lowercased validation errors)
+INVALID_RULE_CASES = [
+    pytest.param(
+        {"rule_id": "R001", "rule_name": "Test Rule"},
+        ["rule_content", "rule_type", "active"],
+        id="missing_required_fields",
+    ),
+    pytest.param(
+        {**BASE_RULE, "rule_id": "INVALID123"},
+        ["pattern"],
+        id="invalid_rule_id_format",
+    ),
+    pytest.param(
+        {**BASE_RULE, "rule_id": "R001\n"},
+        ["pattern"],
+        id="rule_id_trailing_newline",
+    ),
+    pytest.param(
+        {**BASE_RULE, "rule_type": "invalid_type"},
+        ["rule_type"],
+        id="invalid_rule_type",
+    ),
+    pytest.param(
+        {**BASE_RULE, "rule_name": "", "rule_content": "   "},
+        ["rule_name", "rule_content"],
+        id="empty_strings",
+    ),
+]
+
+
+def seed_rules(manager, payload):
+    """Write payload's rules to the manager's empty rules file in one add_rules"""
+    result = manager.add_rules([{**rule} for rule in payload["rules"]])
+    assert result["success"], result["errors"]
+
+
+FROZEN_NOW = "2025-06-01T00:00:00+00:00"
+
+
+@pytest.fixture(autouse=True)
+def frozen_clock(monkeypatch):
+    """Stamp rule timestamps with a fixed time instead of reading the clock"""
+    monkeypatch.setattr(manager_module, "_utc_now_iso", lambda: FROZEN_NOW)
+
+
+@pytest.fixture
+def manager(tmp_path):
+    """RuleManager backed by a rules file in pytest's per-test tmp_path"""
+    return RuleManager(rules_file=tmp_path / "rules.json")
+
+
+@pytest.fixture
+def manager_with_5_rules(manager):
+    """Manager whose rules file holds R001-R005, created in one bulk add"""
+    result = manager.add_rules(
+        [
+            {
+                **BASE_RULE,
+                "rule_id": f"R{i:03d}",
+                "rule_name": f"Rule {i}",
+                "rule_content": f"Content {i}",
+            }
+            for i in range(1, 6)
+        ]
+    )
+    assert result["added_count"] == 5
+    return manager
 
 
 class TestGetNextRuleId:
     """Test get_next_rule_id method"""
 
-    def setup_method(self):
-        """Setup test environment with temporary directory"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def create_test_rules_file(self, rules_data):
-        """Helper to create a test rules file"""
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(rules_data, f)
+    def create_test_rules_file(self, manager, payload):
+        """Helper to create a test rules file from encoded JSON"""
+        manager.rules_file.write_bytes(payload)
 
-    def test_next_id_no_existing_rules(self):
+    def test_next_id_no_existing_rules(self, manager):
         """Test generating next ID when no rules exist"""
-        next_id = self.manager.get_next_rule_id()
+        next_id = manager.get_next_rule_id()
         assert next_id == "R001"
 
-    def test_next_id_with_sequential_rules(self):
+    def test_next_id_with_sequential_rules(self, manager):
         """Test generating next ID with sequential existing rules"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Rule 1",
-                    "rule_content": "Content 1",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R002",
-                    "rule_name": "Rule 2",
-                    "rule_content": "Content 2",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R003",
-                    "rule_name": "Rule 3",
-                    "rule_content": "Content 3",
-                    "rule_type": "material",
-                    "active": True,
-                },
-            ]
-        }
-
-        self.create_test_rules_file(test_data)
-        next_id = self.manager.get_next_rule_id()
+        self.create_test_rules_file(manager, THREE_SEQUENTIAL_JSON)
+        next_id = manager.get_next_rule_id()
         assert next_id == "R004"
 
-    def test_next_id_with_non_sequential_rules(self):
+    def test_next_id_with_non_sequential_rules(self, manager):
         """Test generating next ID with non-sequential existing rules"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Rule 1",
-                    "rule_content": "Content 1",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R003",
-                    "rule_name": "Rule 3",
-                    "rule_content": "Content 3",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R010",
-                    "rule_name": "Rule 10",
-                    "rule_content": "Content 10",
-                    "rule_type": "material",
-                    "active": True,
-                },
-            ]
-        }
-
-        self.create_test_rules_file(test_data)
-        next_id = self.manager.get_next_rule_id()
+        self.create_test_rules_file(manager, NON_SEQUENTIAL_JSON)
+        next_id = manager.get_next_rule_id()
         assert next_id == "R011"
 
-    def test_next_id_with_large_numbers(self):
+    def test_next_id_with_large_numbers(self, manager):
         """Test generating next ID with large ID numbers"""
         test_data = {
-            "rules": [
-                {
-                    "rule_id": "R999",
-                    "rule_name": "Rule 999",
-                    "rule_content": "Content",
-                    "rule_type": "material",
-                    "active": True,
-                }
-            ]
+            "rules": [{**BASE_RULE, "rule_id": "R999", "rule_name": "Rule 999"}]
         }
 
-        self.create_test_rules_file(test_data)
-        next_id = self.manager.get_next_rule_id()
+        self.create_test_rules_file(manager, json_dumps(test_data))
+        next_id = manager.get_next_rule_id()
         assert next_id == "R1000"
 
 
 class TestValidateRuleForSave:
     """Test validate_rule_for_save method"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def test_validate_valid_rule(self):
+    def test_validate_valid_rule(self, manager):
         """Test validation of a completely valid rule"""
-        valid_rule = {
-            "rule_id": "R001",
-            "rule_name": "Test Rule",
-            "rule_content": "This is test content",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        is_valid, errors = self.manager.validate_rule_for_save(valid_rule)
+        is_valid, errors = manager.validate_rule_for_save(BASE_RULE)
         assert is_valid is True
         assert len(errors) == 0
 
-    def test_validate_missing_required_fields(self):
-        """Test validation fails when required fields are missing"""
-        invalid_rule = {
-            "rule_id": "R001",
-            "rule_name": "Test Rule",
-        }
-
-        is_valid, errors = self.manager.validate_rule_for_save(invalid_rule)
-        assert is_valid is False
-        assert any("rule_content" in error for error in errors)
-        assert any("rule_type" in error for error in errors)
-        assert any("active" in error for error in errors)
-
-    def test_validate_invalid_rule_id_format(self):
-        """Test validation fails with invalid rule_id format"""
-        invalid_rule = {
-            "rule_id": "INVALID123",
-            "rule_name": "Test Rule",
-            "rule_content": "Content",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        is_valid, errors = self.manager.validate_rule_for_save(invalid_rule)
+    @pytest.mark.parametrize("invalid_rule,expected_errors", INVALID_RULE_CASES)
+    def test_validate_invalid_rule(self, manager, invalid_rule, expected_errors):
+        """Test validation fails and reports each offending field"""
+        is_valid, errors = manager.validate_rule_for_save(invalid_rule)
         assert is_valid is False
-        assert any("pattern" in error.lower() for error in errors)
-
-    def test_validate_invalid_rule_type(self):
-        """Test validation fails with invalid rule_type"""
-        invalid_rule = {
-            "rule_id": "R001",
-            "rule_name": "Test Rule",
-            "rule_content": "Content",
-            "rule_type": "invalid_type",
-            "active": True,
-        }
+        for expected in expected_errors:
+            assert any(expected in error.lower() for error in errors)
 
-        is_valid, errors = self.manager.validate_rule_for_save(invalid_rule)
-        assert is_valid is False
-        assert any("rule_type" in error for error in errors)
-
-    def test_validate_empty_strings(self):
-        """Test validation fails with empty strings"""
-        invalid_rule = {
-            "rule_id": "R001",
-            "rule_name": "",
-            "rule_content": "   ",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        is_valid, errors = self.manager.validate_rule_for_save(invalid_rule)
-        assert is_valid is False
-        assert any("rule_name" in error for error in errors)
-        assert any("rule_content" in error for error in errors)
-
-    def test_validate_duplicate_rule_id_create(self):
+    def test_validate_duplicate_rule_id_create(self, manager):
         """Test validation fails when rule_id already exists (create)"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Existing Rule",
-                    "rule_content": "Content",
-                    "rule_type": "material",
-                    "active": True,
-                }
-            ]
-        }
-
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(test_data, f)
+        manager.rules_file.write_bytes(EXISTING_R001_JSON)
 
-        self.manager.load_rules()
+        manager.load_rules()
 
-        duplicate_rule = {
-            "rule_id": "R001",
-            "rule_name": "New Rule",
-            "rule_content": "Content",
-            "rule_type": "material",
-            "active": True,
-        }
+        duplicate_rule = {**BASE_RULE, "rule_name": "New Rule"}
 
-        is_valid, errors = self.manager.validate_rule_for_save(duplicate_rule)
+        is_valid, errors = manager.validate_rule_for_save(duplicate_rule)
         assert is_valid is False
         assert any("already exists" in error for error in errors)
 
-    def test_validate_same_rule_id_update(self):
+    def test_validate_same_rule_id_update(self, manager):
         """Test validation passes when updating rule with same ID"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Existing Rule",
-                    "rule_content": "Content",
-                    "rule_type": "material",
-                    "active": True,
-                }
-            ]
-        }
-
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(test_data, f)
-
-        self.manager.load_rules()
+        seed_rules(manager, EXISTING_R001_RULES)
 
         updated_rule = {
-            "rule_id": "R001",
+            **BASE_RULE,
             "rule_name": "Updated Rule",
             "rule_content": "New Content",
-            "rule_type": "material",
-            "active": True,
         }
 
-        is_valid, errors = self.manager.validate_rule_for_save(
+        is_valid, errors = manager.validate_rule_for_save(
             updated_rule, rule_id_to_update="R001"
         )
         assert is_valid is True
@@ -267,24 +244,11 @@ class TestValidateRuleForSave:
 class TestAddRule:
     """Test add_rule method"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def test_add_valid_rule_success(self):
+    def test_add_valid_rule_success(self, manager):
         """Test successfully adding a valid rule"""
-        new_rule = {
-            "rule_id": "R001",
-            "rule_name": "Test Rule",
-            "rule_content": "This is a test rule",
-            "rule_type": "material",
-            "active": True,
-            "description": "Test description",
-        }
+        new_rule = {**BASE_RULE, "description": "Test description"}
 
-        success, message, created_rule = self.manager.add_rule(new_rule)
+        success, message, created_rule = manager.add_rule(new_rule)
 
         assert success is True
         assert "created successfully" in message.lower()
@@ -292,115 +256,99 @@ class TestAddRule:
         assert created_rule.rule_id == "R001"
         assert created_rule.rule_name == "Test Rule"
 
-    def test_add_rule_creates_file_if_not_exists(self):
+    def test_add_rule_creates_file_if_not_exists(self, manager):
         """Test adding rule creates rules.json if it doesn't exist"""
-        new_rule = {
-            "rule_id": "R001",
-            "rule_name": "First Rule",
-            "rule_content": "Content",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        success, message, created_rule = self.manager.add_rule(new_rule)
+        success, message, created_rule = manager.add_rule({**BASE_RULE})
 
         assert success is True
-        assert self.rules_file.exists()
+        assert manager.rules_file.exists()
 
-    def test_add_rule_reject_duplicate_id(self):
+    def test_add_rule_reject_duplicate_id(self, manager):
         """Test rejecting rule with duplicate rule_id"""
-        first_rule = {
-            "rule_id": "R001",
-            "rule_name": "First Rule",
-            "rule_content": "Content",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        self.manager.add_rule(first_rule)
+        manager.add_rule({**BASE_RULE})
 
         duplicate_rule = {
-            "rule_id": "R001",
+            **BASE_RULE,
             "rule_name": "Duplicate Rule",
             "rule_content": "Different Content",
-            "rule_type": "material",
-            "active": True,
         }
 
-        success, message, created_rule = self.manager.add_rule(duplicate_rule)
+        success, message, created_rule = manager.add_rule(duplicate_rule)
 
         assert success is False
         assert "already exists" in message.lower()
         assert created_rule is None
 
-    def test_add_rule_reject_invalid_type(self):
+    def test_add_rule_reject_invalid_type(self, manager):
         """Test rejecting rule with invalid rule_type"""
-        invalid_rule = {
-            "rule_id": "R001",
-            "rule_name": "Invalid Rule",
-            "rule_content": "Content",
-            "rule_type": "invalid_type",
-            "active": True,
-        }
+        invalid_rule = {**BASE_RULE, "rule_type": "invalid_type"}
 
-        success, message, created_rule = self.manager.add_rule(invalid_rule)
+        success, message, created_rule = manager.add_rule(invalid_rule)
 
         assert success is False
         assert created_rule is None
 
-    def test_add_rule_reject_empty_content(self):
+    def test_add_rule_reject_empty_content(self, manager):
         """Test rejecting rule with empty content"""
-        invalid_rule = {
-            "rule_id": "R001",
-            "rule_name": "Empty Content Rule",
-            "rule_content": "",
-            "rule_type": "material",
-            "active": True,
-        }
+        invalid_rule = {**BASE_RULE, "rule_content": ""}
 
-        success, message, created_rule = self.manager.add_rule(invalid_rule)
+        success, message, created_rule = manager.add_rule(invalid_rule)
 
         assert success is False
         assert created_rule is None
 
-    def test_add_rule_updates_metadata(self):
+    def test_add_rule_updates_metadata(self, manager):
         """Test that adding rule updates metadata correctly"""
-        rule1 = {
-            "rule_id": "R001",
-            "rule_name": "Rule 1",
-            "rule_content": "Content 1",
-            "rule_type": "material",
-            "active": True,
-        }
+        rule1, rule2 = THREE_SEQUENTIAL_RULES["rules"][:2]
 
-        rule2 = {
-            "rule_id": "R002",
-            "rule_name": "Rule 2",
-            "rule_content": "Content 2",
-            "rule_type": "material",
-            "active": False,
-        }
+        manager.add_rule({**rule1})
+        manager.add_rule({**rule2, "active": False})
+
+        data = json_loads(manager.rules_file.read_bytes())
+
+        assert data["metadata"]["total_rules"] == 2
+        assert data["metadata"]["active_rules"] == 1
+        assert data["metadata"]["last_updated"] == FROZEN_NOW
+
+
+class TestAddRules:
+    """Test add_rules (batch add) method"""
 
-        self.manager.add_rule(rule1)
-        self.manager.add_rule(rule2)
+    def test_add_multiple_rules_success(self, manager):
+        """Test adding several rules writes them and metadata in one pass"""
+        rule1, rule2 = THREE_SEQUENTIAL_RULES["rules"][:2]
 
-        with open(self.rules_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        result = manager.add_rules([{**rule1}, {**rule2, "active": False}])
 
+        assert result["success"] is True
+        assert result["added_count"] == 2
+        assert [rule.rule_id for rule in manager.load_rules()] == ["R001", "R002"]
+
+        data = json_loads(manager.rules_file.read_bytes())
         assert data["metadata"]["total_rules"] == 2
         assert data["metadata"]["active_rules"] == 1
 
+    def test_add_rules_rejects_whole_batch(self, manager):
+        """Test one invalid or duplicated rule means nothing is written"""
+        result = manager.add_rules(
+            [
+                {**BASE_RULE},
+                {**BASE_RULE},
+                {**BASE_RULE, "rule_id": "R002", "rule_type": "bad"},
+            ]
+        )
+
+        assert result["success"] is False
+        assert result["added_count"] == 0
+        assert "duplicated in batch" in result["errors"]["R001"][0]
+        assert "R002" in result["errors"]
+        assert not manager.rules_file.exists()
+
 
 class TestGetRuleForEdit:
     """Test get_rule_for_edit method"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def test_get_existing_rule(self):
+    def test_get_existing_rule(self, manager):
         """Test retrieving existing rule for editing"""
         test_data = {
             "rules": [
@@ -416,12 +364,9 @@ class TestGetRuleForEdit:
             ]
         }
 
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(test_data, f)
-
-        self.manager.load_rules()
+        seed_rules(manager, test_data)
 
-        rule_dict = self.manager.get_rule_for_edit("R001")
+        rule_dict = manager.get_rule_for_edit("R001")
 
         assert rule_dict is not None
         assert rule_dict["rule_id"] == "R001"
@@ -432,55 +377,26 @@ class TestGetRuleForEdit:
         assert rule_dict["description"] == "Test description"
         assert rule_dict["created_at"] == "2025-01-01T00:00:00Z"
 
-    def test_get_non_existent_rule(self):
+    def test_get_non_existent_rule(self, manager):
         """Test retrieving non-existent rule returns None"""
-        rule_dict = self.manager.get_rule_for_edit("R999")
+        rule_dict = manager.get_rule_for_edit("R999")
         assert rule_dict is None
 
 
 class TestUpdateRule:
     """Test update_rule method"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def create_initial_rule(self):
+    def create_initial_rule(self, manager):
         """Helper to create an initial rule"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Original Name",
-                    "rule_content": "Original Content",
-                    "rule_type": "material",
-                    "active": True,
-                    "description": "Original Description",
-                    "created_at": "2025-01-01T00:00:00Z",
-                }
-            ],
-            "metadata": {
-                "version": "1.0",
-                "last_updated": "2025-01-01T00:00:00Z",
-                "total_rules": 1,
-                "active_rules": 1,
-            },
-        }
+        seed_rules(manager, ORIGINAL_R001_RULES)
 
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(test_data, f)
-
-        self.manager.load_rules()
-
-    def test_update_rule_name_success(self):
+    def test_update_rule_name_success(self, manager):
         """Test successfully updating rule_name"""
-        self.create_initial_rule()
+        self.create_initial_rule(manager)
 
         updated_fields = {"rule_name": "Updated Name"}
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R001", updated_fields
         )
 
@@ -488,69 +404,67 @@ class TestUpdateRule:
         assert updated_rule.rule_name == "Updated Name"
         assert updated_rule.rule_content == "Original Content"
 
-    def test_update_rule_content_success(self):
+    def test_update_rule_content_success(self, manager):
         """Test successfully updating rule_content"""
-        self.create_initial_rule()
+        self.create_initial_rule(manager)
 
         updated_fields = {"rule_content": "Updated Content"}
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R001", updated_fields
         )
 
         assert success is True
         assert updated_rule.rule_content == "Updated Content"
 
-    def test_update_rule_type_success(self):
+    def test_update_rule_type_success(self, manager):
         """Test successfully updating rule_type"""
-        self.create_initial_rule()
+        self.create_initial_rule(manager)
 
         updated_fields = {"rule_type": "customer"}
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R001", updated_fields
         )
 
         assert success is True
         assert updated_rule.rule_type == "customer"
 
-    def test_update_active_status(self):
+    def test_update_active_status(self, manager):
         """Test successfully changing active status"""
-        self.create_initial_rule()
+        self.create_initial_rule(manager)
 
         updated_fields = {"active": False}
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R001", updated_fields
         )
 
         assert success is True
         assert updated_rule.active is False
 
-        with open(self.rules_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        assert data["metadata"]["active_rules"] == 0
+        assert manager.metadata["active_rules"] == 0
 
-    def test_update_preserves_created_at(self):
+    def test_update_preserves_created_at(self, manager):
         """Test that update preserves original created_at timestamp"""
-        self.create_initial_rule()
+        self.create_initial_rule(manager)
 
         updated_fields = {"rule_name": "Updated Name"}
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R001", updated_fields
         )
 
         assert success is True
         assert updated_rule.created_at == "2025-01-01T00:00:00Z"
 
-    def test_update_non_existent_rule(self):
+    def test_update_non_existent_rule(self, manager):
         """Test updating non-existent rule fails"""
-        self.create_initial_rule()
+        self.create_initial_rule(manager)
 
         updated_fields = {"rule_name": "Updated Name"}
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R999", updated_fields
         )
 
@@ -558,13 +472,13 @@ class TestUpdateRule:
         assert "not found" in message.lower()
         assert updated_rule is None
 
-    def test_update_reject_invalid_fields(self):
+    def test_update_reject_invalid_fields(self, manager):
         """Test updating with invalid fields fails"""
-        self.create_initial_rule()
+        self.create_initial_rule(manager)
 
         updated_fields = {"rule_type": "invalid_type"}
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R001", updated_fields
         )
 
@@ -575,146 +489,66 @@ class TestUpdateRule:
 class TestDeleteRule:
     """Test delete_rule method"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def create_test_rules(self):
+    def create_test_rules(self, manager):
         """Helper to create test rules"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Rule 1",
-                    "rule_content": "Content 1",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R002",
-                    "rule_name": "Rule 2",
-                    "rule_content": "Content 2",
-                    "rule_type": "material",
-                    "active": True,
-                },
-            ],
-            "metadata": {
-                "version": "1.0",
-                "last_updated": "2025-01-01T00:00:00Z",
-                "total_rules": 2,
-                "active_rules": 2,
-            },
-        }
+        seed_rules(manager, TWO_RULES)
 
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(test_data, f)
-
-        self.manager.load_rules()
-
-    def test_delete_existing_rule_success(self):
+    def test_delete_existing_rule_success(self, manager):
         """Test successfully deleting an existing rule"""
-        self.create_test_rules()
+        self.create_test_rules(manager)
 
-        success, message = self.manager.delete_rule("R001")
+        success, message = manager.delete_rule("R001")
 
         assert success is True
         assert "deleted successfully" in message.lower()
 
-        rules = self.manager.load_rules()
-        assert len(rules) == 1
-        assert rules[0].rule_id == "R002"
+        remaining = json_loads(manager.rules_file.read_bytes())["rules"]
+        assert [rule["rule_id"] for rule in remaining] == ["R002"]
 
-    def test_delete_non_existent_rule(self):
+    def test_delete_non_existent_rule(self, manager):
         """Test attempting to delete non-existent rule"""
-        self.create_test_rules()
+        self.create_test_rules(manager)
 
-        success, message = self.manager.delete_rule("R999")
+        success, message = manager.delete_rule("R999")
 
         assert success is False
         assert "not found" in message.lower()
 
-    def test_delete_updates_metadata(self):
+    def test_delete_updates_metadata(self, manager):
         """Test that deleting rule updates metadata correctly"""
-        self.create_test_rules()
-
-        self.manager.delete_rule("R001")
+        self.create_test_rules(manager)
 
-        with open(self.rules_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        manager.delete_rule("R001")
 
-        assert data["metadata"]["total_rules"] == 1
-        assert data["metadata"]["active_rules"] == 1
+        assert manager.metadata["total_rules"] == 1
+        assert manager.metadata["active_rules"] == 1
 
 
 class TestDeleteRules:
     """Test delete_rules (batch delete) method"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def create_test_rules(self):
+    def create_test_rules(self, manager):
         """Helper to create test rules"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Rule 1",
-                    "rule_content": "Content 1",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R002",
-                    "rule_name": "Rule 2",
-                    "rule_content": "Content 2",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R003",
-                    "rule_name": "Rule 3",
-                    "rule_content": "Content 3",
-                    "rule_type": "material",
-                    "active": False,
-                },
-            ],
-            "metadata": {
-                "version": "1.0",
-                "last_updated": "2025-01-01T00:00:00Z",
-                "total_rules": 3,
-                "active_rules": 2,
-            },
-        }
-
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(test_data, f)
-
-        self.manager.load_rules()
+        seed_rules(manager, THREE_RULES_ONE_INACTIVE)
 
-    def test_delete_multiple_rules_success(self):
+    def test_delete_multiple_rules_success(self, manager):
         """Test successfully deleting multiple rules"""
-        self.create_test_rules()
+        self.create_test_rules(manager)
 
-        result = self.manager.delete_rules(["R001", "R002"])
+        result = manager.delete_rules(["R001", "R002"])
 
         assert result["success"] is True
         assert result["deleted_count"] == 2
         assert len(result["not_found"]) == 0
 
-        rules = self.manager.load_rules()
-        assert len(rules) == 1
-        assert rules[0].rule_id == "R003"
+        remaining = json_loads(manager.rules_file.read_bytes())["rules"]
+        assert [rule["rule_id"] for rule in remaining] == ["R003"]
 
-    def test_delete_rules_mix_valid_invalid(self):
+    def test_delete_rules_mix_valid_invalid(self, manager):
         """Test deleting with mix of valid and invalid IDs"""
-        self.create_test_rules()
+        self.create_test_rules(manager)
 
-        result = self.manager.delete_rules(["R001", "R999", "R002", "R888"])
+        result = manager.delete_rules(["R001", "R999", "R002", "R888"])
 
         assert result["success"] is True
         assert result["deleted_count"] == 2
@@ -722,14 +556,13 @@ class TestDeleteRules:
         assert "R999" in result["not_found"]
         assert "R888" in result["not_found"]
 
-    def test_delete_rules_updates_metadata(self):
+    def test_delete_rules_updates_metadata(self, manager):
         """Test batch delete updates metadata correctly"""
-        self.create_test_rules()
+        self.create_test_rules(manager)
 
-        self.manager.delete_rules(["R001", "R003"])
+        manager.delete_rules(["R001", "R003"])
 
-        with open(self.rules_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = json_loads(manager.rules_file.read_bytes())
 
         assert data["metadata"]["total_rules"] == 1
         assert data["metadata"]["active_rules"] == 1
@@ -738,24 +571,10 @@ class TestDeleteRules:
 class TestToggleRuleStatus:
     """Test toggle_rule_status method"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def create_test_rule(self, active=True):
+    def create_test_rule(self, manager, active=True):
         """Helper to create a test rule"""
         test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Test Rule",
-                    "rule_content": "Content",
-                    "rule_type": "material",
-                    "active": active,
-                }
-            ],
+            "rules": [{**BASE_RULE, "active": active}],
             "metadata": {
                 "version": "1.0",
                 "last_updated": "2025-01-01T00:00:00Z",
@@ -764,47 +583,41 @@ class TestToggleRuleStatus:
             },
         }
 
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(test_data, f)
-
-        self.manager.load_rules()
+        seed_rules(manager, test_data)
 
-    def test_toggle_from_active_to_inactive(self):
+    def test_toggle_from_active_to_inactive(self, manager):
         """Test toggling rule from active to inactive"""
-        self.create_test_rule(active=True)
+        self.create_test_rule(manager, active=True)
 
-        success, message, new_status = self.manager.toggle_rule_status("R001")
+        success, message, new_status = manager.toggle_rule_status("R001")
 
         assert success is True
         assert new_status is False
         assert "INACTIVE" in message
 
-    def test_toggle_from_inactive_to_active(self):
+    def test_toggle_from_inactive_to_active(self, manager):
         """Test toggling rule from inactive to active"""
-        self.create_test_rule(active=False)
+        self.create_test_rule(manager, active=False)
 
-        success, message, new_status = self.manager.toggle_rule_status("R001")
+        success, message, new_status = manager.toggle_rule_status("R001")
 
         assert success is True
         assert new_status is True
         assert "ACTIVE" in message
 
-    def test_toggle_updates_metadata(self):
+    def test_toggle_updates_metadata(self, manager):
         """Test that toggling updates metadata correctly"""
-        self.create_test_rule(active=True)
+        self.create_test_rule(manager, active=True)
 
-        self.manager.toggle_rule_status("R001")
+        manager.toggle_rule_status("R001")
 
-        with open(self.rules_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        assert manager.metadata["active_rules"] == 0
 
-        assert data["metadata"]["active_rules"] == 0
-
-    def test_toggle_non_existent_rule(self):
+    def test_toggle_non_existent_rule(self, manager):
         """Test toggling non-existent rule fails"""
-        self.create_test_rule(active=True)
+        self.create_test_rule(manager, active=True)
 
-        success, message, new_status = self.manager.toggle_rule_status("R999")
+        success, message, new_status = manager.toggle_rule_status("R999")
 
         assert success is False
         assert "not found" in message.lower()
@@ -813,34 +626,22 @@ class TestToggleRuleStatus:
 class TestIntegrationCRUDCycle:
     """Integration tests for complete CRUD cycle"""
 
-    def setup_method(self):
-        """Setup test environment"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
-        self.manager = RuleManager(rules_file=self.rules_file)
-
-    def test_full_crud_cycle(self):
+    def test_full_crud_cycle(self, manager):
         """Test complete Create -> Read -> Update -> Delete cycle"""
 
         # CREATE
-        new_rule = {
-            "rule_id": "R001",
-            "rule_name": "Test Rule",
-            "rule_content": "Original Content",
-            "rule_type": "material",
-            "active": True,
-        }
+        new_rule = {**BASE_RULE, "rule_content": "Original Content"}
 
-        success, message, created_rule = self.manager.add_rule(new_rule)
+        success, message, created_rule = manager.add_rule(new_rule)
         assert success is True
         assert created_rule.rule_id == "R001"
 
         # READ
-        rules = self.manager.load_rules()
+        rules = manager.load_rules()
         assert len(rules) == 1
         assert rules[0].rule_id == "R001"
 
-        rule_for_edit = self.manager.get_rule_for_edit("R001")
+        rule_for_edit = manager.get_rule_for_edit("R001")
         assert rule_for_edit is not None
         assert rule_for_edit["rule_name"] == "Test Rule"
 
@@ -850,7 +651,7 @@ class TestIntegrationCRUDCycle:
             "rule_content": "Updated Content",
         }
 
-        success, message, updated_rule = self.manager.update_rule(
+        success, message, updated_rule = manager.update_rule(
             "R001", updated_fields
         )
         assert success is True
@@ -858,38 +659,28 @@ class TestIntegrationCRUDCycle:
         assert updated_rule.rule_content == "Updated Content"
 
         # DELETE
-        success, message = self.manager.delete_rule("R001")
+        success, message = manager.delete_rule("R001")
         assert success is True
 
-        rules = self.manager.load_rules()
+        rules = manager.load_rules()
         assert len(rules) == 0
 
-    def test_batch_operations(self):
+    def test_batch_operations(self, manager_with_5_rules):
         """Test batch operations with multiple rules"""
+        manager = manager_with_5_rules
 
-        # Create multiple rules
-        for i in range(1, 6):
-            rule = {
-                "rule_id": f"R{str(i).zfill(3)}",
-                "rule_name": f"Rule {i}",
-                "rule_content": f"Content {i}",
-                "rule_type": "material",
-                "active": True,
-            }
-            self.manager.add_rule(rule)
-
-        rules = self.manager.load_rules()
+        rules = manager.load_rules()
         assert len(rules) == 5
 
         # Batch delete
-        result = self.manager.delete_rules(["R001", "R003", "R005"])
+        result = manager.delete_rules(["R001", "R003", "R005"])
         assert result["deleted_count"] == 3
 
-        rules = self.manager.load_rules()
+        rules = manager.load_rules()
         assert len(rules) == 2
         assert rules[0].rule_id == "R002"
         assert rules[1].rule_id == "R004"
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+    pytest.main([__file__, "-v", "-n", "auto"])
@@ -4,19 +4,63 @@ Tests rule loading, validation, CRUD operations, and prompt formatting
 """
 
 import pytest
-import json
-import tempfile
-import sys
-from pathlib import Path
-from datetime import datetime, timezone
-
-# Add src to path
-sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from src.services.common.json_utils import json_dumps
 from src.services.rules.manager import RuleManager
 from src.services.rules.validator import RuleValidator
-from src.services.rules.models import Rule, ValidationReport, ValidationResult
-from src.services.rules.config import ALLOWED_RULE_TYPES, RULE_ID_PATTERN
+from src.services.rules.models import Rule
+
+BASE_VALID_RULE = {
+    "rule_id": "R001",
+    "rule_name": "Test Rule",
+    "rule_content": "This is a test rule content",
+    "rule_type": "material",
+    "active": True,
+}
+
+# Validated once at import; tests only read these
+PROMPT_RULES = (
+    Rule(
+        rule_id="R001",
+        rule_name="Rule 1",
+        rule_content="DI means Ductile Iron",
+        rule_type="material",
+        active=True,
+    ),
+    Rule(
+        rule_id="R002",
+        rule_name="Rule 2",
+        rule_content="MJ means Mechanical Joint",
+        rule_type="material",
+        active=True,
+    ),
+)
+
+THREE_RULES_DATA = {
+    "rules": [
+        {
+            "rule_id": "R001",
+            "rule_name": "Rule 1",
+            "rule_content": "Content 1",
+            "rule_type": "material",
+            "active": True,
+        },
+        {
+            "rule_id": "R002",
+            "rule_name": "Rule 2",
+            "rule_content": "Content 2",
+            "rule_type": "customer",
+            "active": True,
+        },
+        {
+            "rule_id": "R003",
+            "rule_name": "Rule 3",
+            "rule_content": "Content 3",
+            "rule_type": "dimension",
+            "active": True,
+        },
+    ]
+}
 
 
 class TestRuleValidator:
@@ -28,93 +72,53 @@ class TestRuleValidator:
 
     def test_validate_valid_rule(self):
         """Test validation of a valid rule"""
-        valid_rule = {
-            "rule_id": "R001",
-            "rule_name": "Test Rule",
-            "rule_content": "This is a test rule content",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        result = self.validator.validate_rule(valid_rule)
+        result = self.validator.validate_rule(BASE_VALID_RULE)
 
         assert result.valid is True
         assert len(result.errors) == 0
         assert result.rule_id == "R001"
 
-    def test_validate_missing_required_field(self):
-        """Test validation fails when required field is missing"""
-        invalid_rule = {
-            "rule_id": "R002",
-            "rule_name": "Test Rule",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        result = self.validator.validate_rule(invalid_rule)
-
-        assert result.valid is False
-        assert any("rule_content" in error for error in result.errors)
-
-    def test_validate_invalid_rule_id_format(self):
-        """Test validation fails with invalid rule_id format"""
-        invalid_rule = {
-            "rule_id": "INVALID",
-            "rule_name": "Test Rule",
-            "rule_content": "Test content",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        result = self.validator.validate_rule(invalid_rule)
-
-        assert result.valid is False
-        assert any("rule_id" in error.lower() for error in result.errors)
-
-    def test_validate_invalid_rule_type(self):
-        """Test validation fails with invalid rule_type"""
-        invalid_rule = {
-            "rule_id": "R003",
-            "rule_name": "Test Rule",
-            "rule_content": "Test content",
-            "rule_type": "invalid_type",
-            "active": True,
-        }
-
-        result = self.validator.validate_rule(invalid_rule)
-
-        assert result.valid is False
-        assert any("rule_type" in error.lower() for error in result.errors)
-
-    def test_validate_empty_content(self):
-        """Test validation fails with empty content"""
-        invalid_rule = {
-            "rule_id": "R004",
-            "rule_name": "Test Rule",
-            "rule_content": "",
-            "rule_type": "material",
-            "active": True,
-        }
-
-        result = self.validator.validate_rule(invalid_rule)
-
-        assert result.valid is False
-        assert any("empty" in error.lower() for error in result.errors)
-
-    def test_validate_wrong_field_type(self):
-        """Test validation fails with wrong field type"""
-        invalid_rule = {
-            "rule_id": "R005",
-            "rule_name": "Test Rule",
-            "rule_content": "Test content",
-            "rule_type": "material",
-            "active": "yes",
-        }
-
+    @pytest.mark.parametrize(
+        "invalid_rule,expected_error",
+        [
+            pytest.param(
+                {k: v for k, v in BASE_VALID_RULE.items() if k != "rule_content"},
+                "rule_content",
+                id="missing_required_field",
+            ),
+            pytest.param(
+                {**BASE_VALID_RULE, "rule_id": "INVALID"},
+                "rule_id",
+                id="invalid_rule_id_format",
+            ),
+            pytest.param(
+                {**BASE_VALID_RULE, "rule_id": "R001\n"},
+                "rule_id",
+                id="rule_id_trailing_newline",
+            ),
+            pytest.param(
+                {**BASE_VALID_RULE, "rule_type": "invalid_type"},
+                "rule_type",
+                id="invalid_rule_type",
+            ),
+            pytest.param(
+                {**BASE_VALID_RULE, "rule_content": ""},
+                "empty",
+                id="empty_content",
+            ),
+            pytest.param(
+                {**BASE_VALID_RULE, "active": "yes"},
+                "boolean",
+                id="wrong_field_type",
+            ),
+        ],
+    )
+    def test_validate_invalid_rule(self, invalid_rule, expected_error):
+        """Test validation fails and names the offending field"""
         result = self.validator.validate_rule(invalid_rule)
 
         assert result.valid is False
-        assert any("boolean" in error.lower() for error in result.errors)
+        assert any(expected_error in error.lower() for error in result.errors)
 
     def test_validate_rule_set_with_duplicates(self):
         """Test validation detects duplicate rule IDs"""
@@ -184,6 +188,7 @@ class TestRuleValidator:
         assert self.validator.validate_rule_id_format("INVALID") is False
         assert self.validator.validate_rule_id_format("R12") is False
         assert self.validator.validate_rule_id_format("123") is False
+        assert self.validator.validate_rule_id_format("R001\n") is False
 
     def test_validate_rule_type(self):
         """Test rule type validation"""
@@ -198,16 +203,15 @@ class TestRuleValidator:
 class TestRuleManager:
     """Test rule manager functionality"""
 
-    def setup_method(self):
-        """Setup test environment with temporary directory"""
-        self.temp_dir = tempfile.mkdtemp()
-        self.rules_file = Path(self.temp_dir) / "rules.json"
+    @pytest.fixture(autouse=True)
+    def setup_manager(self, tmp_path):
+        """Setup test environment in pytest's per-test tmp_path"""
+        self.rules_file = tmp_path / "rules.json"
         self.manager = RuleManager(rules_file=self.rules_file)
 
     def create_test_rules_file(self, rules_data):
-        """Helper to create a test rules file"""
-        with open(self.rules_file, "w", encoding="utf-8") as f:
-            json.dump(rules_data, f)
+        """Helper to create a test rules file (compact JSON, single write)"""
+        self.rules_file.write_bytes(json_dumps(rules_data))
 
     def test_load_rules_file_not_exists(self):
         """Test loading when file doesn't exist returns empty list"""
@@ -266,6 +270,29 @@ class TestRuleManager:
 
         assert rules1 is rules2
 
+    def test_metadata_from_loaded_file(self):
+        """Test metadata is exposed from the loaded rules file"""
+        assert self.manager.metadata == {}
+
+        metadata = {"version": "1.0", "total_rules": 1, "active_rules": 1}
+        self.create_test_rules_file(
+            {
+                "rules": [
+                    {
+                        "rule_id": "R001",
+                        "rule_name": "Test Rule",
+                        "rule_content": "Test content",
+                        "rule_type": "material",
+                        "active": True,
+                    }
+                ],
+                "metadata": metadata,
+            }
+        )
+        self.manager.reload_rules()
+
+        assert self.manager.metadata == metadata
+
     def test_load_rules_invalid_json(self):
         """Test loading handles invalid JSON gracefully"""
         with open(self.rules_file, "w") as f:
@@ -342,60 +369,19 @@ class TestRuleManager:
 
         assert rule is None
 
-    def test_get_rules_by_ids(self):
-        """Test getting multiple rules by IDs"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Rule 1",
-                    "rule_content": "Content 1",
-                    "rule_type": "material",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R002",
-                    "rule_name": "Rule 2",
-                    "rule_content": "Content 2",
-                    "rule_type": "customer",
-                    "active": True,
-                },
-                {
-                    "rule_id": "R003",
-                    "rule_name": "Rule 3",
-                    "rule_content": "Content 3",
-                    "rule_type": "dimension",
-                    "active": True,
-                },
-            ]
-        }
-
-        self.create_test_rules_file(test_data)
-        rules = self.manager.get_rules_by_ids(["R001", "R003"])
-
-        assert len(rules) == 2
-        assert rules[0].rule_id == "R001"
-        assert rules[1].rule_id == "R003"
-
-    def test_get_rules_by_ids_with_invalid(self):
-        """Test getting rules by IDs with some invalid IDs"""
-        test_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Rule 1",
-                    "rule_content": "Content 1",
-                    "rule_type": "material",
-                    "active": True,
-                }
-            ]
-        }
-
-        self.create_test_rules_file(test_data)
-        rules = self.manager.get_rules_by_ids(["R001", "R999", "R888"])
+    @pytest.mark.parametrize(
+        "rule_ids,expected_ids",
+        [
+            pytest.param(["R001", "R003"], ["R001", "R003"], id="all_found"),
+            pytest.param(["R001", "R999", "R888"], ["R001"], id="with_invalid"),
+        ],
+    )
+    def test_get_rules_by_ids(self, rule_ids, expected_ids):
+        """Test getting multiple rules by IDs, skipping unknown IDs"""
+        self.create_test_rules_file(THREE_RULES_DATA)
+        rules = self.manager.get_rules_by_ids(rule_ids)
 
-        assert len(rules) == 1
-        assert rules[0].rule_id == "R001"
+        assert [rule.rule_id for rule in rules] == expected_ids
 
     def test_get_rules_by_type(self):
         """Test getting rules by type"""
@@ -570,24 +556,7 @@ class TestRuleManager:
 
     def test_format_rules_for_prompt(self):
         """Test formatting rules for LLM prompt"""
-        rules = [
-            Rule(
-                rule_id="R001",
-                rule_name="Rule 1",
-                rule_content="DI means Ductile Iron",
-                rule_type="material",
-                active=True,
-            ),
-            Rule(
-                rule_id="R002",
-                rule_name="Rule 2",
-                rule_content="MJ means Mechanical Joint",
-                rule_type="material",
-                active=True,
-            ),
-        ]
-
-        formatted = self.manager.format_rules_for_prompt(rules)
+        formatted = self.manager.format_rules_for_prompt(list(PROMPT_RULES))
 
         assert "Rules to Apply:" in formatted
         assert "[R001]" in formatted
@@ -601,50 +570,25 @@ class TestPydanticModels:
 
     def test_rule_model_valid(self):
         """Test creating valid Rule model"""
-        rule = Rule(
-            rule_id="R001",
-            rule_name="Test Rule",
-            rule_content="Test content",
-            rule_type="material",
-            active=True,
-        )
+        rule = Rule(**BASE_VALID_RULE)
 
         assert rule.rule_id == "R001"
         assert rule.active is True
 
-    def test_rule_model_invalid_id(self):
-        """Test Rule model rejects invalid rule_id"""
-        with pytest.raises(ValueError):
-            Rule(
-                rule_id="INVALID",
-                rule_name="Test",
-                rule_content="Content",
-                rule_type="material",
-                active=True,
-            )
-
-    def test_rule_model_invalid_type(self):
-        """Test Rule model rejects invalid rule_type"""
-        with pytest.raises(ValueError):
-            Rule(
-                rule_id="R001",
-                rule_name="Test",
-                rule_content="Content",
-                rule_type="invalid_type",
-                active=True,
-            )
-
-    def test_rule_model_empty_content(self):
-        """Test Rule model rejects empty content"""
+    @pytest.mark.parametrize(
+        "overrides",
+        [
+            pytest.param({"rule_id": "INVALID"}, id="invalid_id"),
+            pytest.param({"rule_id": "R001\n"}, id="id_trailing_newline"),
+            pytest.param({"rule_type": "invalid_type"}, id="invalid_type"),
+            pytest.param({"rule_content": ""}, id="empty_content"),
+        ],
+    )
+    def test_rule_model_rejects_invalid(self, overrides):
+        """Test Rule model rejects invalid field values"""
         with pytest.raises(ValueError):
-            Rule(
-                rule_id="R001",
-                rule_name="Test",
-                rule_content="",
-                rule_type="material",
-                active=True,
-            )
+            Rule(**{**BASE_VALID_RULE, **overrides})
 
 
 if __name__ == "__main__":
-    pytest.main([__file__, "-v"])
+    pytest.main([__file__, "-v", "-n", "auto"])
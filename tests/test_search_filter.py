@@ -4,27 +4,43 @@ Tests database search and filter methods
 """
 
 import pytest
+import json
 import sqlite3
-import tempfile
-from pathlib import Path
-from datetime import datetime, timezone
+import uuid
+from contextlib import contextmanager
 
 from src.services.ingestion.database import ProductDatabase
-from src.services.ingestion.models import ProductRecord, UpdateProcessingInput
+from src.services.ingestion.models import (
+    ProductRecord,
+    ProductWithProcessing,
+    UpdateProcessingInput,
+)
+
+
+@contextmanager
+def memory_db():
+    """Yield a shared in-memory database URI, kept alive until the block exits"""
+    db_uri = f"file:test_search_{uuid.uuid4().hex}?mode=memory&cache=shared"
+
+    # The in-memory database lives only while a connection is open
+    keepalive = sqlite3.connect(db_uri, uri=True)
+    try:
+        yield db_uri
+    finally:
+        keepalive.close()
 
 
 @pytest.fixture
 def temp_db():
-    """Create temporary database for testing"""
-    temp_dir = tempfile.mkdtemp()
-    db_path = Path(temp_dir) / "test_search.db"
-    return db_path
+    """Create temporary shared in-memory database for testing"""
+    with memory_db() as db_uri:
+        yield db_uri
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_products():
-    """Create sample products for testing"""
-    return [
+    """Create sample products for testing (immutable, built once)"""
+    return (
         ProductRecord(
             item_id="ITEM-001",
             item_description="Ductile iron spacer for pipe fitting",
@@ -93,246 +109,292 @@ def sample_products():
             final_hts="7308.90.00.00",
             hts_description="Other structures",
         ),
-    ]
+    )
 
 
-@pytest.fixture
-def populated_db(temp_db, sample_products):
-    """Create and populate database with sample data"""
-    db = ProductDatabase(temp_db)
-    db.create_schema()
-    db.insert_products(sample_products)
+@pytest.fixture(scope="module")
+def populated_db(sample_products):
+    """
+    Create and populate database with sample data
 
-    # Add processing results for some products
-    db.update_processing_results(
-        "ITEM-001",
-        UpdateProcessingInput(
-            enhanced_description="Ductile iron spacer",
-            confidence_score="0.85",
-            confidence_level="High",
-            extracted_customer_name="N/A",
-            extracted_dimensions="N/A",
-            extracted_product="Spacer",
-            rules_applied="[]",
-            pass_number="1",
-        ),
-    )
+    Built once per module: every test using it only reads from it.
+    """
+    with memory_db() as db_uri:
+        yield _populate(ProductDatabase(db_uri), sample_products)
 
-    db.update_processing_results(
-        "ITEM-002",
-        UpdateProcessingInput(
-            enhanced_description="Steel coupling",
-            confidence_score="0.55",
-            confidence_level="Medium",
-            extracted_customer_name="N/A",
-            extracted_dimensions="N/A",
-            extracted_product="Coupling",
-            rules_applied="[]",
-            pass_number="1",
-        ),
-    )
 
-    db.update_processing_results(
-        "ITEM-003",
-        UpdateProcessingInput(
-            enhanced_description="Ductile iron ring",
-            confidence_score="0.35",
-            confidence_level="Low",
-            extracted_customer_name="N/A",
-            extracted_dimensions="N/A",
-            extracted_product="Ring Gasket",
-            rules_applied="[]",
-            pass_number="1",
-        ),
+def _populate(db, sample_products):
+    """Create schema, insert sample products and processing results"""
+    db.create_schema()
+    db.insert_products(list(sample_products))
+
+    # Add processing results for some products in a single transaction
+    db.update_processing_results_many(
+        [
+            (
+                "ITEM-001",
+                UpdateProcessingInput(
+                    enhanced_description="Ductile iron spacer",
+                    confidence_score="0.85",
+                    confidence_level="High",
+                    extracted_customer_name="N/A",
+                    extracted_dimensions="N/A",
+                    extracted_product="Spacer",
+                    rules_applied="[]",
+                    pass_number="1",
+                ),
+            ),
+            (
+                "ITEM-002",
+                UpdateProcessingInput(
+                    enhanced_description="Steel coupling",
+                    confidence_score="0.55",
+                    confidence_level="Medium",
+                    extracted_customer_name="N/A",
+                    extracted_dimensions="N/A",
+                    extracted_product="Coupling",
+                    rules_applied="[]",
+                    pass_number="1",
+                ),
+            ),
+            (
+                "ITEM-003",
+                UpdateProcessingInput(
+                    enhanced_description="Ductile iron ring",
+                    confidence_score="0.35",
+                    confidence_level="Low",
+                    extracted_customer_name="N/A",
+                    extracted_dimensions="N/A",
+                    extracted_product="Ring Gasket",
+                    rules_applied="[]",
+                    pass_number="1",
+                ),
+            ),
+        ]
     )
 
     return db
 
 
+SEARCH_CASES = [
+    pytest.param(
+        "ITEM-001",
+        "item_id",
+        None,
+        1,
+        lambda r: r.item_id == "ITEM-001",
+        id="item_id_exact",
+    ),
+    pytest.param(
+        "ITEM",
+        "item_id",
+        None,
+        3,
+        lambda r: "ITEM" in r.item_id,
+        id="item_id_partial",
+    ),
+    pytest.param(
+        "7307",
+        "hts_code",
+        None,
+        3,
+        lambda r: r.final_hts.startswith("7307"),
+        id="hts_code_prefix",
+    ),
+    pytest.param(
+        "7307.11.00",
+        "hts_code",
+        None,
+        1,
+        lambda r: r.final_hts.startswith("7307.11.00"),
+        id="hts_code_full",
+    ),
+    pytest.param(
+        "spacer",
+        "description",
+        None,
+        1,
+        lambda r: "spacer" in r.item_description.lower(),
+        id="description_single_keyword",
+    ),
+    pytest.param(
+        "ductile iron",
+        "description",
+        None,
+        2,
+        lambda r: "ductile" in r.item_description.lower()
+        and "iron" in r.item_description.lower(),
+        id="description_multiple_keywords",
+    ),
+    pytest.param("nonexistent", "item_id", None, 0, None, id="no_results"),
+    pytest.param(
+        "ITEM-001",
+        "auto",
+        None,
+        1,
+        lambda r: r.item_id == "ITEM-001",
+        id="auto_detect_item_id",
+    ),
+    pytest.param("ITEM", "item_id", 2, 2, None, id="with_limit"),
+    pytest.param("", "auto", None, 0, None, id="empty_query"),
+]
+
+SEARCH_AT_LEAST_CASES = [
+    pytest.param("iron", "multi", 2, id="multi_column"),
+    pytest.param("7307.11.00", "auto", 1, id="auto_detect_hts"),
+]
+
+FILTER_CASES = [
+    pytest.param(
+        {"hts_range": {"start": "7307.11.00", "end": "7307.92.99"}},
+        {"ITEM-001", "ITEM-002", "ITEM-003"},
+        id="hts_range_both",
+    ),
+    pytest.param(
+        {"hts_range": {"start": "7307.90.00"}},
+        {"ITEM-002", "TEST-ALPHA"},
+        id="hts_range_start_only",
+    ),
+    pytest.param(
+        {"hts_range": {"end": "7307.20.00"}},
+        {"ITEM-001", "ITEM-003"},
+        id="hts_range_end_only",
+    ),
+    pytest.param({"product_group": "FITTINGS"}, {"ITEM-001"}, id="product_group"),
+    pytest.param(
+        {"material_class": "Ductile Iron"},
+        {"ITEM-001", "ITEM-003"},
+        id="material_class",
+    ),
+    pytest.param({"status": "unprocessed"}, {"TEST-ALPHA"}, id="status_unprocessed"),
+    pytest.param(
+        {"status": "processed"},
+        {"ITEM-001", "ITEM-002", "ITEM-003"},
+        id="status_processed",
+    ),
+    pytest.param(
+        {"status": "processed", "confidence_levels": ["Low", "Medium"]},
+        {"ITEM-002", "ITEM-003"},
+        id="confidence_levels",
+    ),
+    pytest.param(
+        {
+            "hts_range": {"start": "7307.00.00", "end": "7307.99.99"},
+            "material_class": "Ductile Iron",
+            "status": "processed",
+            "confidence_levels": ["High", "Low"],
+        },
+        {"ITEM-001", "ITEM-003"},
+        id="combined_all_criteria",
+    ),
+    pytest.param({"product_group": "NONEXISTENT"}, set(), id="no_results"),
+]
+
+COUNT_CASES = [
+    pytest.param({"status": "all"}, 4, id="all_products"),
+    pytest.param({"status": "unprocessed"}, 1, id="unprocessed"),
+    pytest.param({"status": "processed"}, 3, id="processed"),
+]
+
+
 class TestSearchProducts:
     """Test search_products method"""
 
-    def test_search_by_item_id_exact(self, populated_db):
-        """Test exact item ID search"""
-        results = populated_db.search_products("ITEM-001", search_type="item_id")
-        assert len(results) == 1
-        assert results[0].item_id == "ITEM-001"
-
-    def test_search_by_item_id_partial(self, populated_db):
-        """Test partial item ID search"""
-        results = populated_db.search_products("ITEM", search_type="item_id")
-        assert len(results) == 3
-        assert all("ITEM" in r.item_id for r in results)
-
-    def test_search_by_hts_code_prefix(self, populated_db):
-        """Test HTS code prefix search"""
-        results = populated_db.search_products("7307", search_type="hts_code")
-        assert len(results) == 3
-        assert all(r.final_hts.startswith("7307") for r in results)
-
-    def test_search_by_hts_code_full(self, populated_db):
-        """Test full HTS code search"""
-        results = populated_db.search_products("7307.11.00", search_type="hts_code")
-        assert len(results) == 1
-        assert results[0].final_hts.startswith("7307.11.00")
-
-    def test_search_by_description_single_keyword(self, populated_db):
-        """Test description search with single keyword"""
-        results = populated_db.search_products("spacer", search_type="description")
-        assert len(results) == 1
-        assert "spacer" in results[0].item_description.lower()
-
-    def test_search_by_description_multiple_keywords(self, populated_db):
-        """Test description search with multiple keywords"""
+    @pytest.mark.parametrize("query,search_type,limit,expected_n,check", SEARCH_CASES)
+    def test_search(self, populated_db, query, search_type, limit, expected_n, check):
+        """Test search returns the expected matching products"""
         results = populated_db.search_products(
-            "ductile iron", search_type="description"
+            query, search_type=search_type, limit=limit
         )
-        assert len(results) == 2
-        for r in results:
-            desc_lower = r.item_description.lower()
-            assert "ductile" in desc_lower and "iron" in desc_lower
-
-    def test_search_multi_column(self, populated_db):
-        """Test multi-column search"""
-        results = populated_db.search_products("iron", search_type="multi")
-        assert len(results) >= 2
-
-    def test_search_no_results(self, populated_db):
-        """Test search with no results"""
-        results = populated_db.search_products("nonexistent", search_type="item_id")
-        assert len(results) == 0
-
-    def test_search_auto_detect_item_id(self, populated_db):
-        """Test auto-detection of item ID search"""
-        results = populated_db.search_products("ITEM-001", search_type="auto")
-        assert len(results) == 1
-        assert results[0].item_id == "ITEM-001"
-
-    def test_search_auto_detect_hts(self, populated_db):
-        """Test auto-detection of HTS code search"""
-        results = populated_db.search_products("7307.11.00", search_type="auto")
-        assert len(results) >= 1
-
-    def test_search_with_limit(self, populated_db):
-        """Test search with result limit"""
-        results = populated_db.search_products("ITEM", search_type="item_id", limit=2)
-        assert len(results) == 2
+        assert len(results) == expected_n
+        if check is not None:
+            assert all(check(r) for r in results)
+
+    @pytest.mark.parametrize("query,search_type,min_n", SEARCH_AT_LEAST_CASES)
+    def test_search_at_least(self, populated_db, query, search_type, min_n):
+        """Test search returns at least the expected number of products"""
+        results = populated_db.search_products(query, search_type=search_type)
+        assert len(results) >= min_n
+
 
-    def test_search_empty_query(self, populated_db):
-        """Test search with empty query"""
-        results = populated_db.search_products("", search_type="auto")
-        assert len(results) == 0
+@pytest.fixture(scope="module")
+def run_filter(populated_db):
+    """
+    Run filter_products once per distinct filter and reuse the result
+
+    The populated database is read-only, so filter and count tests that share
+    a filter can compare against one query instead of issuing it again.
+    """
+    results = {}
+
+    def run(filters):
+        key = json.dumps(filters, sort_keys=True)
+        if key not in results:
+            results[key] = populated_db.filter_products(filters, limit=500, raw=True)
+        return results[key]
+
+    return run
+
+
+class TestRawResults:
+    """Test raw=True rows against the default ProductWithProcessing models"""
+
+    @pytest.mark.parametrize(
+        "method,args",
+        [
+            pytest.param("search_products", ("ductile iron",), id="search"),
+            pytest.param("filter_products", ({"status": "processed"},), id="filter"),
+        ],
+    )
+    def test_default_models_match_raw_rows(self, populated_db, method, args):
+        """Test both paths return the same products as their own types"""
+        products = getattr(populated_db, method)(*args)
+        rows = getattr(populated_db, method)(*args, raw=True)
+
+        assert products
+        assert all(isinstance(p, ProductWithProcessing) for p in products)
+        assert all(isinstance(r, sqlite3.Row) for r in rows)
+        assert [p.model_dump() for p in products] == [
+            {field: r[field] for field in ProductWithProcessing.model_fields}
+            for r in rows
+        ]
 
 
 class TestFilterProducts:
     """Test filter_products method"""
 
-    def test_filter_by_hts_range_both(self, populated_db):
-        """Test filtering by HTS range (both start and end)"""
-        filters = {"hts_range": {"start": "7307.11.00", "end": "7307.92.99"}}
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 3
-        for r in results:
-            assert "7307.11.00" <= r.final_hts <= "7307.92.99"
-
-    def test_filter_by_hts_range_start_only(self, populated_db):
-        """Test filtering by HTS range (start only)"""
-        filters = {"hts_range": {"start": "7307.90.00"}}
-        results = populated_db.filter_products(filters, limit=500)
-        assert all(r.final_hts >= "7307.90.00" for r in results)
-
-    def test_filter_by_hts_range_end_only(self, populated_db):
-        """Test filtering by HTS range (end only)"""
-        filters = {"hts_range": {"end": "7307.20.00"}}
-        results = populated_db.filter_products(filters, limit=500)
-        assert all(r.final_hts <= "7307.20.00" for r in results)
-
-    def test_filter_by_product_group(self, populated_db):
-        """Test filtering by product group"""
-        filters = {"product_group": "FITTINGS"}
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 1
-        assert all(r.product_group == "FITTINGS" for r in results)
-
-    def test_filter_by_material_class(self, populated_db):
-        """Test filtering by material class"""
-        filters = {"material_class": "Ductile Iron"}
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 2
-        assert all(r.material_class == "Ductile Iron" for r in results)
-
-    def test_filter_by_status_unprocessed(self, populated_db):
-        """Test filtering by unprocessed status"""
-        filters = {"status": "unprocessed"}
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 1
-        assert all(r.enhanced_description is None for r in results)
-
-    def test_filter_by_status_processed(self, populated_db):
-        """Test filtering by processed status"""
-        filters = {"status": "processed"}
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 3
-        assert all(r.enhanced_description is not None for r in results)
-
-    def test_filter_by_confidence_levels(self, populated_db):
-        """Test filtering by confidence levels"""
-        filters = {"status": "processed", "confidence_levels": ["Low", "Medium"]}
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 2
-        assert all(r.confidence_level in ["Low", "Medium"] for r in results)
-
-    def test_filter_combined_all_criteria(self, populated_db):
-        """Test filtering with all criteria combined"""
-        filters = {
-            "hts_range": {"start": "7307.00.00", "end": "7307.99.99"},
-            "material_class": "Ductile Iron",
-            "status": "processed",
-            "confidence_levels": ["High", "Low"],
-        }
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 2
+    @pytest.mark.parametrize("filters,expected_ids", FILTER_CASES)
+    def test_filter(self, run_filter, filters, expected_ids):
+        """Test filtering returns exactly the expected products"""
+        results = run_filter(filters)
+        assert {r["item_id"] for r in results} == expected_ids
+        assert len(results) == len(expected_ids)
 
     def test_filter_with_limit(self, populated_db):
         """Test filtering with result limit"""
-        filters = {"status": "all"}
-        results = populated_db.filter_products(filters, limit=2)
+        results = populated_db.filter_products({"status": "all"}, limit=2)
         assert len(results) == 2
 
-    def test_filter_no_results(self, populated_db):
-        """Test filtering with criteria that match nothing"""
-        filters = {"product_group": "NONEXISTENT"}
-        results = populated_db.filter_products(filters, limit=500)
-        assert len(results) == 0
-
 
 class TestCountFilteredProducts:
     """Test count_filtered_products method"""
 
-    def test_count_matches_actual_filter(self, populated_db):
+    @pytest.mark.parametrize(
+        "filters",
+        [
+            pytest.param({"material_class": "Ductile Iron"}, id="material_class"),
+            pytest.param({"status": "processed"}, id="status_processed"),
+        ],
+    )
+    def test_count_matches_actual_filter(self, populated_db, run_filter, filters):
         """Test that count matches actual filtered results"""
-        filters = {"material_class": "Ductile Iron"}
         count = populated_db.count_filtered_products(filters)
-        actual_results = populated_db.filter_products(filters, limit=500)
-        assert count == len(actual_results)
+        assert count == len(run_filter(filters))
 
-    def test_count_all_products(self, populated_db):
-        """Test count with no filters (all products)"""
-        filters = {"status": "all"}
-        count = populated_db.count_filtered_products(filters)
-        assert count == 4
-
-    def test_count_unprocessed(self, populated_db):
-        """Test count unprocessed products"""
-        filters = {"status": "unprocessed"}
-        count = populated_db.count_filtered_products(filters)
-        assert count == 1
-
-    def test_count_processed(self, populated_db):
-        """Test count processed products"""
-        filters = {"status": "processed"}
-        count = populated_db.count_filtered_products(filters)
-        assert count == 3
+    @pytest.mark.parametrize("filters,expected", COUNT_CASES)
+    def test_count(self, populated_db, filters, expected):
+        """Test count for status filters"""
+        assert populated_db.count_filtered_products(filters) == expected
 
 
 class TestUniqueValueMethods:
@@ -378,16 +440,50 @@ class TestSearchIndexes:
         db = ProductDatabase(temp_db)
         db.create_schema()
 
-        # Verify indexes exist
+        expected = {
+            # Search-specific indexes
+            "idx_products_item_id_search",
+            "idx_products_material_class",
+            # Base indexes
+            "idx_products_final_hts",
+            "idx_products_product_group",
+        }
+        placeholders = ", ".join("?" for _ in expected)
+
+        # Verify indexes exist, ignoring any unrelated ones
         with db.get_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
-            indexes = [row[0] for row in cursor.fetchall()]
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master "
+                f"WHERE type='index' AND name IN ({placeholders})",
+                tuple(expected),
+            ).fetchall()
+
+        assert {row[0] for row in rows} == expected
+
 
-        # Check for search-specific indexes
-        assert "idx_products_item_id_search" in indexes
-        assert "idx_products_material_class" in indexes
+class TestUpdateProcessingResultsMany:
+    """Test batched processing result updates"""
+
+    def test_skips_unknown_item_ids(self, temp_db, sample_products):
+        """Test batch update writes known items and skips unknown ones"""
+        db = ProductDatabase(temp_db)
+        db.create_schema()
+        db.insert_products(list(sample_products))
+
+        update = UpdateProcessingInput(
+            enhanced_description="Aluminum bracket",
+            confidence_score="0.75",
+            confidence_level="Medium",
+            extracted_customer_name="N/A",
+            extracted_dimensions="N/A",
+            extracted_product="Bracket",
+            rules_applied="[]",
+            pass_number="1",
+        )
+        updated = db.update_processing_results_many(
+            [("TEST-ALPHA", update), ("MISSING-001", update)]
+        )
 
-        # Check for base indexes
-        assert "idx_products_final_hts" in indexes
-        assert "idx_products_product_group" in indexes
+        assert updated == 1
+        assert db.get_product_by_id("TEST-ALPHA").confidence_level == "Medium"
+        assert db.get_product_by_id("MISSING-001") is None
@@ -11,148 +11,301 @@ Tests cover:
 """
 
 import pytest
-import tempfile
 import json
-import time
-import threading
+import os
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
+
+# Service modules are imported inside fixtures and tests that need them, so
+# collecting (or -k deselecting) this module does not load the service stack
+
+
+# Canonical rules files, encoded once for every test that writes them
+_RULES_V1_JSON = json.dumps(
+    {
+        "rules": [
+            {
+                "rule_id": "R001",
+                "rule_name": "Test Rule",
+                "rule_content": "Test content",
+                "rule_type": "material",
+                "active": True,
+                "created_at": "2025-01-01T00:00:00Z",
+            }
+        ],
+        "metadata": {
+            "version": "1.0",
+            "total_rules": 1,
+            "active_rules": 1,
+            "last_updated": "2025-01-01T00:00:00Z",
+        },
+    }
+).encode()
+
+_RULES_V2_JSON = json.dumps(
+    {
+        "rules": [
+            {
+                "rule_id": "R001",
+                "rule_name": "Test Rule",
+                "rule_content": "Test content",
+                "rule_type": "material",
+                "active": True,
+                "created_at": "2025-01-01T00:00:00Z",
+            },
+            {
+                "rule_id": "R002",
+                "rule_name": "New Rule",
+                "rule_content": "New content",
+                "rule_type": "material",
+                "active": True,
+                "created_at": "2025-01-02T00:00:00Z",
+            },
+        ],
+        "metadata": {
+            "version": "1.0",
+            "total_rules": 2,
+            "active_rules": 2,
+            "last_updated": "2025-01-02T00:00:00Z",
+        },
+    }
+).encode()
+
+
+@pytest.fixture(scope="session")
+def svc_tmp(tmp_path_factory):
+    """Session-wide directory for service files; tests use unique names in it"""
+    return tmp_path_factory.mktemp("svc")
+
+
+@pytest.fixture
+def factory(monkeypatch):
+    """
+    ServiceFactory backed by a cache private to this test
+
+    Tests never touch the shared class-level cache, so no cross-test cleanup
+    is needed and parallel runs cannot race on it.
+    """
+    from src.services.common.service_factory import ServiceFactory
+
+    cache = {}
+    monkeypatch.setattr(ServiceFactory, "_instances", cache)
+    yield ServiceFactory
+    cache.clear()
+
+
+def _patch_heavy_services(monkeypatch):
+    """Replace HTSContextService and OpenAIClient construction with mocks"""
+    from src.services.hts_context.service import HTSContextService
+    from src.services.llm_enhancement.api_client import OpenAIClient
+
+    monkeypatch.setattr(
+        "src.services.common.service_factory.HTSContextService",
+        MagicMock(
+            side_effect=lambda *a, **kw: MagicMock(
+                spec=HTSContextService, hierarchy_map={}
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        "src.services.common.service_factory.OpenAIClient",
+        MagicMock(side_effect=lambda *a, **kw: MagicMock(spec=OpenAIClient)),
+    )
+
+
+@pytest.fixture
+def mock_heavy_services(monkeypatch):
+    """
+    Mock heavy service construction for the duration of a test
+
+    Caching-identity tests only check which instance comes back, so they skip
+    loading HTS reference data and building the API client.
+    """
+    _patch_heavy_services(monkeypatch)
+
+
+@pytest.fixture(scope="module")
+def warm_instances():
+    """Default database, HTS service and OpenAI client, built once per module"""
+    from src.services.common.service_factory import ServiceFactory
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(ServiceFactory, "_instances", {})
+        _patch_heavy_services(mp)
+
+        ServiceFactory.get_database()
+        ServiceFactory.get_hts_service()
+        ServiceFactory.get_openai_client()
 
-from src.services.common.service_factory import ServiceFactory
-from src.services.ingestion.database import ProductDatabase
-from src.services.hts_context.service import HTSContextService
-from src.services.llm_enhancement.api_client import OpenAIClient
-from src.services.rules.manager import RuleManager
+        return dict(ServiceFactory._instances)
+
+
+@pytest.fixture
+def warm_defaults(factory, warm_instances):
+    """Preload the test's private cache with the warmed default instances"""
+    factory._instances.update(warm_instances)
+
+
+@pytest.fixture(scope="module")
+def thread_pool():
+    """Worker threads shared by the thread-safety tests"""
+    with ThreadPoolExecutor(max_workers=10) as pool:
+        yield pool
+
+
+def _bump_mtime(path):
+    """Push file mtime one second forward so modification is always detected"""
+    new_mtime = os.path.getmtime(path) + 1.0
+    os.utime(path, (new_mtime, new_mtime))
 
 
 class TestServiceFactoryDatabase:
     """Test database caching functionality"""
 
-    def test_get_database_default_path(self):
+    @pytest.mark.usefixtures("warm_defaults")
+    def test_get_database_default_path(self, factory):
         """Test getting database with default path returns same instance"""
-        db1 = ServiceFactory.get_database()
-        db2 = ServiceFactory.get_database()
+        from src.services.ingestion.database import ProductDatabase
+
+        db1 = factory.get_database()
+        db2 = factory.get_database()
 
         assert db1 is db2
         assert isinstance(db1, ProductDatabase)
 
-    def test_get_database_custom_path(self):
+    def test_get_database_custom_path(self, factory, svc_tmp, request):
         """Test getting database with custom path caches per path"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            custom_path = Path(tmpdir) / "custom.db"
+        from src.services.ingestion.database import ProductDatabase
 
-            db1 = ServiceFactory.get_database(custom_path)
-            db2 = ServiceFactory.get_database(custom_path)
+        custom_path = svc_tmp / f"{request.node.name}.db"
 
-            assert db1 is db2
-            assert isinstance(db1, ProductDatabase)
+        db1 = factory.get_database(custom_path)
+        db2 = factory.get_database(custom_path)
 
-    def test_get_database_multiple_paths(self):
+        assert db1 is db2
+        assert isinstance(db1, ProductDatabase)
+
+    def test_get_database_multiple_paths(self, factory, svc_tmp, request):
         """Test different paths create separate cached instances"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            custom_path = Path(tmpdir) / "custom.db"
+        custom_path = svc_tmp / f"{request.node.name}.db"
 
-            db_default = ServiceFactory.get_database()
-            db_custom = ServiceFactory.get_database(custom_path)
-            db_default_again = ServiceFactory.get_database()
+        db_default = factory.get_database()
+        db_custom = factory.get_database(custom_path)
+        db_default_again = factory.get_database()
 
-            assert db_default is db_default_again
-            assert db_default is not db_custom
+        assert db_default is db_default_again
+        assert db_default is not db_custom
 
-            stats = ServiceFactory.get_cache_stats()
-            assert stats["total_instances"] >= 2
+        stats = factory.get_cache_stats()
+        assert stats["total_instances"] >= 2
 
-    def test_get_database_after_clear(self):
+    def test_get_database_after_clear(self, factory):
         """Test new instance created after cache clear"""
-        db1 = ServiceFactory.get_database()
+        db1 = factory.get_database()
         instance_id_1 = id(db1)
 
-        ServiceFactory.clear_cache()
+        factory.clear_cache()
 
-        db2 = ServiceFactory.get_database()
+        db2 = factory.get_database()
         instance_id_2 = id(db2)
 
         assert instance_id_1 != instance_id_2
 
 
+@pytest.mark.usefixtures("mock_heavy_services")
 class TestServiceFactoryHTSService:
     """Test HTS service caching functionality"""
 
-    def test_get_hts_service_singleton(self):
+    @pytest.mark.usefixtures("warm_defaults")
+    def test_get_hts_service_singleton(self, factory):
         """Test HTS service returns same instance (default path)"""
-        hts1 = ServiceFactory.get_hts_service()
-        hts2 = ServiceFactory.get_hts_service()
+        from src.services.hts_context.service import HTSContextService
+
+        hts1 = factory.get_hts_service()
+        hts2 = factory.get_hts_service()
 
         assert hts1 is hts2
         assert isinstance(hts1, HTSContextService)
 
-    def test_get_hts_service_custom_path(self):
+    def test_get_hts_service_custom_path(self, factory, svc_tmp, request):
         """Test HTS service with custom path caches separately"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            custom_hts = Path(tmpdir) / "custom_hts.json"
-
-            # Create minimal valid HTS file
-            hts_data = [
-                {
-                    "hts": "7307.11.00",
-                    "indent": 0,
-                    "description": "Test HTS",
-                    "unit": "kg",
-                }
-            ]
-            with open(custom_hts, "w") as f:
-                json.dump(hts_data, f)
-
-            hts_default = ServiceFactory.get_hts_service()
-            hts_custom = ServiceFactory.get_hts_service(custom_hts)
-
-            assert hts_default is not hts_custom
-
-    def test_get_hts_service_after_clear(self):
+        custom_hts = svc_tmp / f"{request.node.name}_hts.json"
+
+        # Create minimal valid HTS file
+        hts_data = [
+            {
+                "hts": "7307.11.00",
+                "indent": 0,
+                "description": "Test HTS",
+                "unit": "kg",
+            }
+        ]
+        with open(custom_hts, "w") as f:
+            json.dump(hts_data, f)
+
+        hts_default = factory.get_hts_service()
+        hts_custom = factory.get_hts_service(custom_hts)
+
+        assert hts_default is not hts_custom
+
+    def test_get_hts_service_after_clear(self, factory):
         """Test new HTS service created after cache clear"""
-        hts1 = ServiceFactory.get_hts_service()
+        hts1 = factory.get_hts_service()
         instance_id_1 = id(hts1)
 
-        ServiceFactory.clear_cache()
+        factory.clear_cache()
 
-        hts2 = ServiceFactory.get_hts_service()
+        hts2 = factory.get_hts_service()
         instance_id_2 = id(hts2)
 
         assert instance_id_1 != instance_id_2
 
-    def test_hts_service_hierarchy_map_loaded(self):
+
+@pytest.mark.slow
+class TestServiceFactoryHTSServiceLoading:
+    """Test HTS service built from the real reference data"""
+
+    def test_hts_service_hierarchy_map_loaded(self, factory):
         """Test HTS service has hierarchy map loaded"""
-        hts_service = ServiceFactory.get_hts_service()
+        hts_service = factory.get_hts_service()
 
         assert hasattr(hts_service, "hierarchy_map")
-        assert isinstance(hts_service.hierarchy_map, dict)
+        assert isinstance(hts_service.hierarchy_map, Mapping)
 
 
+@pytest.mark.usefixtures("mock_heavy_services")
 class TestServiceFactoryOpenAIClient:
     """Test OpenAI client caching functionality"""
 
-    def test_get_openai_client_default_key(self):
+    @pytest.mark.usefixtures("warm_defaults")
+    def test_get_openai_client_default_key(self, factory):
         """Test OpenAI client with default key is cached"""
-        client1 = ServiceFactory.get_openai_client()
-        client2 = ServiceFactory.get_openai_client()
+        from src.services.llm_enhancement.api_client import OpenAIClient
+
+        client1 = factory.get_openai_client()
+        client2 = factory.get_openai_client()
 
         assert client1 is client2
         assert isinstance(client1, OpenAIClient)
 
-    def test_get_openai_client_custom_key_not_cached(self):
+    def test_get_openai_client_custom_key_not_cached(self, factory):
         """Test OpenAI client with custom key creates fresh instances"""
-        client1 = ServiceFactory.get_openai_client(api_key="test-key-1")
-        client2 = ServiceFactory.get_openai_client(api_key="test-key-1")
+        from src.services.llm_enhancement.api_client import OpenAIClient
+
+        client1 = factory.get_openai_client(api_key="test-key-1")
+        client2 = factory.get_openai_client(api_key="test-key-1")
 
         assert client1 is not client2
         assert isinstance(client1, OpenAIClient)
         assert isinstance(client2, OpenAIClient)
 
-    def test_get_openai_client_mixed_keys(self):
+    def test_get_openai_client_mixed_keys(self, factory):
         """Test mixing default and custom keys caches correctly"""
-        client_default_1 = ServiceFactory.get_openai_client()
-        client_custom = ServiceFactory.get_openai_client(api_key="test-key")
-        client_default_2 = ServiceFactory.get_openai_client()
+        client_default_1 = factory.get_openai_client()
+        client_custom = factory.get_openai_client(api_key="test-key")
+        client_default_2 = factory.get_openai_client()
 
         assert client_default_1 is client_default_2
         assert client_default_1 is not client_custom
@@ -162,170 +315,97 @@ class TestServiceFactoryRuleManager:
     """Test RuleManager caching with file modification detection"""
 
     @pytest.fixture
-    def temp_rules_file(self):
+    def temp_rules_file(self, svc_tmp, request):
         """Create temporary rules file for testing"""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            rules_file = Path(tmpdir) / "rules.json"
-            rules_data = {
-                "rules": [
-                    {
-                        "rule_id": "R001",
-                        "rule_name": "Test Rule",
-                        "rule_content": "Test content",
-                        "rule_type": "material",
-                        "active": True,
-                        "created_at": "2025-01-01T00:00:00Z",
-                    }
-                ],
-                "metadata": {
-                    "version": "1.0",
-                    "total_rules": 1,
-                    "active_rules": 1,
-                    "last_updated": "2025-01-01T00:00:00Z",
-                },
-            }
-            with open(rules_file, "w") as f:
-                json.dump(rules_data, f)
+        rules_file = svc_tmp / f"{request.node.name}_rules.json"
+        rules_file.write_bytes(_RULES_V1_JSON)
 
-            yield rules_file
+        yield rules_file
 
-    def test_get_rule_manager_singleton(self, temp_rules_file):
+    def test_get_rule_manager_singleton(self, factory, temp_rules_file):
         """Test RuleManager returns same instance for same path"""
-        mgr1 = ServiceFactory.get_rule_manager(temp_rules_file)
-        mgr2 = ServiceFactory.get_rule_manager(temp_rules_file)
+        from src.services.rules.manager import RuleManager
+
+        mgr1 = factory.get_rule_manager(temp_rules_file)
+        mgr2 = factory.get_rule_manager(temp_rules_file)
 
         assert mgr1 is mgr2
         assert isinstance(mgr1, RuleManager)
 
-    def test_rule_manager_loads_rules(self, temp_rules_file):
+    def test_rule_manager_loads_rules(self, factory, temp_rules_file):
         """Test RuleManager loads rules correctly"""
-        rule_manager = ServiceFactory.get_rule_manager(temp_rules_file)
+        rule_manager = factory.get_rule_manager(temp_rules_file)
         rules = rule_manager.load_rules()
 
         assert len(rules) == 1
         assert rules[0].rule_id == "R001"
 
-    def test_reload_rules_after_file_change(self, temp_rules_file):
+    def test_reload_rules_after_file_change(self, factory, temp_rules_file):
         """Test RuleManager auto-reloads when file is modified"""
-        rule_manager = ServiceFactory.get_rule_manager(temp_rules_file)
+        rule_manager = factory.get_rule_manager(temp_rules_file)
         rules = rule_manager.load_rules()
         assert len(rules) == 1
 
         # Modify rules file
-        time.sleep(0.1)  # Ensure mtime changes
-
-        rules_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Test Rule",
-                    "rule_content": "Test content",
-                    "rule_type": "material",
-                    "active": True,
-                    "created_at": "2025-01-01T00:00:00Z",
-                },
-                {
-                    "rule_id": "R002",
-                    "rule_name": "New Rule",
-                    "rule_content": "New content",
-                    "rule_type": "material",
-                    "active": True,
-                    "created_at": "2025-01-02T00:00:00Z",
-                },
-            ],
-            "metadata": {
-                "version": "1.0",
-                "total_rules": 2,
-                "active_rules": 2,
-                "last_updated": "2025-01-02T00:00:00Z",
-            },
-        }
-        with open(temp_rules_file, "w") as f:
-            json.dump(rules_data, f)
+        temp_rules_file.write_bytes(_RULES_V2_JSON)
+        _bump_mtime(temp_rules_file)
 
         # Get RuleManager again - should detect file change
-        rule_manager_again = ServiceFactory.get_rule_manager(temp_rules_file)
+        rule_manager_again = factory.get_rule_manager(temp_rules_file)
         rules_after = rule_manager_again.load_rules()
 
         assert len(rules_after) == 2
         assert rules_after[1].rule_id == "R002"
 
-    def test_reload_rules_explicit(self, temp_rules_file):
+    def test_reload_rules_explicit(self, factory, temp_rules_file):
         """Test explicit rule reload works"""
-        rule_manager = ServiceFactory.get_rule_manager(temp_rules_file)
+        rule_manager = factory.get_rule_manager(temp_rules_file)
         rules = rule_manager.load_rules()
         assert len(rules) == 1
 
         # Modify rules file
-        rules_data = {
-            "rules": [
-                {
-                    "rule_id": "R001",
-                    "rule_name": "Test Rule",
-                    "rule_content": "Test content",
-                    "rule_type": "material",
-                    "active": True,
-                    "created_at": "2025-01-01T00:00:00Z",
-                },
-                {
-                    "rule_id": "R002",
-                    "rule_name": "New Rule",
-                    "rule_content": "New content",
-                    "rule_type": "material",
-                    "active": True,
-                    "created_at": "2025-01-02T00:00:00Z",
-                },
-            ],
-            "metadata": {
-                "version": "1.0",
-                "total_rules": 2,
-                "active_rules": 2,
-                "last_updated": "2025-01-02T00:00:00Z",
-            },
-        }
-        with open(temp_rules_file, "w") as f:
-            json.dump(rules_data, f)
+        temp_rules_file.write_bytes(_RULES_V2_JSON)
 
         # Force reload
-        ServiceFactory.reload_rules(temp_rules_file)
+        factory.reload_rules(temp_rules_file)
 
         # Get rules
-        rule_manager_again = ServiceFactory.get_rule_manager(temp_rules_file)
+        rule_manager_again = factory.get_rule_manager(temp_rules_file)
         rules_after = rule_manager_again.load_rules()
 
         assert len(rules_after) == 2
 
 
+@pytest.mark.usefixtures("mock_heavy_services")
 class TestServiceFactoryCacheManagement:
     """Test cache management operations"""
 
-    def test_clear_cache_all_services(self):
+    @pytest.mark.usefixtures("warm_defaults")
+    def test_clear_cache_all_services(self, factory):
         """Test clearing cache removes all services"""
         # Create instances
-        ServiceFactory.get_database()
-        ServiceFactory.get_hts_service()
-        ServiceFactory.get_openai_client()
+        factory.get_database()
+        factory.get_hts_service()
+        factory.get_openai_client()
 
-        stats_before = ServiceFactory.get_cache_stats()
+        stats_before = factory.get_cache_stats()
         assert stats_before["total_instances"] >= 3
 
         # Clear cache
-        ServiceFactory.clear_cache()
+        factory.clear_cache()
 
-        stats_after = ServiceFactory.get_cache_stats()
+        stats_after = factory.get_cache_stats()
         assert stats_after["total_instances"] == 0
 
-    def test_get_cache_stats(self):
+    @pytest.mark.usefixtures("warm_defaults")
+    def test_get_cache_stats(self, factory):
         """Test cache statistics are accurate"""
-        # Start fresh
-        ServiceFactory.clear_cache()
-
         # Create instances
-        ServiceFactory.get_database()
-        ServiceFactory.get_hts_service()
-        ServiceFactory.get_openai_client()
+        factory.get_database()
+        factory.get_hts_service()
+        factory.get_openai_client()
 
-        stats = ServiceFactory.get_cache_stats()
+        stats = factory.get_cache_stats()
 
         assert isinstance(stats, dict)
         assert stats["total_instances"] >= 3
@@ -334,65 +414,59 @@ class TestServiceFactoryCacheManagement:
         assert "instance_types" in stats
         assert "database_paths" in stats
 
-    def test_cache_stats_empty(self):
+    def test_cache_stats_empty(self, factory):
         """Test cache stats when cache is empty"""
-        ServiceFactory.clear_cache()
-
-        stats = ServiceFactory.get_cache_stats()
+        stats = factory.get_cache_stats()
 
         assert stats["total_instances"] == 0
         assert stats["has_hts_service"] is False
         assert stats["has_openai_client"] is False
 
 
+@pytest.mark.usefixtures("mock_heavy_services")
 class TestServiceFactoryThreadSafety:
     """Test thread safety of ServiceFactory"""
 
-    def test_concurrent_access_same_service(self):
+    def test_concurrent_access_same_service(self, factory, thread_pool):
         """Test concurrent access to same service returns same instance"""
-        instances = []
-
-        def get_db():
-            db = ServiceFactory.get_database()
-            instances.append(db)
-
-        # Create 10 threads accessing database simultaneously
-        threads = [threading.Thread(target=get_db) for _ in range(10)]
-
-        for thread in threads:
-            thread.start()
-
-        for thread in threads:
-            thread.join()
+        # 10 workers access database simultaneously
+        instances = list(thread_pool.map(lambda _: factory.get_database(), range(10)))
 
         # All threads should get same instance
         assert len(instances) == 10
         assert all(inst is instances[0] for inst in instances)
 
-    def test_concurrent_access_different_services(self):
+    def test_concurrent_queries_on_shared_database(
+        self, factory, thread_pool, svc_tmp, request
+    ):
+        """Test one cached database instance serves queries from many threads"""
+        db_path = svc_tmp / f"{request.node.name}.db"
+        factory.get_database(db_path).create_schema()
+
+        # Each call opens its own connection, so no connection crosses threads
+        counts = list(
+            thread_pool.map(
+                lambda _: factory.get_database(db_path).count_filtered_products(
+                    {"status": "all"}
+                ),
+                range(10),
+            )
+        )
+
+        assert counts == [0] * 10
+
+    def test_concurrent_access_different_services(self, factory, thread_pool):
         """Test concurrent access to different services works"""
-        results = {"db": None, "hts": None, "openai": None}
-
-        def get_db():
-            results["db"] = ServiceFactory.get_database()
-
-        def get_hts():
-            results["hts"] = ServiceFactory.get_hts_service()
-
-        def get_openai():
-            results["openai"] = ServiceFactory.get_openai_client()
-
-        threads = [
-            threading.Thread(target=get_db),
-            threading.Thread(target=get_hts),
-            threading.Thread(target=get_openai),
-        ]
-
-        for thread in threads:
-            thread.start()
-
-        for thread in threads:
-            thread.join()
+        from src.services.ingestion.database import ProductDatabase
+        from src.services.hts_context.service import HTSContextService
+        from src.services.llm_enhancement.api_client import OpenAIClient
+
+        futures = {
+            "db": thread_pool.submit(factory.get_database),
+            "hts": thread_pool.submit(factory.get_hts_service),
+            "openai": thread_pool.submit(factory.get_openai_client),
+        }
+        results = {name: future.result() for name, future in futures.items()}
 
         # All services should be created successfully
         assert isinstance(results["db"], ProductDatabase)